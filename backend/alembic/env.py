@@ -0,0 +1,75 @@
+"""
+Alembic environment - memakai DATABASE_URL dan metadata dari aplikasi
+"""
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config
+from sqlalchemy import pool
+
+from alembic import context
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401 - register semua model ke Base.metadata
+
+config = context.config
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Object pencarian dikelola di luar migrations (FTS5 table + shadow table-nya
+# di SQLite, FULLTEXT index lewat database/update_product_search.sql di MySQL)
+EXCLUDED_TABLE_PREFIXES = ("products_fts",)
+EXCLUDED_INDEXES = ("ft_products_search",)
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(EXCLUDED_TABLE_PREFIXES):
+        return False
+    if type_ == "index" and name in EXCLUDED_INDEXES:
+        return False
+    return True
+
+def run_migrations_offline() -> None:
+    """
+    Generate SQL tanpa koneksi database (alembic upgrade --sql)
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    """
+    Jalankan migrations langsung ke database
+    """
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,57 @@
+"""hot path indexes
+
+Composite index untuk query yang paling sering jalan: listing product per
+category/featured/release tag, list order per status/payment status
+(urut created_at), order items per order/product dan promo aktif.
+
+Index yang kolomnya sudah ter-cover index lain (mis. idx_order_items_order_id
+dari complete_mysql.sql) dilewati supaya tidak dobel.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:45:12.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('products', 'ix_products_active_category_price', ['is_active', 'category_id', 'price']),
+    ('products', 'ix_products_active_featured', ['is_active', 'is_featured']),
+    ('products', 'ix_products_active_release_tag', ['is_active', 'release_tag']),
+    ('orders', 'ix_orders_status_created_at', ['status', 'created_at']),
+    ('orders', 'ix_orders_payment_status_created_at', ['payment_status', 'created_at']),
+    ('order_items', 'ix_order_items_order_id', ['order_id']),
+    ('order_items', 'ix_order_items_product_id', ['product_id']),
+    ('promotions', 'ix_promotions_active_dates', ['is_active', 'start_date', 'end_date']),
+]
+
+
+def _existing_indexes(table: str) -> dict:
+    inspector = sa.inspect(op.get_bind())
+    return {index['name']: index['column_names'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, name, columns in INDEXES:
+        existing = _existing_indexes(table)
+        if name in existing or columns in existing.values():
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, name, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -2,7 +2,7 @@
 Main API Router - menggabungkan semua endpoints
 """
 from fastapi import APIRouter
-from app.api.endpoints import products, orders, customers, auth, analytics, promotions
+from app.api.endpoints import products, orders, customers, auth, analytics, promotions, upload, cart
 
 api_router = APIRouter()
 
@@ -10,7 +10,9 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(products.router, prefix="/products", tags=["Products"])
 api_router.include_router(orders.router, prefix="/orders", tags=["Orders"])
+api_router.include_router(cart.router, prefix="/cart", tags=["Cart"])
 api_router.include_router(customers.router, prefix="/customers", tags=["Customers"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
 api_router.include_router(promotions.router, prefix="/promotions", tags=["Promotions"])
+api_router.include_router(upload.router, prefix="/upload", tags=["Upload"])
 
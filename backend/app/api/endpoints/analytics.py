@@ -1,108 +1,100 @@
 """
 Analytics API Endpoints
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from sqlalchemy import func, select, union_all
+from typing import List, Optional
+from datetime import timedelta
 from app.core.database import get_db
-from app.models.order import Order as OrderModel, OrderStatus, PaymentStatus
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel
+from app.models.order_archive import OrderArchiveProduct as OrderArchiveProductModel
+from app.models.sales import SalesDaily as SalesDailyModel, SalesDailyCategory as SalesDailyCategoryModel
 from app.models.product import Product as ProductModel
-from app.models.customer import Customer as CustomerModel
+from app.schemas.order import Order
+from app.api.endpoints.orders import ORDER_LOADERS
+from app.services.dashboard import get_dashboard
+from app.services.sales_rollup import sales_today
 
 router = APIRouter()
 
 @router.get("/dashboard")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+def get_dashboard_stats():
     """
     Get dashboard statistics
+
+    Dibaca dari snapshot yang dihitung ulang di background (satu query
+    aggregate); `computed_at`/`stale_at` menunjukkan umur angka.
     """
-    # Total revenue (completed & paid orders)
-    total_revenue = db.query(func.sum(OrderModel.total)).filter(
-        OrderModel.payment_status == PaymentStatus.PAID
-    ).scalar() or 0
-    
-    # Total orders
-    total_orders = db.query(func.count(OrderModel.id)).scalar() or 0
-    
-    # Total customers
-    total_customers = db.query(func.count(CustomerModel.id)).scalar() or 0
-    
-    # Total products
-    total_products = db.query(func.count(ProductModel.id)).filter(
-        ProductModel.is_active == True
-    ).scalar() or 0
-    
-    # Pending orders
-    pending_orders = db.query(func.count(OrderModel.id)).filter(
-        OrderModel.status == OrderStatus.PENDING
-    ).scalar() or 0
-    
-    # Orders this month
-    start_of_month = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    orders_this_month = db.query(func.count(OrderModel.id)).filter(
-        OrderModel.created_at >= start_of_month
-    ).scalar() or 0
-    
-    # Revenue this month
-    revenue_this_month = db.query(func.sum(OrderModel.total)).filter(
-        OrderModel.created_at >= start_of_month,
-        OrderModel.payment_status == PaymentStatus.PAID
-    ).scalar() or 0
-    
-    return {
-        "total_revenue": float(total_revenue),
-        "total_orders": total_orders,
-        "total_customers": total_customers,
-        "total_products": total_products,
-        "pending_orders": pending_orders,
-        "orders_this_month": orders_this_month,
-        "revenue_this_month": float(revenue_this_month)
-    }
+    return get_dashboard()
 
 @router.get("/sales-chart")
-def get_sales_chart(days: int = 30, db: Session = Depends(get_db)):
+def get_sales_chart(
+    days: int = Query(30, ge=1, le=730),
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
     """
     Get sales data for chart (last N days)
+
+    Dibaca dari rollup sales_daily (atau sales_daily_categories kalau
+    category_id diisi) dengan satu range read; hari dihitung di
+    SALES_TIMEZONE dan hari tanpa penjualan diisi 0.
     """
-    start_date = datetime.now() - timedelta(days=days)
+    end_date = sales_today()
+    start_date = end_date - timedelta(days=days - 1)
     
-    # Get orders by date
-    orders = db.query(
-        func.date(OrderModel.created_at).label('date'),
-        func.count(OrderModel.id).label('count'),
-        func.sum(OrderModel.total).label('total')
-    ).filter(
-        OrderModel.created_at >= start_date,
-        OrderModel.payment_status == PaymentStatus.PAID
-    ).group_by(func.date(OrderModel.created_at)).all()
+    model = SalesDailyModel
+    query = db.query(SalesDailyModel)
+    if category_id is not None:
+        model = SalesDailyCategoryModel
+        query = db.query(SalesDailyCategoryModel).filter(SalesDailyCategoryModel.category_id == category_id)
+    rows = {row.date: row for row in query.filter(model.date >= start_date, model.date <= end_date)}
     
-    return [{
-        "date": str(order.date),
-        "orders": order.count,
-        "revenue": float(order.total or 0)
-    } for order in orders]
+    chart = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        row = rows.get(day)
+        chart.append({
+            "date": day.isoformat(),
+            "orders": row.order_count if row else 0,
+            "revenue": float(row.revenue) if row else 0.0,
+            "items_sold": row.items_sold if row else 0,
+        })
+    return chart
 
 @router.get("/top-products")
 def get_top_products(limit: int = 10, db: Session = Depends(get_db)):
     """
     Get top selling products
     """
-    from app.models.order import OrderItem as OrderItemModel
+    # Item di table hot + aggregates item yang sudah diarsipkan
+    sales = union_all(
+        select(
+            OrderItemModel.product_id,
+            OrderItemModel.quantity.label('quantity'),
+            OrderItemModel.subtotal.label('revenue')
+        ),
+        select(
+            OrderArchiveProductModel.product_id,
+            OrderArchiveProductModel.quantity,
+            OrderArchiveProductModel.revenue
+        )
+    ).subquery()
     
     top_products = db.query(
         ProductModel.id,
         ProductModel.name,
         ProductModel.price,
         ProductModel.thumbnail,
-        func.sum(OrderItemModel.quantity).label('total_sold'),
-        func.sum(OrderItemModel.subtotal).label('total_revenue')
+        func.sum(sales.c.quantity).label('total_sold'),
+        func.sum(sales.c.revenue).label('total_revenue')
     ).join(
-        OrderItemModel, ProductModel.id == OrderItemModel.product_id
+        sales, ProductModel.id == sales.c.product_id
     ).group_by(
         ProductModel.id
     ).order_by(
-        func.sum(OrderItemModel.quantity).desc()
+        func.sum(sales.c.quantity).desc()
     ).limit(limit).all()
     
     return [{
@@ -114,12 +106,12 @@ def get_top_products(limit: int = 10, db: Session = Depends(get_db)):
         "total_revenue": float(product.total_revenue or 0)
     } for product in top_products]
 
-@router.get("/recent-orders")
+@router.get("/recent-orders", response_model=List[Order])
 def get_recent_orders(limit: int = 10, db: Session = Depends(get_db)):
     """
     Get recent orders
     """
-    orders = db.query(OrderModel).order_by(
+    orders = db.query(OrderModel).options(*ORDER_LOADERS).order_by(
         OrderModel.created_at.desc()
     ).limit(limit).all()
     
@@ -0,0 +1,64 @@
+"""
+Cart API Endpoints - inventory hold (reservasi stock sebelum checkout)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.schemas.cart import CART_ID_PATTERN, CartHolds, HoldUpdate
+from app.schemas.order import CartQuote, CartQuoteRequest
+from app.services.inventory import StockError, list_holds, load_order_lines, release_cart_holds, set_hold
+from app.services.promotions import PromotionError, order_totals, validate_code
+
+router = APIRouter()
+
+CartId = Path(..., pattern=CART_ID_PATTERN)
+
+def _cart_holds(db: Session, cart_id: str) -> dict:
+    holds = list_holds(db, cart_id)
+    return {
+        "cart_id": cart_id,
+        "holds": holds,
+        "expires_at": min((hold.expires_at for hold in holds), default=None),
+    }
+
+@router.post("/quote", response_model=CartQuote)
+def quote_cart(cart: CartQuoteRequest, db: Session = Depends(get_db)):
+    """
+    Harga, discount dan total untuk isi cart (tanpa membuat order).
+    Perhitungan sama dengan checkout; promo divalidasi dari index in-memory.
+    """
+    try:
+        lines = load_order_lines(db, cart.items)
+        promotion = validate_code(db, cart.promotion_code) if cart.promotion_code else None
+        totals = order_totals(sum(line["subtotal"] for line in lines), promotion)
+    except (StockError, PromotionError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return {"items": lines, **totals, "promotion": promotion}
+
+@router.get("/{cart_id}/holds", response_model=CartHolds)
+def get_cart_holds(cart_id: str = CartId, db: Session = Depends(get_db)):
+    """
+    Get hold aktif milik cart
+    """
+    return _cart_holds(db, cart_id)
+
+@router.put("/{cart_id}/holds", response_model=CartHolds)
+def update_cart_hold(hold: HoldUpdate, cart_id: str = CartId, db: Session = Depends(get_db)):
+    """
+    Set jumlah unit yang di-hold untuk satu product/variation (0 = lepas).
+    TTL semua hold cart diperpanjang INVENTORY_HOLD_TTL detik; hold yang
+    kedaluwarsa dilepas oleh background sweeper.
+    """
+    try:
+        set_hold(db, cart_id, hold.product_id, hold.variation_id, hold.quantity)
+    except StockError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    return _cart_holds(db, cart_id)
+
+@router.delete("/{cart_id}/holds")
+def delete_cart_holds(cart_id: str = CartId, db: Session = Depends(get_db)):
+    """
+    Lepas semua hold cart (cart dikosongkan / ditinggalkan)
+    """
+    released = release_cart_holds(db, cart_id)
+    return {"message": "Cart holds released", "released": released}
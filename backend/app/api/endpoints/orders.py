@@ -1,19 +1,39 @@
 """
 Orders API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 import random
 import string
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.order import Order as OrderModel, OrderItem as OrderItemModel, OrderStatus, PaymentStatus
-from app.models.product import Product as ProductModel
-from app.schemas.order import Order, OrderCreate, OrderUpdate, OrderList
+from app.models.order_archive import ArchivedOrder as ArchivedOrderModel
+from app.models.order_event import OrderEventType
+from app.schemas.order import Order, OrderCreate, OrderUpdate, OrderList, OrderBulkStatus, OrderBulkStatusResult
+from app.api.endpoints.auth import get_current_admin_user
+from app.services.customer_stats import customer_stats, order_state
+from app.services.idempotency import IdempotentRequest, idempotent
+from app.services.order_events import add_order_event, order_snapshot
+from app.services import order_io
+from app.services.order_archive import get_archived_order
+from app.services.order_bulk import BulkStatusConflict, bulk_update_status
+from app.services.order_cache import invalidate_order_counts, order_count_cache
+from app.services.inventory import StockError, claim_cart_holds, load_order_lines, reserve_stock
+from app.services.promotions import PromotionError, order_totals, redeem_promotion, validate_code
+from app.services.sales_rollup import payment_sign, record_payment_changes
+from app.utils.http_cache import make_etag, has_conditional_headers, is_not_modified, not_modified, apply_cache_headers
+from app.utils.pagination import paginate_keyset, encode_cursor, row_key, sort_key, CURSOR_NEXT, CURSOR_PREV
 
 router = APIRouter()
 
+# Response schema Order menyertakan items; load sekaligus untuk semua order
+# dalam satu SELECT ... IN (bukan satu query per order)
+ORDER_LOADERS = (selectinload(OrderModel.items),)
+
 def generate_order_number():
     """
     Generate unique order number
@@ -22,102 +42,234 @@ def generate_order_number():
     random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
     return f"ORD-{timestamp}-{random_str}"
 
+# Keyset admin order list: terbaru dulu, id sebagai tiebreaker
+ORDER_SORT_COLUMNS = [OrderModel.created_at, OrderModel.id]
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """
+    String terkecil yang lebih besar dari semua string berawalan `prefix`
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+class OrderFilters:
+    """
+    Filter admin order list. Setiap filter punya index (kolom, created_at)
+    sehingga keyset tetap membaca index, bukan seluruh table.
+    """
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        date_from: Optional[date] = Query(None, description="created_at >= tanggal ini"),
+        date_to: Optional[date] = Query(None, description="created_at sampai akhir tanggal ini"),
+        customer_email: Optional[str] = None,
+        customer_phone: Optional[str] = None,
+        order_number: Optional[str] = Query(None, min_length=1, description="Prefix order number"),
+    ):
+        self.status = status
+        self.payment_status = payment_status
+        self.date_from = date_from
+        self.date_to = date_to
+        self.customer_email = customer_email.strip() if customer_email else None
+        self.customer_phone = customer_phone.strip() if customer_phone else None
+        self.order_number = order_number.strip().upper() if order_number else None
+
+    def cache_key(self):
+        return tuple(sorted(vars(self).items()))
+
+    def apply(self, query):
+        if self.status:
+            query = query.filter(OrderModel.status == self.status)
+        if self.payment_status:
+            query = query.filter(OrderModel.payment_status == self.payment_status)
+        if self.date_from:
+            query = query.filter(OrderModel.created_at >= datetime.combine(self.date_from, time.min))
+        if self.date_to:
+            query = query.filter(OrderModel.created_at < datetime.combine(self.date_to + timedelta(days=1), time.min))
+        if self.customer_email:
+            query = query.filter(OrderModel.customer_email == self.customer_email)
+        if self.customer_phone:
+            query = query.filter(OrderModel.customer_phone == self.customer_phone)
+        if self.order_number:
+            # Range (bukan LIKE) supaya unique index order_number terpakai
+            query = query.filter(
+                OrderModel.order_number >= self.order_number,
+                OrderModel.order_number < _prefix_upper_bound(self.order_number)
+            )
+        return query
+
 @router.get("/", response_model=OrderList)
 def get_orders(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    status: Optional[str] = None,
-    payment_status: Optional[str] = None,
+    filters: OrderFilters = Depends(),
+    cursor: Optional[str] = None,
+    with_total: Optional[bool] = None,
+    approx_total: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Get all orders dengan filtering dan pagination
+
+    Tanpa `cursor` endpoint memakai offset pagination (`skip`); dengan
+    `cursor` (dari `next_cursor`/`prev_cursor`) keyset pagination pada
+    (created_at, id) yang latency-nya flat di halaman dalam.
+
+    `total` hanya dihitung kalau `with_total=true` (default: true untuk
+    offset, false untuk cursor) dengan COUNT. `approx_total=true` boleh
+    memakai total dari cache per filter (`total_cached=true`, bisa tertinggal
+    sampai ORDER_COUNT_CACHE_TTL detik) supaya page turn tidak COUNT ulang.
     """
-    query = db.query(OrderModel)
-    
-    # Filters
-    if status:
-        query = query.filter(OrderModel.status == status)
-    if payment_status:
-        query = query.filter(OrderModel.payment_status == payment_status)
-    
-    # Order by created_at desc
-    query = query.order_by(OrderModel.created_at.desc())
+    query = filters.apply(db.query(OrderModel))
     
-    # Count total
-    total = query.count()
+    if with_total is None:
+        with_total = cursor is None
+    total = None
+    total_cached = False
+    if with_total:
+        key = filters.cache_key()
+        if approx_total:
+            total = order_count_cache.get(key)
+            total_cached = total is not None
+        if total is None:
+            total = query.count()
+            order_count_cache.set(key, total)
     
-    # Get orders
-    orders = query.offset(skip).limit(limit).all()
+    query = query.options(*ORDER_LOADERS)
+    if cursor:
+        # Keyset pagination
+        try:
+            orders, next_cursor, prev_cursor = paginate_keyset(query, ORDER_SORT_COLUMNS, True, limit, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = None
+    else:
+        # Offset pagination (halaman pertama juga mengembalikan next_cursor)
+        orders = query.order_by(*[c.desc() for c in ORDER_SORT_COLUMNS]).offset(skip).limit(limit + 1).all()
+        has_more = len(orders) > limit
+        orders = orders[:limit]
+        sort_id = sort_key(ORDER_SORT_COLUMNS, True)
+        next_cursor = encode_cursor(row_key(orders[-1], ORDER_SORT_COLUMNS), CURSOR_NEXT, sort_id) if has_more else None
+        prev_cursor = encode_cursor(row_key(orders[0], ORDER_SORT_COLUMNS), CURSOR_PREV, sort_id) if skip and orders else None
+        page = skip // limit + 1
     
     # Calculate pages
-    pages = (total + limit - 1) // limit
+    pages = (total + limit - 1) // limit if total is not None else None
     
     return {
         "items": orders,
         "total": total,
-        "page": skip // limit + 1,
+        "total_cached": total_cached,
+        "page": page,
         "page_size": limit,
-        "pages": pages
+        "pages": pages,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
     }
 
+@router.get("/export")
+def export_orders(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    layout: str = Query("flat", pattern="^(flat|nested)$"),
+    filters: OrderFilters = Depends(),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Stream orders + line items sebagai CSV/NDJSON (Admin only)
+
+    `layout=flat`: satu baris per line item (kolom order diulang, kolom item
+    berawalan `item_`); `layout=nested`: satu record per order dengan
+    `items` (di CSV sebagai JSON). Filter sama dengan list orders.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        order_io.export_orders(format, layout, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'},
+    )
+
 @router.get("/{order_id}", response_model=Order)
 def get_order(order_id: int, db: Session = Depends(get_db)):
     """
-    Get order by ID
+    Get order by ID (order yang sudah diarsipkan juga ditemukan)
     """
-    order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    order = db.query(OrderModel).options(*ORDER_LOADERS).filter(OrderModel.id == order_id).first()
+    if not order:
+        order = get_archived_order(db, ArchivedOrderModel.id == order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
 
+def _order_validators(row):
+    last_modified = row.updated_at or row.created_at
+    return make_etag(row.id, last_modified, row.status, row.payment_status), last_modified
+
 @router.get("/number/{order_number}", response_model=Order)
-def get_order_by_number(order_number: str, db: Session = Depends(get_db)):
+def get_order_by_number(order_number: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """
-    Get order by order number
+    Get order by order number (mendukung ETag / 304 untuk polling status).
+    Order yang sudah diarsipkan dicari di archive.
     """
-    order = db.query(OrderModel).filter(OrderModel.order_number == order_number).first()
+    if has_conditional_headers(request):
+        version = None
+        for model in (OrderModel, ArchivedOrderModel):
+            version = db.query(
+                model.id, model.created_at, model.updated_at, model.status, model.payment_status
+            ).filter(model.order_number == order_number).first()
+            if version:
+                break
+        if not version:
+            raise HTTPException(status_code=404, detail="Order not found")
+        etag, last_modified = _order_validators(version)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified, settings.ORDER_CACHE_CONTROL)
+    
+    order = db.query(OrderModel).options(*ORDER_LOADERS).filter(OrderModel.order_number == order_number).first()
+    if not order:
+        order = get_archived_order(db, ArchivedOrderModel.order_number == order_number)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    etag, last_modified = _order_validators(order)
+    apply_cache_headers(response, etag, last_modified, settings.ORDER_CACHE_CONTROL)
     return order
 
 @router.post("/", response_model=Order)
 def create_order(
     order_data: OrderCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency: IdempotentRequest = Depends(idempotent("orders.create"))
 ):
     """
     Create new order
+
+    Header `Idempotency-Key` (opsional): retry dengan key & body yang sama
+    mengembalikan response order pertama tanpa membuat order baru.
+
+    Stock semua item direservasi dengan conditional UPDATE dalam transaksi
+    yang sama dengan insert order, jadi checkout bersamaan tidak bisa oversell.
+    Reservasi dijalankan terakhir supaya row lock product dipegang sesingkat
+    mungkin.
+
+    Dengan `cart_id`, hold cart tersebut dipakai: unit yang sudah di-hold
+    dijamin tersedia untuk pembeli ini, lalu hold dilepas di transaksi yang
+    sama.
+
+    Dengan `promotion_code`, discount dihitung seperti POST /cart/quote dan
+    pemakaian promo (redemption customer + counter shard) dicatat di
+    transaksi yang sama (kuota habis / batas customer -> 400 dan order
+    tidak dibuat).
     """
-    # Calculate totals
-    subtotal = 0
-    order_items_data = []
-    
-    for item in order_data.items:
-        product = db.query(ProductModel).filter(ProductModel.id == item.product_id).first()
-        if not product:
-            raise HTTPException(status_code=404, detail=f"Product {item.product_id} not found")
-        if product.stock < item.quantity:
-            raise HTTPException(status_code=400, detail=f"Insufficient stock for {product.name}")
-        
-        item_subtotal = product.price * item.quantity
-        subtotal += item_subtotal
-        
-        order_items_data.append({
-            "product_id": product.id,
-            "product_name": product.name,
-            "product_price": product.price,
-            "quantity": item.quantity,
-            "subtotal": item_subtotal
-        })
-        
-        # Update stock
-        product.stock -= item.quantity
+    if idempotency.replay is not None:
+        return idempotency.replay
     
-    # Calculate shipping, tax, total
-    shipping_cost = 0  # You can add logic here
-    tax = 0  # You can add logic here
-    total = subtotal + shipping_cost + tax
+    try:
+        order_items_data = load_order_lines(db, order_data.items)
+        promotion = validate_code(db, order_data.promotion_code) if order_data.promotion_code else None
+        # Calculate shipping, tax, discount, total
+        totals = order_totals(sum(item["subtotal"] for item in order_items_data), promotion)
+        held = claim_cart_holds(db, order_data.cart_id) if order_data.cart_id else None
+    except (StockError, PromotionError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
     # Create order
     db_order = OrderModel(
@@ -131,11 +283,8 @@ def create_order(
         shipping_postal_code=order_data.shipping_postal_code,
         payment_method=order_data.payment_method,
         notes=order_data.notes,
-        subtotal=subtotal,
-        shipping_cost=shipping_cost,
-        tax=tax,
-        discount=0,
-        total=total,
+        promotion_code=promotion.code if promotion is not None else None,
+        **totals,
         status=OrderStatus.PENDING,
         payment_status=PaymentStatus.PENDING
     )
@@ -144,14 +293,49 @@ def create_order(
     db.flush()
     
     # Create order items
-    for item_data in order_items_data:
-        db_item = OrderItemModel(order_id=db_order.id, **item_data)
-        db.add(db_item)
+    db.add_all([OrderItemModel(order_id=db_order.id, **item_data) for item_data in order_items_data])
+    db.flush()
     
-    db.commit()
+    # Reserve stock (rollback seluruh order kalau ada yang tidak cukup),
+    # lalu pakai kuota promo; row promo dikunci paling akhir
+    try:
+        reserve_stock(db, order_data.items, held)
+        if promotion is not None:
+            redeem_promotion(db, promotion, order_data.customer_email, db_order.id)
+    except (StockError, PromotionError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    # Simpan response di transaksi yang sama dengan order
     db.refresh(db_order)
+    response = Order.model_validate(db_order)
+    idempotency.record(db, response)
+    add_order_event(db, db_order, OrderEventType.CREATED, {"order": response})
     
-    return db_order
+    db.commit()
+    invalidate_order_counts()
+    customer_stats.record_created(response)
+    return response
+
+@router.post("/bulk-status", response_model=OrderBulkStatusResult)
+def bulk_update_order_status(
+    payload: OrderBulkStatus,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Bulk update status/payment_status per id atau order number (Admin only)
+
+    Transisi divalidasi per order (mis. shipped -> delivered boleh,
+    delivered -> pending tidak); order yang valid di-update dengan satu
+    UPDATE yang juga mengisi shipped_at/delivered_at. Hasil dilaporkan per
+    order: updated, unchanged, not_found atau invalid_transition.
+    """
+    try:
+        result = bulk_update_status(db, payload)
+    except BulkStatusConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    invalidate_order_counts()
+    return result
 
 @router.put("/{order_id}", response_model=Order)
 def update_order(
@@ -162,12 +346,16 @@ def update_order(
     """
     Update order status (Admin only)
     """
-    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).with_for_update().first()
     if not db_order:
         raise HTTPException(status_code=404, detail="Order not found")
+    before = order_state(db_order)
     
     # Update fields
+    changes = {}
     for key, value in order_update.model_dump(exclude_unset=True).items():
+        if getattr(db_order, key) != value:
+            changes[key] = {"from": getattr(db_order, key), "to": value}
         setattr(db_order, key, value)
     
     # Update timestamps based on status
@@ -176,8 +364,16 @@ def update_order(
     elif order_update.status == OrderStatus.DELIVERED and not db_order.delivered_at:
         db_order.delivered_at = datetime.utcnow()
     
+    if changes:
+        add_order_event(db, db_order, OrderEventType.UPDATED, {"order": order_snapshot(db_order), "changes": changes})
+    # Rollup sales_daily ikut berubah kalau order menjadi / berhenti paid
+    record_payment_changes(db, [
+        (db_order.id, db_order.created_at, db_order.total, payment_sign(before[1], order_state(db_order)[1]))
+    ])
     db.commit()
+    invalidate_order_counts()
     db.refresh(db_order)
+    customer_stats.record_transition(db_order, before)
     return db_order
 
 @router.delete("/{order_id}")
@@ -185,11 +381,20 @@ def delete_order(order_id: int, db: Session = Depends(get_db)):
     """
     Cancel order
     """
-    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).first()
+    db_order = db.query(OrderModel).filter(OrderModel.id == order_id).with_for_update().first()
     if not db_order:
         raise HTTPException(status_code=404, detail="Order not found")
+    before = order_state(db_order)
+    previous_status = db_order.status
     
     db_order.status = OrderStatus.CANCELLED
+    if previous_status != OrderStatus.CANCELLED:
+        add_order_event(db, db_order, OrderEventType.CANCELLED, {
+            "order": order_snapshot(db_order),
+            "previous_status": previous_status,
+        })
     db.commit()
+    invalidate_order_counts()
+    customer_stats.record_transition(db_order, before)
     return {"message": "Order cancelled successfully"}
 
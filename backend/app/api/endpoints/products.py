@@ -1,20 +1,44 @@
 """
 Products API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
+import io
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.product import Product as ProductModel, Category as CategoryModel, Subcategory as SubcategoryModel, ProductVariation as ProductVariationModel
 from app.schemas.product import (
-    Product, ProductCreate, ProductUpdate, ProductList, 
+    Product, ProductCreate, ProductUpdate, ProductListResponse, ProductSummary,
     Category, CategoryCreate, Subcategory, SubcategoryCreate,
-    ProductVariation, ProductVariationCreate
+    ProductVariation, ProductVariationCreate, ProductFacets, ProductImportResult,
+    ProductBulkUpdate, ProductBulkResult, ProductAvailability
 )
 from app.api.endpoints.auth import get_current_admin_user
+from app.services import search as search_service
+from app.services.search import apply_search
+from app.services.facets import compute_facets
+from app.services import product_io
+from app.services.product_bulk import bulk_update
+from app.services.inventory import availability
+from app.services.catalog_cache import (
+    categories_cache, subcategories_cache, release_tags_cache, facet_cache,
+    RELEASE_TAGS_KEY, invalidate_categories, invalidate_subcategories, invalidate_products
+)
+from app.utils.http_cache import make_etag, has_conditional_headers, is_not_modified, not_modified, apply_cache_headers
+from app.utils.pagination import paginate_keyset, encode_cursor, row_key, sort_key, CURSOR_NEXT, CURSOR_PREV
 
 router = APIRouter()
 
+# Eager loading untuk response schema Product (category + images) supaya
+# serialisasi list tidak lazy-load per row (N+1). Category many-to-one cukup
+# di-JOIN; images one-to-many lewat satu SELECT ... IN terpisah.
+PRODUCT_LOADERS = (
+    joinedload(ProductModel.category),
+    selectinload(ProductModel.images),
+)
+
 # Categories
 @router.get("/categories", response_model=List[Category])
 def get_categories(
@@ -23,21 +47,25 @@ def get_categories(
     db: Session = Depends(get_db)
 ):
     """
-    Get all categories
+    Get all categories (cached)
     """
-    categories = db.query(CategoryModel).filter(CategoryModel.is_active == True).offset(skip).limit(limit).all()
-    return categories
+    def load():
+        categories = db.query(CategoryModel).filter(CategoryModel.is_active == True).offset(skip).limit(limit).all()
+        return [Category.model_validate(category) for category in categories]
+    return categories_cache.get_or_set((skip, limit), load)
 
 @router.get("/release-tags", response_model=List[str])
 def get_release_tags(db: Session = Depends(get_db)):
     """
-    Get all available release tags
+    Get all available release tags (cached)
     """
-    release_tags = db.query(ProductModel.release_tag).filter(
-        ProductModel.is_active == True,
-        ProductModel.release_tag.isnot(None)
-    ).distinct().all()
-    return [tag[0] for tag in release_tags if tag[0]]
+    def load():
+        release_tags = db.query(ProductModel.release_tag).filter(
+            ProductModel.is_active == True,
+            ProductModel.release_tag.isnot(None)
+        ).distinct().all()
+        return [tag[0] for tag in release_tags if tag[0]]
+    return release_tags_cache.get_or_set(RELEASE_TAGS_KEY, load)
 
 @router.post("/categories", response_model=Category)
 def create_category(
@@ -51,6 +79,7 @@ def create_category(
     db_category = CategoryModel(**category.model_dump())
     db.add(db_category)
     db.commit()
+    invalidate_categories()
     db.refresh(db_category)
     return db_category
 
@@ -63,14 +92,18 @@ def get_subcategories(
     db: Session = Depends(get_db)
 ):
     """
-    Get all subcategories
+    Get all subcategories (cached)
     """
-    query = db.query(SubcategoryModel).filter(SubcategoryModel.is_active == True)
-    if category_id:
-        query = query.filter(SubcategoryModel.category_id == category_id)
-    
-    subcategories = query.offset(skip).limit(limit).all()
-    return subcategories
+    def load():
+        query = db.query(SubcategoryModel).options(
+            joinedload(SubcategoryModel.category)
+        ).filter(SubcategoryModel.is_active == True)
+        if category_id:
+            query = query.filter(SubcategoryModel.category_id == category_id)
+        
+        subcategories = query.offset(skip).limit(limit).all()
+        return [Subcategory.model_validate(subcategory) for subcategory in subcategories]
+    return subcategories_cache.get_or_set((category_id, skip, limit), load)
 
 @router.post("/subcategories", response_model=Subcategory)
 def create_subcategory(
@@ -84,80 +117,273 @@ def create_subcategory(
     db_subcategory = SubcategoryModel(**subcategory.model_dump())
     db.add(db_subcategory)
     db.commit()
+    invalidate_subcategories()
     db.refresh(db_subcategory)
     return db_subcategory
 
 # Products
-@router.get("/", response_model=ProductList)
+# Sort options untuk listing: (kolom sort, descending). Kolom terakhir selalu
+# id (unik) sebagai tiebreaker supaya urutan stabil antar halaman. "newest"
+# memakai id saja karena id auto-increment mengikuti urutan pembuatan produk.
+PRODUCT_SORTS = {
+    "newest": ([ProductModel.id], True),
+    "price_asc": ([ProductModel.price, ProductModel.id], False),
+    "price_desc": ([ProductModel.price, ProductModel.id], True),
+    "name": ([ProductModel.name, ProductModel.id], False),
+}
+
+class ProductFilters:
+    """
+    Filter query params yang dipakai bersama oleh listing dan facets
+    """
+    def __init__(
+        self,
+        category_id: Optional[int] = None,
+        subcategory_id: Optional[int] = None,
+        brand: Optional[str] = None,
+        is_featured: Optional[bool] = None,
+        is_new_arrival: Optional[bool] = None,
+        release_tag: Optional[str] = None,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ):
+        self.category_id = category_id
+        self.subcategory_id = subcategory_id
+        self.brand = brand
+        self.is_featured = is_featured
+        self.is_new_arrival = is_new_arrival
+        self.release_tag = release_tag
+        self.search = search
+        self.min_price = min_price
+        self.max_price = max_price
+
+    def cache_key(self):
+        return tuple(sorted(vars(self).items()))
+
+    def apply(self, query, db: Session):
+        """
+        Tambahkan filter ke product query. Returns (query, relevance).
+        """
+        query = query.filter(ProductModel.is_active == True)
+        if self.category_id:
+            query = query.filter(ProductModel.category_id == self.category_id)
+        if self.subcategory_id:
+            query = query.filter(ProductModel.subcategory_id == self.subcategory_id)
+        if self.brand:
+            query = query.filter(ProductModel.brand == self.brand)
+        if self.is_featured is not None:
+            query = query.filter(ProductModel.is_featured == self.is_featured)
+        if self.is_new_arrival is not None:
+            query = query.filter(ProductModel.is_new_arrival == self.is_new_arrival)
+        if self.release_tag:
+            query = query.filter(ProductModel.release_tag == self.release_tag)
+        relevance = None
+        if self.search:
+            query, relevance = apply_search(query, db, self.search)
+        if self.min_price:
+            query = query.filter(ProductModel.price >= self.min_price)
+        if self.max_price:
+            query = query.filter(ProductModel.price <= self.max_price)
+        return query, relevance
+
+# Kolom untuk view=summary; diambil langsung sebagai tuple tanpa ORM entity
+PRODUCT_SUMMARY_COLUMNS = [getattr(ProductModel, name) for name in ProductSummary.model_fields]
+
+@router.get("/", response_model=ProductListResponse)
 def get_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    category_id: Optional[int] = None,
-    is_featured: Optional[bool] = None,
-    is_new_arrival: Optional[bool] = None,
-    release_tag: Optional[str] = None,
-    search: Optional[str] = None,
-    min_price: Optional[float] = None,
-    max_price: Optional[float] = None,
+    filters: ProductFilters = Depends(),
+    view: str = Query("summary", pattern="^(summary|full)$"),
+    sort: Optional[str] = Query(None, pattern="^(relevance|newest|price_asc|price_desc|name)$"),
+    cursor: Optional[str] = None,
+    with_total: Optional[bool] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get all products dengan filtering dan pagination
+
+    Tanpa `cursor` endpoint memakai offset pagination (`skip`). Dengan
+    `cursor` (dari `next_cursor`/`prev_cursor`) dipakai keyset pagination
+    yang latency-nya tetap flat di halaman dalam. `total` hanya dihitung
+    kalau `with_total=true` (default: true untuk offset, false untuk cursor).
+
+    `search` memakai full-text index (name, short_description, brand,
+    meta_keywords, sku) dengan prefix matching; default sort-nya `relevance`
+    yang hanya mendukung offset pagination.
+
+    Default `view=summary` hanya mengambil kolom untuk product card;
+    `view=full` mengembalikan schema Product lengkap (category + images).
     """
-    query = db.query(ProductModel).filter(ProductModel.is_active == True)
+    query, relevance = filters.apply(db.query(ProductModel), db)
     
-    # Filters
-    if category_id:
-        query = query.filter(ProductModel.category_id == category_id)
-    if is_featured is not None:
-        query = query.filter(ProductModel.is_featured == is_featured)
-    if is_new_arrival is not None:
-        query = query.filter(ProductModel.is_new_arrival == is_new_arrival)
-    if release_tag:
-        query = query.filter(ProductModel.release_tag == release_tag)
-    if search:
-        query = query.filter(ProductModel.name.ilike(f"%{search}%"))
-    if min_price:
-        query = query.filter(ProductModel.price >= min_price)
-    if max_price:
-        query = query.filter(ProductModel.price <= max_price)
+    if sort is None:
+        sort = "relevance" if relevance is not None else "newest"
+    if sort == "relevance":
+        if cursor:
+            raise HTTPException(status_code=400, detail="Cursor pagination is not supported for relevance sort")
+        if relevance is None:
+            sort = "newest"
     
-    # Count total
-    total = query.count()
+    sort_columns, descending = PRODUCT_SORTS.get(sort, PRODUCT_SORTS["newest"])
     
-    # Get products
-    products = query.offset(skip).limit(limit).all()
+    if with_total is None:
+        with_total = cursor is None
+    total = query.count() if with_total else None
+    if view == "full":
+        query = query.options(*PRODUCT_LOADERS)
+    else:
+        query = query.with_entities(*PRODUCT_SUMMARY_COLUMNS)
+    
+    if cursor:
+        # Keyset pagination
+        try:
+            products, next_cursor, prev_cursor = paginate_keyset(
+                query, sort_columns, descending, limit, cursor
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page = None
+    elif sort == "relevance":
+        products = query.order_by(relevance.desc(), ProductModel.id.desc()).offset(skip).limit(limit).all()
+        next_cursor = None
+        prev_cursor = None
+        page = skip // limit + 1
+    else:
+        # Offset pagination (halaman pertama juga mengembalikan next_cursor)
+        ordering = [c.desc() if descending else c.asc() for c in sort_columns]
+        products = query.order_by(*ordering).offset(skip).limit(limit + 1).all()
+        has_more = len(products) > limit
+        products = products[:limit]
+        sort_id = sort_key(sort_columns, descending)
+        next_cursor = encode_cursor(row_key(products[-1], sort_columns), CURSOR_NEXT, sort_id) if has_more else None
+        prev_cursor = encode_cursor(row_key(products[0], sort_columns), CURSOR_PREV, sort_id) if skip and products else None
+        page = skip // limit + 1
     
     # Calculate pages
-    pages = (total + limit - 1) // limit
+    pages = (total + limit - 1) // limit if total is not None else None
     
     return {
+        "view": view,
         "items": products,
         "total": total,
-        "page": skip // limit + 1,
+        "page": page,
         "page_size": limit,
-        "pages": pages
+        "pages": pages,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
     }
 
-@router.get("/{product_id}", response_model=Product)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+@router.get("/facets", response_model=ProductFacets)
+def get_product_facets(
+    filters: ProductFilters = Depends(),
+    db: Session = Depends(get_db)
+):
     """
-    Get product by ID
+    Get facet counts (category, subcategory, release_tag, brand, price range)
+    untuk filter yang sama dengan listing. Semua facet dihitung dalam satu
+    query dan di-cache sampai ada perubahan product.
     """
-    product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
+    def load():
+        query, _ = filters.apply(db.query(ProductModel), db)
+        return compute_facets(db, query)
+    return facet_cache.get_or_set(filters.cache_key(), load)
+
+@router.post("/import", response_model=ProductImportResult)
+def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Bulk import products dari CSV/NDJSON (Admin only)
+
+    Setiap row divalidasi dengan ProductCreate (dan ProductVariationCreate
+    untuk kolom `variations`), lalu ditulis per chunk dengan executemany.
+    Row yang gagal dilaporkan per nomor baris tanpa menggagalkan row lain.
+    """
+    fmt = product_io.detect_format(file.filename, format)
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        result = product_io.import_products(db, stream, fmt)
+    finally:
+        stream.detach()
+    if result["created"]:
+        invalidate_products()
+    return result
+
+@router.get("/export")
+def export_products(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    include_inactive: bool = False,
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Stream seluruh katalog sebagai CSV/NDJSON (Admin only)
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        product_io.export_products(format, include_inactive),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
+
+def _product_validators(row):
+    """
+    ETag + Last-Modified dari versi product. Stock ikut di-hash karena
+    berubah cepat saat checkout (updated_at MySQL hanya presisi detik).
+    """
+    last_modified = row.updated_at or row.created_at
+    return make_etag(row.id, last_modified, row.stock, row.is_active), last_modified
+
+def _get_product_conditional(request: Request, response: Response, db: Session, condition):
+    """
+    Kalau client mengirim If-None-Match/If-Modified-Since, cek versi lewat
+    query kolom ringan dulu dan jawab 304 tanpa load relationships.
+    """
+    if has_conditional_headers(request):
+        version = db.query(
+            ProductModel.id, ProductModel.created_at, ProductModel.updated_at,
+            ProductModel.stock, ProductModel.is_active
+        ).filter(condition).first()
+        if not version:
+            raise HTTPException(status_code=404, detail="Product not found")
+        etag, last_modified = _product_validators(version)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified, settings.PRODUCT_CACHE_CONTROL)
+    
+    product = db.query(ProductModel).options(*PRODUCT_LOADERS).filter(condition).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
+    etag, last_modified = _product_validators(product)
+    apply_cache_headers(response, etag, last_modified, settings.PRODUCT_CACHE_CONTROL)
     return product
 
-@router.get("/slug/{slug}", response_model=Product)
-def get_product_by_slug(slug: str, db: Session = Depends(get_db)):
+@router.get("/{product_id}", response_model=Product)
+def get_product(product_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
-    Get product by slug
+    Get product by ID (mendukung ETag / 304)
     """
-    product = db.query(ProductModel).filter(ProductModel.slug == slug).first()
-    if not product:
+    return _get_product_conditional(request, response, db, ProductModel.id == product_id)
+
+@router.get("/{product_id}/availability", response_model=ProductAvailability)
+def get_product_availability(product_id: int, db: Session = Depends(get_db)):
+    """
+    Stock tersedia (stock - hold cart aktif) untuk product dan variasinya
+    """
+    result = availability(db, product_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return result
+
+@router.get("/slug/{slug}", response_model=Product)
+def get_product_by_slug(slug: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    """
+    Get product by slug (mendukung ETag / 304)
+    """
+    return _get_product_conditional(request, response, db, ProductModel.slug == slug)
 
 @router.post("/", response_model=Product)
 def create_product(
@@ -175,12 +401,13 @@ def create_product(
     
     # Generate slug if not provided
     if not product.slug:
-        import re
-        product.slug = re.sub(r'[^a-zA-Z0-9\-]', '-', product.name.lower()).strip('-')
+        product.slug = product_io.slugify(product.name)
     
     db_product = ProductModel(**product.model_dump())
     db.add(db_product)
+    search_service.sync_product(db, db_product)
     db.commit()
+    invalidate_products()
     db.refresh(db_product)
     return db_product
 
@@ -201,10 +428,31 @@ def update_product(
     for key, value in product_update.model_dump(exclude_unset=True).items():
         setattr(db_product, key, value)
     
+    search_service.sync_product(db, db_product)
     db.commit()
+    invalidate_products()
     db.refresh(db_product)
     return db_product
 
+@router.patch("/bulk", response_model=ProductBulkResult)
+def bulk_update_products(
+    payload: ProductBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Bulk update price/stock/status (Admin only)
+
+    `items` meng-update product per id atau sku; `adjustment` menaikkan/
+    menurunkan price atau stock (percent/absolute) untuk satu category atau
+    release_tag. Semua dijalankan sebagai set-based UPDATE dalam satu transaksi.
+    """
+    if not payload.items and payload.adjustment is None:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    result = bulk_update(db, payload.items, payload.adjustment)
+    invalidate_products()
+    return result
+
 @router.delete("/{product_id}")
 def delete_product(
     product_id: int, 
@@ -219,7 +467,9 @@ def delete_product(
         raise HTTPException(status_code=404, detail="Product not found")
     
     db_product.is_active = False
+    search_service.sync_product(db, db_product)
     db.commit()
+    invalidate_products()
     return {"message": "Product deleted successfully"}
 
 # Product Variations
@@ -1,13 +1,16 @@
 """
 Promotions API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.promotion import Promotion as PromotionModel
 from app.schemas.promotion import Promotion, PromotionCreate
+from app.services.promotions import PromotionError, allocate_usage_shards, promotion_index, validate_code, with_uses
+from app.utils.http_cache import make_etag, is_not_modified, not_modified, apply_cache_headers
 
 router = APIRouter()
 
@@ -34,7 +37,7 @@ def get_promotions(
         )
     
     promotions = query.order_by(PromotionModel.created_at.desc()).offset(skip).limit(limit).all()
-    return promotions
+    return with_uses(db, promotions)
 
 @router.get("/{promotion_id}", response_model=Promotion)
 def get_promotion(promotion_id: int, db: Session = Depends(get_db)):
@@ -44,32 +47,28 @@ def get_promotion(promotion_id: int, db: Session = Depends(get_db)):
     promotion = db.query(PromotionModel).filter(PromotionModel.id == promotion_id).first()
     if not promotion:
         raise HTTPException(status_code=404, detail="Promotion not found")
-    return promotion
+    return with_uses(db, [promotion])[0]
 
 @router.get("/code/{code}", response_model=Promotion)
-def get_promotion_by_code(code: str, db: Session = Depends(get_db)):
+def get_promotion_by_code(code: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """
-    Get promotion by code
+    Get promotion by code (mendukung ETag / 304)
+
+    Promo yang berlaku dibaca dari index in-memory (current_uses bisa
+    tertinggal sampai PROMOTION_INDEX_TTL detik); code yang tidak valid
+    dicek ke database untuk pesan error-nya.
     """
-    promotion = db.query(PromotionModel).filter(PromotionModel.code == code.upper()).first()
-    if not promotion:
-        raise HTTPException(status_code=404, detail="Promotion code not found")
-    
-    # Check if active
-    if not promotion.is_active:
-        raise HTTPException(status_code=400, detail="Promotion is not active")
-    
-    # Check dates
-    now = datetime.utcnow()
-    if promotion.start_date and promotion.start_date > now:
-        raise HTTPException(status_code=400, detail="Promotion has not started yet")
-    if promotion.end_date and promotion.end_date < now:
-        raise HTTPException(status_code=400, detail="Promotion has expired")
-    
-    # Check usage limit
-    if promotion.max_uses and promotion.current_uses >= promotion.max_uses:
-        raise HTTPException(status_code=400, detail="Promotion usage limit reached")
+    try:
+        promotion = validate_code(db, code)
+    except PromotionError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
+    # Validasi di atas tetap jalan setiap request; 304 hanya untuk promo valid
+    last_modified = promotion.updated_at or promotion.created_at
+    etag = make_etag(promotion.id, last_modified, promotion.current_uses, promotion.is_active)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified, settings.PROMOTION_CACHE_CONTROL)
+    apply_cache_headers(response, etag, last_modified, settings.PROMOTION_CACHE_CONTROL)
     return promotion
 
 @router.post("/", response_model=Promotion)
@@ -91,10 +90,13 @@ def create_promotion(
     
     db_promotion = PromotionModel(**promotion_data)
     db.add(db_promotion)
+    db.flush()
+    allocate_usage_shards(db, db_promotion.id, db_promotion.max_uses)
     db.commit()
     db.refresh(db_promotion)
+    promotion_index.invalidate()
     
-    return db_promotion
+    return with_uses(db, [db_promotion])[0]
 
 @router.put("/{promotion_id}", response_model=Promotion)
 def update_promotion(
@@ -109,13 +111,18 @@ def update_promotion(
     if not db_promotion:
         raise HTTPException(status_code=404, detail="Promotion not found")
     
-    # Update fields
-    for key, value in promotion_update.model_dump().items():
+    # Update fields (code selalu uppercase, sama dengan create)
+    promotion_data = promotion_update.model_dump()
+    promotion_data['code'] = promotion_data['code'].upper()
+    for key, value in promotion_data.items():
         setattr(db_promotion, key, value)
     
+    # Bagi ulang sisa kuota kalau max_uses berubah
+    allocate_usage_shards(db, db_promotion.id, db_promotion.max_uses)
     db.commit()
     db.refresh(db_promotion)
-    return db_promotion
+    promotion_index.invalidate()
+    return with_uses(db, [db_promotion])[0]
 
 @router.delete("/{promotion_id}")
 def delete_promotion(promotion_id: int, db: Session = Depends(get_db)):
@@ -128,5 +135,6 @@ def delete_promotion(promotion_id: int, db: Session = Depends(get_db)):
     
     db_promotion.is_active = False
     db.commit()
+    promotion_index.invalidate()
     return {"message": "Promotion deleted successfully"}
 
@@ -0,0 +1,115 @@
+"""
+Upload API Endpoints - product images
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.product import Product as ProductModel
+from app.schemas.product import ProductImage
+from app.api.endpoints.auth import get_current_admin_user
+from app.services.images import (
+    ImageUploadError, MULTIPART_OVERHEAD, attach_product_image, limit_stream,
+    preferred_variants, process_upload,
+)
+
+router = APIRouter()
+
+IMAGE_UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "product_id": {"type": "integer"},
+                        "is_primary": {"type": "boolean"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+def _form_bool(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+@router.post("/image", openapi_extra=IMAGE_UPLOAD_FORM)
+async def upload_image(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Upload image (Admin only)
+
+    Body multipart dibaca sebagai stream: upload dihentikan begitu melebihi
+    MAX_UPLOAD_SIZE dan MIME dicek dari isi file. Derivatives WebP/JPEG
+    dibuat di process pool. Kalau `product_id` dikirim, hasilnya dicatat
+    sebagai ProductImage (dengan semua variants).
+    """
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and \
+            int(content_length) > settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=f"File too large (max {settings.MAX_UPLOAD_SIZE} bytes)")
+
+    parser = MultiPartParser(
+        request.headers,
+        limit_stream(request.stream(), settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD),
+        max_files=1,
+        max_fields=10,
+    )
+    try:
+        form = await parser.parse()
+    except ImageUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    try:
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=400, detail="Field 'file' is required")
+        product_id = form.get("product_id")
+        is_primary = _form_bool(form.get("is_primary", False))
+        if product_id is not None:
+            if not str(product_id).isdigit():
+                raise HTTPException(status_code=400, detail="product_id must be an integer")
+            product_id = int(product_id)
+            exists = await run_in_threadpool(
+                lambda: db.query(ProductModel.id).filter(ProductModel.id == product_id).first()
+            )
+            if not exists:
+                raise HTTPException(status_code=404, detail="Product not found")
+
+        try:
+            result = await process_upload(upload)
+        except ImageUploadError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+    finally:
+        await form.close()
+
+    sized = preferred_variants(result["variants"])
+    response = {
+        "message": "Image uploaded successfully",
+        **result,
+        "urls": {
+            "original": result["url"],
+            "medium": sized[len(sized) // 2]["url"],
+            "thumbnail": sized[0]["url"],
+        },
+        "uploaded_at": datetime.utcnow().isoformat(),
+    }
+    if product_id is not None:
+        image = await run_in_threadpool(attach_product_image, db, product_id, result, is_primary)
+        response["image"] = ProductImage.model_validate(image)
+    return response
@@ -0,0 +1,145 @@
+"""
+In-process cache - TTL + LRU untuk data katalog yang jarang berubah
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# Semua cache yang dibuat, untuk statistik di /health/cache
+_registry: Dict[str, "TTLCache"] = {}
+
+class _Flight:
+    """
+    Satu load yang sedang berjalan; request lain untuk key yang sama menunggu
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+class TTLCache:
+    """
+    Cache thread-safe dengan batas umur (ttl, detik) dan jumlah entry (maxsize).
+    Entry yang paling lama tidak dipakai dibuang duluan saat cache penuh.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        # Dinaikkan setiap invalidate/clear supaya load yang mulai sebelum
+        # invalidasi tidak menyimpan data lama
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def _lookup(self, key: Hashable) -> Any:
+        # Dipanggil dengan self._lock terkunci
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def _store(self, key: Hashable, value: Any, expires_at: float) -> None:
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Ambil dari cache atau jalankan loader. Kalau beberapa request miss
+        bersamaan, hanya satu yang menjalankan loader (single-flight);
+        sisanya menunggu hasilnya.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                generation = self._generation
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if flight.error is None and generation == self._generation:
+                    self._store(key, flight.value, time.monotonic() + (self.ttl if ttl is None else ttl))
+            flight.event.set()
+        return flight.value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+def cache_stats() -> dict:
+    """
+    Statistik semua cache (hit/miss/size) per nama cache
+    """
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -1,7 +1,7 @@
 """
 Configuration settings menggunakan Pydantic
 """
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl
 
@@ -35,11 +35,81 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 5242880  # 5MB
     UPLOAD_DIR: str = "./uploads"
     ALLOWED_EXTENSIONS: List[str] = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
+    ALLOWED_IMAGE_TYPES: List[str] = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+    UPLOAD_CHUNK_SIZE: int = 65536
+    # File upload bernama content hash tidak pernah berubah isinya
+    UPLOAD_IMMUTABLE_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+    UPLOAD_CACHE_CONTROL: str = "public, max-age=300"
+    
+    # Image derivatives (lebar dalam px; tidak pernah di-upscale)
+    IMAGE_DERIVATIVE_WIDTHS: List[int] = [320, 640, 1280]
+    IMAGE_DERIVATIVE_FORMATS: List[str] = ["webp", "jpeg"]
+    IMAGE_QUALITY: int = 82
+    IMAGE_MAX_PIXELS: int = 40000000  # proteksi decompression bomb
+    IMAGE_WORKERS: int = 2  # jumlah process untuk resize
     
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # Catalog cache (categories, subcategories, release tags)
+    CATALOG_CACHE_TTL: int = 600  # detik
+    
+    # HTTP caching (Cache-Control per route)
+    PRODUCT_CACHE_CONTROL: str = "public, max-age=60, stale-while-revalidate=300"
+    ORDER_CACHE_CONTROL: str = "private, no-cache"
+    
+    # Admin order list: total (opsional) di-cache per kombinasi filter
+    ORDER_COUNT_CACHE_TTL: int = 60  # detik
+    ORDER_COUNT_CACHE_SIZE: int = 256
+    PROMOTION_CACHE_CONTROL: str = "public, max-age=30"
+    # Index promo aktif in-memory; dibangun ulang paling lama setelah ini (detik)
+    PROMOTION_INDEX_TTL: float = 60.0
+    # Counter pemakaian promo dipecah ke sekian row (mengurangi lock contention)
+    PROMOTION_USAGE_SHARDS: int = 16
+    
+    # Analytics dashboard: snapshot di-cache, dihitung ulang di background
+    DASHBOARD_CACHE_TTL: float = 60.0  # detik snapshot boleh dipakai (stale_at)
+    DASHBOARD_REFRESH_INTERVAL: float = 20.0  # detik antar refresh (< TTL)
+    # Timezone pembagian hari untuk rollup sales_daily / sales chart
+    SALES_TIMEZONE: str = "Asia/Jakarta"
+    
+    # Catalog facets
+    FACET_PRICE_BUCKETS: List[int] = [100000, 250000, 500000, 1000000]
+    FACET_CACHE_TTL: int = 300  # detik
+    FACET_CACHE_SIZE: int = 512
+    
+    # Idempotency-Key untuk POST (retry checkout)
+    IDEMPOTENCY_TTL: int = 86400  # detik response disimpan
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 30.0  # tunggu request pertama yang sama
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 120  # claim dianggap mati setelah ini
+    IDEMPOTENCY_PURGE_INTERVAL: float = 3600.0  # detik antar purge row kedaluwarsa
+    IDEMPOTENCY_PURGE_BATCH: int = 1000  # row dihapus per transaksi
+    
+    # Order archive (scripts/archive_orders.py)
+    ORDER_ARCHIVE_AFTER_DAYS: int = 180  # order delivered/cancelled lebih tua dari ini
+    ORDER_ARCHIVE_BATCH_SIZE: int = 500  # order per transaksi
+    
+    # Customer stats (write-behind dari lifecycle order)
+    CUSTOMER_STATS_FLUSH_INTERVAL: float = 2.0  # detik antar flush
+    CUSTOMER_STATS_BATCH_SIZE: int = 500  # customer per transaksi
+    
+    # Order events outbox (dikirim background dispatcher ke handlers lokal)
+    ORDER_EVENTS_DISPATCH_INTERVAL: float = 1.0  # detik antar batch kalau outbox kosong
+    ORDER_EVENTS_BATCH_SIZE: int = 100  # event per batch
+    ORDER_EVENTS_LEASE: int = 60  # detik event dipegang satu dispatcher
+    ORDER_EVENTS_MAX_ATTEMPTS: int = 10  # setelah ini event ditandai failed
+    ORDER_EVENTS_RETRY_BASE: float = 2.0  # detik; backoff dobel tiap percobaan
+    ORDER_EVENTS_RETRY_MAX: float = 300.0
+    ORDER_EVENTS_RETENTION_DAYS: int = 7  # event dispatched disimpan selama ini
+    ORDER_EVENTS_FILE: Optional[str] = None  # tulis semua event ke file NDJSON (dev/test)
+    
+    # Inventory hold (reservasi stock cart sebelum checkout)
+    INVENTORY_HOLD_TTL: int = 600  # detik; diperpanjang setiap cart di-update
+    INVENTORY_HOLD_SWEEP_INTERVAL: float = 15.0  # detik antar sweep
+    INVENTORY_HOLD_SWEEP_BATCH: int = 500  # hold dilepas per transaksi
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
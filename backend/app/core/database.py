@@ -1,7 +1,8 @@
 """
 Database configuration dan session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, create_engine, event
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -12,12 +13,29 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
 
+# Semua timestamp disimpan sebagai UTC naive: aplikasi memakai utcnow(), dan
+# session MySQL di-set ke UTC supaya server_default NOW()/CURRENT_TIMESTAMP
+# juga UTC (bukan timezone server). SQLite CURRENT_TIMESTAMP sudah UTC.
+if engine.dialect.name == "mysql":
+    @event.listens_for(engine, "connect")
+    def _use_utc(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("SET time_zone = '+00:00'")
+        cursor.close()
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class
 Base = declarative_base()
 
+# DateTime untuk kolom yang dipakai sebagai cursor keyset. SQLite menyimpan
+# CURRENT_TIMESTAMP tanpa microseconds; bind parameter dibuat dengan format
+# yang sama supaya perbandingan (string) `=`/`<` dengan nilai cursor benar.
+CursorDateTime = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+)
+
 # Dependency untuk get database session
 def get_db():
     """
@@ -0,0 +1,80 @@
+"""
+Static file serving untuk /uploads - cache immutable untuk file yang namanya
+content hash, plus precompressed variant (.br/.gz) kalau client mendukung
+"""
+import os
+import re
+from mimetypes import guess_type
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from app.core.config import settings
+
+# Panjang content hash (hex sha256) di nama file: 80 bit, cukup untuk katalog
+CONTENT_HASH_LENGTH = 20
+HASHED_NAME_RE = re.compile(r"^([0-9a-f]{%d})\.[a-z0-9]+$" % CONTENT_HASH_LENGTH)
+
+# Urutan preferensi encoding precompressed
+PRECOMPRESSED = [("br", ".br"), ("gzip", ".gz")]
+# Hanya tipe ini yang diuntungkan kompresi (gambar raster sudah terkompres)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+def content_hash_name(digest: str, extension: str) -> str:
+    """
+    Nama file dari content hash, mis. "3f2a...c9.webp"
+    """
+    return f"{digest[:CONTENT_HASH_LENGTH]}.{extension.lstrip('.')}"
+
+def _accepted_encodings(request_headers: Headers) -> set:
+    encodings = set()
+    for part in request_headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            encodings.add(name.lower())
+    return encodings
+
+class UploadStaticFiles(StaticFiles):
+    """
+    StaticFiles dengan Cache-Control per jenis file:
+
+    - nama content hash: `immutable` + strong ETag dari hash (isi file tidak
+      pernah berubah untuk URL yang sama, jadi kunjungan ulang tanpa request)
+    - file lain (upload lama, manifest): cache pendek + revalidasi ETag
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        name = os.path.basename(full_path)
+        media_type = guess_type(name)[0] or "application/octet-stream"
+        compressible = media_type.startswith(COMPRESSIBLE_TYPES)
+
+        encoding = None
+        if compressible:
+            accepted = _accepted_encodings(request_headers)
+            for candidate, suffix in PRECOMPRESSED:
+                if candidate not in accepted:
+                    continue
+                try:
+                    compressed_stat = os.stat(f"{full_path}{suffix}")
+                except OSError:
+                    continue
+                full_path, stat_result, encoding = f"{full_path}{suffix}", compressed_stat, candidate
+                break
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if compressible:
+            response.headers["Vary"] = "Accept-Encoding"
+
+        hashed = HASHED_NAME_RE.match(name)
+        if hashed:
+            suffix = f"-{encoding}" if encoding else ""
+            response.headers["ETag"] = f'"{hashed.group(1)}{suffix}"'
+            response.headers["Cache-Control"] = settings.UPLOAD_IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = settings.UPLOAD_CACHE_CONTROL
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
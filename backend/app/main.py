@@ -1,12 +1,48 @@
 """
 Main application file - Entry point untuk FastAPI
 """
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
 from app.api.api import api_router
-from app.core.database import engine, Base
+from app.core.database import SessionLocal, engine, Base
+from app.core.cache import cache_stats
+from app.core.static import UploadStaticFiles
+from app.services.search import ensure_search_index
+from app.services.images import shutdown_image_pool
+from app.services.idempotency import run_idempotency_purger
+from app.services.inventory import run_hold_sweeper
+from app.services.customer_stats import customer_stats, run_customer_stats_flusher
+from app.services.order_events import outbox_lag, run_order_event_dispatcher
+from app.services.dashboard import run_dashboard_refresher
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup/shutdown hooks
+    """
+    # Siapkan search index (FTS5 di SQLite; MySQL memakai FULLTEXT dari SQL script)
+    ensure_search_index(engine)
+    # Lepas inventory hold cart yang kedaluwarsa secara berkala
+    sweeper = asyncio.create_task(run_hold_sweeper())
+    # Tulis aggregates customer (write-behind) secara berkala
+    flusher = asyncio.create_task(run_customer_stats_flusher())
+    # Kirim order events dari outbox ke handlers
+    dispatcher = asyncio.create_task(run_order_event_dispatcher())
+    # Snapshot statistik dashboard admin
+    refresher = asyncio.create_task(run_dashboard_refresher())
+    # Buang Idempotency-Key yang sudah kedaluwarsa (startup + berkala)
+    purger = asyncio.create_task(run_idempotency_purger())
+    yield
+    for task in (sweeper, flusher, dispatcher, refresher, purger):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Delta customer stats yang tersisa
+    customer_stats.flush()
+    shutdown_image_pool()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -14,6 +50,7 @@ app = FastAPI(
     description="Backend API untuk Dark Chic Emporium E-commerce",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # CORS Middleware
@@ -25,8 +62,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Mount static files (content-hashed uploads di-cache immutable)
+app.mount("/uploads", UploadStaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_PREFIX)
@@ -50,6 +87,24 @@ async def health_check():
     """
     return {"status": "healthy"}
 
+@app.get("/health/cache")
+async def cache_health():
+    """
+    Hit/miss counters untuk in-process caches
+    """
+    return cache_stats()
+
+@app.get("/health/events")
+def events_health():
+    """
+    Lag outbox order events (pending, failed, umur event pending tertua)
+    """
+    db = SessionLocal()
+    try:
+        return outbox_lag(db)
+    finally:
+        db.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
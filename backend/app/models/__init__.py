@@ -2,8 +2,13 @@
 from app.models.user import User
 from app.models.product import Product, ProductImage, Category
 from app.models.order import Order, OrderItem
+from app.models.order_archive import ArchivedOrder, ArchivedOrderItem, OrderArchiveDaily, OrderArchiveProduct
+from app.models.order_event import OrderEvent
 from app.models.customer import Customer
-from app.models.promotion import Promotion
+from app.models.promotion import Promotion, PromotionRedemption, PromotionUsageShard
+from app.models.idempotency import IdempotencyKey
+from app.models.inventory import InventoryHold
+from app.models.sales import SalesDaily, SalesDailyCategory
 
 __all__ = [
     "User",
@@ -12,7 +17,18 @@ __all__ = [
     "Category",
     "Order",
     "OrderItem",
+    "ArchivedOrder",
+    "ArchivedOrderItem",
+    "OrderArchiveDaily",
+    "OrderArchiveProduct",
+    "OrderEvent",
     "Customer",
-    "Promotion"
+    "Promotion",
+    "PromotionRedemption",
+    "PromotionUsageShard",
+    "IdempotencyKey",
+    "InventoryHold",
+    "SalesDaily",
+    "SalesDailyCategory"
 ]
 
@@ -0,0 +1,27 @@
+"""
+Idempotency Key Model - response tersimpan untuk request POST yang di-retry
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from app.core.database import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(64), nullable=False)  # e.g. "orders.create"
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 request body
+    
+    # NULL selama request pertama masih diproses
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    
+    # Waktu UTC dari aplikasi (bukan server_default) supaya bisa dibandingkan
+    locked_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey {self.scope}:{self.key}>"
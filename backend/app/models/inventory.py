@@ -0,0 +1,27 @@
+"""
+Inventory Hold Model - reservasi stock sementara untuk cart
+"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.core.database import Base
+
+class InventoryHold(Base):
+    __tablename__ = "inventory_holds"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cart_id = Column(String(64), nullable=False, index=True)  # id cart dari client
+    product_id = Column(Integer, ForeignKey("products.id", name="fk_inventory_holds_product_id"), nullable=False)
+    # NULL: hold atas stock product; selain itu stock variation
+    variation_id = Column(Integer, ForeignKey("product_variations.id", name="fk_inventory_holds_variation_id"))
+    quantity = Column(Integer, nullable=False)
+    
+    # Waktu UTC dari aplikasi (bukan server_default) supaya bisa dibandingkan
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        # Sweeper: hold kedaluwarsa paling lama dulu
+        Index("ix_inventory_holds_expires_at_id", "expires_at", "id"),
+    )
+    
+    def __repr__(self):
+        return f"<InventoryHold {self.cart_id} product={self.product_id} qty={self.quantity}>"
@@ -1,11 +1,11 @@
 """
 Order Models - Order & OrderItem
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
-from app.core.database import Base
+from app.core.database import Base, CursorDateTime
 
 class OrderStatus(str, enum.Enum):
     PENDING = "pending"
@@ -42,6 +42,7 @@ class Order(Base):
     shipping_cost = Column(Float, default=0)
     tax = Column(Float, default=0)
     discount = Column(Float, default=0)
+    promotion_code = Column(String(50))  # promo yang dipakai saat checkout
     total = Column(Float, nullable=False)
     
     # Status
@@ -53,7 +54,7 @@ class Order(Base):
     notes = Column(Text)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(CursorDateTime, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     shipped_at = Column(DateTime(timezone=True))
     delivered_at = Column(DateTime(timezone=True))
@@ -61,6 +62,15 @@ class Order(Base):
     # Relationships
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     
+    # Admin order list: keyset (created_at, id) dengan/tanpa filter
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_payment_status_created_at", "payment_status", "created_at"),
+        Index("ix_orders_customer_email_created_at", "customer_email", "created_at"),
+        Index("ix_orders_customer_phone_created_at", "customer_phone", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<Order {self.order_number}>"
 
@@ -68,10 +78,12 @@ class OrderItem(Base):
     __tablename__ = "order_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    variation_id = Column(Integer, ForeignKey("product_variations.id"), nullable=True)
     
     product_name = Column(String, nullable=False)
+    variation_name = Column(String, nullable=True)
     product_price = Column(Float, nullable=False)
     quantity = Column(Integer, nullable=False)
     subtotal = Column(Float, nullable=False)
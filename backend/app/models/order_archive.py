@@ -0,0 +1,99 @@
+"""
+Order Archive Models - order lama yang sudah selesai (delivered/cancelled)
+
+Dipindahkan dari orders/order_items oleh scripts/archive_orders.py supaya
+table hot tetap kecil. Id dan kolom sama dengan table asal. Aggregates
+untuk analytics disimpan di order_archive_daily & order_archive_products.
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Text, Enum
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from app.models.order import OrderStatus, PaymentStatus
+
+class ArchivedOrder(Base):
+    __tablename__ = "orders_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    order_number = Column(String, unique=True, index=True, nullable=False)
+    
+    # Customer Info
+    customer_name = Column(String, nullable=False)
+    customer_email = Column(String, nullable=False, index=True)
+    customer_phone = Column(String, nullable=False)
+    
+    # Shipping Address
+    shipping_address = Column(Text, nullable=False)
+    shipping_city = Column(String, nullable=False)
+    shipping_province = Column(String, nullable=False)
+    shipping_postal_code = Column(String)
+    
+    # Order Info
+    subtotal = Column(Float, nullable=False)
+    shipping_cost = Column(Float, default=0)
+    tax = Column(Float, default=0)
+    discount = Column(Float, default=0)
+    promotion_code = Column(String(50))
+    total = Column(Float, nullable=False)
+    
+    # Status
+    status = Column(Enum(OrderStatus))
+    payment_status = Column(Enum(PaymentStatus))
+    payment_method = Column(String)
+    
+    # Notes
+    notes = Column(Text)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    shipped_at = Column(DateTime(timezone=True))
+    delivered_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime, nullable=False)
+    
+    # Relationships
+    items = relationship("ArchivedOrderItem", back_populates="order", cascade="all, delete-orphan")
+    
+    def __repr__(self):
+        return f"<ArchivedOrder {self.order_number}>"
+
+class ArchivedOrderItem(Base):
+    __tablename__ = "order_items_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    order_id = Column(Integer, ForeignKey("orders_archive.id", name="fk_order_items_archive_order_id"), nullable=False, index=True)
+    product_id = Column(Integer, nullable=False)
+    variation_id = Column(Integer)
+    
+    product_name = Column(String, nullable=False)
+    variation_name = Column(String, nullable=True)
+    product_price = Column(Float, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    subtotal = Column(Float, nullable=False)
+    
+    # Relationships
+    order = relationship("ArchivedOrder", back_populates="items")
+    
+    def __repr__(self):
+        return f"<ArchivedOrderItem {self.id} - {self.product_name}>"
+
+class OrderArchiveDaily(Base):
+    """
+    Aggregates harian order yang sudah diarsipkan (tanggal created_at di
+    SALES_TIMEZONE, sama dengan sales_daily)
+    """
+    __tablename__ = "order_archive_daily"
+    
+    date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    paid_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)  # total order paid
+
+class OrderArchiveProduct(Base):
+    """
+    Aggregates per product dari item order yang sudah diarsipkan
+    """
+    __tablename__ = "order_archive_products"
+    
+    product_id = Column(Integer, primary_key=True, autoincrement=False)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
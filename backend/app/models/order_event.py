@@ -0,0 +1,47 @@
+"""
+Order Event Model - outbox event lifecycle order (ditulis di transaksi yang
+sama dengan perubahan order, dikirim ke handlers oleh dispatcher)
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.core.database import Base
+
+class OrderEventType:
+    CREATED = "order.created"
+    UPDATED = "order.updated"
+    CANCELLED = "order.cancelled"
+
+class OrderEventStatus:
+    PENDING = "pending"
+    DISPATCHED = "dispatched"
+    FAILED = "failed"  # melewati ORDER_EVENTS_MAX_ATTEMPTS
+
+class OrderEvent(Base):
+    __tablename__ = "order_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Tanpa foreign key: order bisa dipindah ke orders_archive
+    order_id = Column(Integer, nullable=False)
+    order_number = Column(String(50), nullable=False)
+    event_type = Column(String(32), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+
+    status = Column(String(16), nullable=False, default=OrderEventStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    # Dispatcher yang sedang memegang lease event ini
+    claimed_by = Column(String(32))
+
+    # Waktu UTC dari aplikasi (bukan server_default) supaya bisa dibandingkan
+    created_at = Column(DateTime, nullable=False)
+    # Event baru boleh dikirim setelah waktu ini (lease / backoff retry)
+    available_at = Column(DateTime, nullable=False)
+    dispatched_at = Column(DateTime)
+
+    __table_args__ = (
+        # Dispatcher: event pending paling lama dulu
+        Index("ix_order_events_status_id", "status", "id"),
+        Index("ix_order_events_order_id_id", "order_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<OrderEvent {self.event_type} order={self.order_number} {self.status}>"
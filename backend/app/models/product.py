@@ -1,7 +1,7 @@
 """
 Product Models - Product, Category, ProductImage
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -61,6 +61,9 @@ class Product(Base):
     
     # Stock & Inventory
     stock = Column(Integer, default=0)
+    # Jumlah unit yang sedang di-hold cart (lihat app/services/inventory.py);
+    # tersedia = stock - reserved
+    reserved = Column(Integer, nullable=False, default=0, server_default="0")
     min_stock = Column(Integer, default=0)  # Stok minimum
     sku = Column(String, unique=True, index=True)
     barcode = Column(String)  # Barcode produk
@@ -117,6 +120,23 @@ class Product(Base):
     variations = relationship("ProductVariation", back_populates="product", cascade="all, delete-orphan")
     order_items = relationship("OrderItem", back_populates="product")
     
+    # Indexes untuk sort listing (InnoDB menambahkan PK id secara implisit,
+    # jadi keyset (sort_col, id) tetap bisa memakai index ini)
+    __table_args__ = (
+        Index("ix_products_active_price", "is_active", "price"),
+        Index("ix_products_active_name", "is_active", "name"),
+        # Filter listing yang paling sering dipakai
+        Index("ix_products_active_category_price", "is_active", "category_id", "price"),
+        Index("ix_products_active_featured", "is_active", "is_featured"),
+        Index("ix_products_active_release_tag", "is_active", "release_tag"),
+        # Full-text search (lihat app/services/search.py); SQLite memakai FTS5
+        Index(
+            "ft_products_search",
+            "name", "short_description", "brand", "meta_keywords", "sku",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+    )
+    
     def __repr__(self):
         return f"<Product {self.name}>"
 
@@ -128,6 +148,10 @@ class ProductImage(Base):
     image_url = Column(String, nullable=False)
     is_primary = Column(Boolean, default=False)
     sort_order = Column(Integer, default=0)
+    width = Column(Integer)
+    height = Column(Integer)
+    # Derivatives hasil upload: [{"format", "width", "height", "url", "size"}]
+    variants = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -146,6 +170,7 @@ class ProductVariation(Base):
     sku = Column(String, unique=True, index=True)
     price = Column(Float)  # Harga khusus untuk variasi ini
     stock = Column(Integer, default=0)
+    reserved = Column(Integer, nullable=False, default=0, server_default="0")  # di-hold cart
     image_url = Column(String)  # Gambar khusus untuk variasi
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
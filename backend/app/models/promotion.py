@@ -1,7 +1,7 @@
 """
 Promotion Model - untuk discount codes, promo banners, dll
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, Enum, Index, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 import enum
 from app.core.database import Base
@@ -25,6 +25,7 @@ class Promotion(Base):
     
     # Usage limits
     max_uses = Column(Integer)
+    # Tidak di-update per checkout; total pemakaian = SUM(promotion_usage_shards.used)
     current_uses = Column(Integer, default=0)
     max_uses_per_customer = Column(Integer, default=1)
     
@@ -40,6 +41,48 @@ class Promotion(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Lookup promo aktif dalam rentang tanggal
+    __table_args__ = (
+        Index("ix_promotions_active_dates", "is_active", "start_date", "end_date"),
+    )
+    
     def __repr__(self):
         return f"<Promotion {self.code}>"
 
+
+class PromotionUsageShard(Base):
+    """
+    Counter pemakaian promo yang dipecah ke beberapa row supaya checkout
+    bersamaan tidak antre di satu row. Jumlah quota semua shard = max_uses.
+    """
+    __tablename__ = "promotion_usage_shards"
+    
+    promotion_id = Column(Integer, ForeignKey("promotions.id", name="fk_promotion_usage_shards_promotion_id"), primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    used = Column(Integer, nullable=False, default=0)
+    quota = Column(Integer)  # NULL = tanpa batas
+    
+    def __repr__(self):
+        return f"<PromotionUsageShard {self.promotion_id}#{self.shard} {self.used}/{self.quota}>"
+
+class PromotionRedemption(Base):
+    """
+    Satu pemakaian promo oleh customer (per order)
+    """
+    __tablename__ = "promotion_redemptions"
+    __table_args__ = (
+        # Cek max_uses_per_customer: seq ke-n per customer unik, jadi checkout
+        # bersamaan oleh customer yang sama tidak bisa melewati batas
+        UniqueConstraint("promotion_id", "customer_email", "seq", name="uq_promotion_redemptions_customer_seq"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    promotion_id = Column(Integer, ForeignKey("promotions.id", name="fk_promotion_redemptions_promotion_id"), nullable=False)
+    customer_email = Column(String(255), nullable=False)  # lowercase
+    seq = Column(Integer)  # NULL kalau promo tanpa batas per customer
+    # Tanpa foreign key: order bisa dipindah ke orders_archive
+    order_id = Column(Integer, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<PromotionRedemption {self.promotion_id} {self.customer_email} #{self.seq}>"
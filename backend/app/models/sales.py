@@ -0,0 +1,37 @@
+"""
+Sales Rollup Models - penjualan harian (order paid) untuk sales chart
+
+Tanggal = tanggal created_at order di SALES_TIMEZONE (Asia/Jakarta).
+Diperbarui di transaksi yang sama saat order menjadi / berhenti paid;
+dihitung ulang dengan scripts/backfill_sales_daily.py.
+"""
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from app.core.database import Base
+
+class SalesDaily(Base):
+    __tablename__ = "sales_daily"
+
+    date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)  # total order (setelah discount)
+    items_sold = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SalesDaily {self.date} {self.order_count} orders>"
+
+class SalesDailyCategory(Base):
+    """
+    Rollup harian per category product. order_count = order yang punya item
+    di category tersebut, revenue = jumlah subtotal item-nya.
+    """
+    __tablename__ = "sales_daily_categories"
+
+    # Primary key (category_id, date): chart per category = satu range read
+    category_id = Column(Integer, ForeignKey("categories.id", name="fk_sales_daily_categories_category_id"), primary_key=True, autoincrement=False)
+    date = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+    items_sold = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SalesDailyCategory {self.date} category={self.category_id}>"
@@ -0,0 +1,29 @@
+"""
+Cart Schemas - inventory hold per cart
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+# Id cart dibuat client (mis. UUID), disimpan di localStorage storefront
+CART_ID_PATTERN = r"^[A-Za-z0-9_-]{8,64}$"
+
+class HoldUpdate(BaseModel):
+    product_id: int
+    variation_id: Optional[int] = None
+    quantity: int = Field(..., ge=0)  # 0 = lepas hold
+
+class InventoryHold(BaseModel):
+    id: int
+    product_id: int
+    variation_id: Optional[int] = None
+    quantity: int
+    expires_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class CartHolds(BaseModel):
+    cart_id: str
+    holds: List[InventoryHold]
+    expires_at: Optional[datetime] = None  # hold paling cepat kedaluwarsa
@@ -1,13 +1,16 @@
 """
 Order Schemas
 """
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import Optional, List, Literal
 from datetime import datetime
+from app.schemas.cart import CART_ID_PATTERN
+from app.schemas.promotion import PromotionSummary
 
 class OrderItemBase(BaseModel):
     product_id: int
-    quantity: int
+    variation_id: Optional[int] = None
+    quantity: int = Field(..., gt=0)
 
 class OrderItemCreate(OrderItemBase):
     pass
@@ -16,6 +19,7 @@ class OrderItem(OrderItemBase):
     id: int
     order_id: int
     product_name: str
+    variation_name: Optional[str] = None
     product_price: float
     subtotal: float
     
@@ -34,7 +38,29 @@ class OrderBase(BaseModel):
     notes: Optional[str] = None
 
 class OrderCreate(OrderBase):
-    items: List[OrderItemCreate]
+    items: List[OrderItemCreate] = Field(..., min_length=1)
+    # Hold milik cart ini dipakai untuk item order lalu dilepas
+    cart_id: Optional[str] = Field(None, pattern=CART_ID_PATTERN)
+    promotion_code: Optional[str] = Field(None, max_length=50)
+
+class CartQuoteRequest(BaseModel):
+    items: List[OrderItemCreate] = Field(..., min_length=1)
+    promotion_code: Optional[str] = Field(None, max_length=50)
+
+class CartQuoteLine(OrderItemBase):
+    product_name: str
+    variation_name: Optional[str] = None
+    product_price: float
+    subtotal: float
+
+class CartQuote(BaseModel):
+    items: List[CartQuoteLine]
+    subtotal: float
+    shipping_cost: float
+    tax: float
+    discount: float
+    total: float
+    promotion: Optional[PromotionSummary] = None
 
 class OrderUpdate(BaseModel):
     status: Optional[str] = None
@@ -49,6 +75,7 @@ class Order(OrderBase):
     tax: float
     discount: float
     total: float
+    promotion_code: Optional[str] = None
     status: str
     payment_status: str
     created_at: datetime
@@ -62,8 +89,38 @@ class Order(OrderBase):
 
 class OrderList(BaseModel):
     items: List[Order]
-    total: int
-    page: int
+    total: Optional[int] = None
+    # True kalau total diambil dari cache (approx_total=true; bisa tertinggal ORDER_COUNT_CACHE_TTL detik)
+    total_cached: bool = False
+    page: Optional[int] = None
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class OrderBulkStatus(BaseModel):
+    ids: List[int] = Field([], max_length=5000)
+    order_numbers: List[str] = Field([], max_length=5000)
+    status: Optional[Literal["pending", "processing", "shipped", "delivered", "cancelled"]] = None
+    payment_status: Optional[Literal["pending", "paid", "failed", "refunded"]] = None
+
+    @model_validator(mode="after")
+    def check_request(self):
+        if not self.ids and not self.order_numbers:
+            raise ValueError("Either ids or order_numbers is required")
+        if self.status is None and self.payment_status is None:
+            raise ValueError("status or payment_status is required")
+        return self
+
+class OrderBulkStatusItem(BaseModel):
+    id: Optional[int] = None
+    order_number: Optional[str] = None
+    # updated | unchanged | not_found | invalid_transition
+    result: str
+    status: Optional[str] = None
+    payment_status: Optional[str] = None
+    detail: Optional[str] = None
 
+class OrderBulkStatusResult(BaseModel):
+    updated: int
+    results: List[OrderBulkStatusItem]
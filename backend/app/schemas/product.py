@@ -1,8 +1,9 @@
 """
 Product Schemas
 """
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Literal, Union
+from typing_extensions import Annotated
 from datetime import datetime
 
 class CategoryBase(BaseModel):
@@ -41,6 +42,13 @@ class Subcategory(SubcategoryBase):
     class Config:
         from_attributes = True
 
+class ImageVariant(BaseModel):
+    format: str
+    width: int
+    height: int
+    url: str
+    size: int
+
 class ProductImageBase(BaseModel):
     image_url: str
     is_primary: bool = False
@@ -48,6 +56,9 @@ class ProductImageBase(BaseModel):
 class ProductImage(ProductImageBase):
     id: int
     product_id: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: Optional[List[ImageVariant]] = None
     
     class Config:
         from_attributes = True
@@ -159,10 +170,126 @@ class ProductVariation(ProductVariationBase):
     class Config:
         from_attributes = True
 
-class ProductList(BaseModel):
+class VariationAvailability(BaseModel):
+    id: int
+    name: str
+    stock: int
+    reserved: int
+    available: int
+
+class ProductAvailability(BaseModel):
+    """
+    Stock tersedia = stock - unit yang sedang di-hold cart
+    """
+    product_id: int
+    stock: int
+    reserved: int
+    available: int
+    variations: List[VariationAvailability] = []
+
+class ProductSummary(BaseModel):
+    """
+    Field yang dibutuhkan product card di listing
+    """
+    id: int
+    name: str
+    slug: str
+    price: float
+    original_price: Optional[float] = None
+    discount: Optional[float] = 0
+    thumbnail: Optional[str] = None
+    brand: Optional[str] = None
+    release_tag: Optional[str] = None
+    rating: Optional[float] = 0
+    reviews_count: Optional[int] = 0
+    stock: Optional[int] = 0
+    is_new_arrival: Optional[bool] = False
+    category_id: Optional[int] = None
+    
+    class Config:
+        from_attributes = True
+
+class ProductListBase(BaseModel):
+    total: Optional[int] = None
+    page: Optional[int] = None
+    page_size: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class ProductList(ProductListBase):
+    view: Literal["full"] = "full"
     items: List[Product]
+
+class ProductSummaryList(ProductListBase):
+    view: Literal["summary"] = "summary"
+    items: List[ProductSummary]
+
+# Response GET /products/ - bentuknya ditentukan oleh field "view"
+ProductListResponse = Annotated[Union[ProductSummaryList, ProductList], Field(discriminator="view")]
+
+
+class FacetValue(BaseModel):
+    value: str
+    label: str
+    count: int
+
+class ProductFacets(BaseModel):
+    categories: List[FacetValue] = []
+    subcategories: List[FacetValue] = []
+    release_tags: List[FacetValue] = []
+    brands: List[FacetValue] = []
+    price_ranges: List[FacetValue] = []
     total: int
-    page: int
-    page_size: int
-    pages: int
 
+class ProductImportError(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    error: str
+
+class ProductImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[ProductImportError] = []
+
+# Batas item per PATCH /products/bulk (satu transaksi)
+PRODUCT_BULK_MAX_ITEMS = 1000
+
+class ProductBulkItem(BaseModel):
+    id: Optional[int] = None
+    sku: Optional[str] = None
+    price: Optional[float] = Field(None, ge=0)
+    original_price: Optional[float] = Field(None, ge=0)
+    discount: Optional[float] = Field(None, ge=0, le=100)  # persen
+    stock: Optional[int] = Field(None, ge=0)
+    is_active: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_identifier(self):
+        if self.id is None and not self.sku:
+            raise ValueError("Either id or sku is required")
+        return self
+
+class ProductBulkAdjustment(BaseModel):
+    field: Literal["price", "stock"]
+    mode: Literal["percent", "absolute"]
+    value: float
+    category_id: Optional[int] = None
+    release_tag: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        if self.category_id is None and not self.release_tag:
+            raise ValueError("Adjustment needs category_id or release_tag")
+        return self
+
+class ProductBulkUpdate(BaseModel):
+    items: List[ProductBulkItem] = Field([], max_length=PRODUCT_BULK_MAX_ITEMS)
+    adjustment: Optional[ProductBulkAdjustment] = None
+
+class ProductBulkResult(BaseModel):
+    updated: int
+    adjusted: int
+    not_found: List[str] = []
+    rejected: List[str] = []  # stock < reserved, item tidak diterapkan
+    clamped: List[int] = []  # stock adjustment ditahan di reserved
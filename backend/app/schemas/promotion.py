@@ -20,6 +20,15 @@ class PromotionBase(BaseModel):
 class PromotionCreate(PromotionBase):
     pass
 
+class PromotionSummary(BaseModel):
+    code: str
+    name: str
+    type: str
+    value: float
+    
+    class Config:
+        from_attributes = True
+
 class Promotion(PromotionBase):
     id: int
     current_uses: int
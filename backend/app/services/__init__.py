@@ -0,0 +1 @@
+"""Service layer - logic yang dipakai bersama oleh beberapa endpoint"""
@@ -0,0 +1,37 @@
+"""
+Catalog caches - cache untuk endpoint katalog yang read-mostly
+
+Semua write ke categories/subcategories/products harus memanggil salah satu
+fungsi invalidate_* di bawah setelah commit.
+"""
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+categories_cache = TTLCache("categories", ttl=settings.CATALOG_CACHE_TTL, maxsize=64)
+subcategories_cache = TTLCache("subcategories", ttl=settings.CATALOG_CACHE_TTL, maxsize=256)
+release_tags_cache = TTLCache("release_tags", ttl=settings.CATALOG_CACHE_TTL, maxsize=1)
+
+# Hasil facets per kombinasi filter (lihat app/services/facets.py)
+facet_cache = TTLCache("product_facets", ttl=settings.FACET_CACHE_TTL, maxsize=settings.FACET_CACHE_SIZE)
+
+RELEASE_TAGS_KEY = "all"
+
+def invalidate_categories() -> None:
+    """
+    Category berubah: list category, subcategory (menyertakan category)
+    dan label facets ikut basi
+    """
+    categories_cache.clear()
+    subcategories_cache.clear()
+    facet_cache.clear()
+
+def invalidate_subcategories() -> None:
+    subcategories_cache.clear()
+    facet_cache.clear()
+
+def invalidate_products() -> None:
+    """
+    Product dibuat/diubah/dihapus: release tags dan semua facets
+    """
+    release_tags_cache.invalidate(RELEASE_TAGS_KEY)
+    facet_cache.clear()
@@ -0,0 +1,223 @@
+"""
+Customer stats - total_orders, total_spent dan last_order_at dijaga secara
+incremental dari lifecycle order (dibuat, dibayar, dibatalkan, refund)
+
+Endpoint hanya mencatat delta ke buffer in-memory setelah commit; background
+task menulisnya ke table customers per batch (write-behind), jadi checkout
+tidak menunggu UPDATE customers. Delta yang belum di-flush hilang kalau
+process mati - jalankan scripts/backfill_customer_stats.py untuk menghitung
+ulang dari table orders (termasuk orders_archive).
+
+Definisi (sama dengan backfill):
+- total_orders: order yang statusnya bukan cancelled
+- total_spent: jumlah total order dengan payment_status paid
+- last_order_at: created_at order terbaru
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.customer import Customer as CustomerModel
+from app.models.order import Order as OrderModel, OrderStatus, PaymentStatus
+from app.models.order_archive import ArchivedOrder as ArchivedOrderModel
+
+logger = logging.getLogger(__name__)
+
+_customers_table = CustomerModel.__table__
+
+_apply_delta = update(_customers_table).where(
+    _customers_table.c.email == bindparam("b_email")
+).values(
+    total_orders=func.coalesce(_customers_table.c.total_orders, 0) + bindparam("b_orders"),
+    total_spent=func.coalesce(_customers_table.c.total_spent, 0) + bindparam("b_spent"),
+    last_order_at=case(
+        (_customers_table.c.last_order_at == None, bindparam("b_last")),
+        (_customers_table.c.last_order_at < bindparam("b_last"), bindparam("b_last")),
+        else_=_customers_table.c.last_order_at,
+    ),
+)
+
+def order_state(order) -> Tuple[bool, bool]:
+    """
+    (dihitung di total_orders, dihitung di total_spent) untuk satu order
+    """
+    return order.status != OrderStatus.CANCELLED, order.payment_status == PaymentStatus.PAID
+
+def _profile(order) -> dict:
+    return {
+        "name": order.customer_name,
+        "phone": order.customer_phone,
+        "address": order.shipping_address,
+        "city": order.shipping_city,
+        "province": order.shipping_province,
+        "postal_code": order.shipping_postal_code,
+    }
+
+class CustomerStatsAggregator:
+    """
+    Buffer delta per email. record_* dipanggil setelah commit order;
+    flush() menulis semua delta yang terkumpul.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self._pending: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        # Satu flush pada satu waktu (background task vs shutdown)
+        self._flush_lock = threading.Lock()
+
+    def _merge(self, email: str, orders: int, spent: float, last_order_at: Optional[datetime], profile: Optional[dict]) -> None:
+        entry = self._pending.setdefault(email, {"orders": 0, "spent": 0.0, "last_order_at": None, "profile": None})
+        entry["orders"] += orders
+        entry["spent"] += spent
+        if last_order_at is not None and (entry["last_order_at"] is None or entry["last_order_at"] < last_order_at):
+            entry["last_order_at"] = last_order_at
+            entry["profile"] = profile or entry["profile"]
+        elif entry["profile"] is None:
+            entry["profile"] = profile
+
+    def record_transition(self, order, before: Tuple[bool, bool]) -> None:
+        """
+        Order berubah status/payment_status; `before` dari order_state()
+        sebelum perubahan
+        """
+        self.record_change(order.customer_email, order.total, before, order_state(order))
+
+    def record_change(self, email: str, total: Optional[float], before: Tuple[bool, bool], after: Tuple[bool, bool]) -> None:
+        orders = int(after[0]) - int(before[0])
+        spent = (int(after[1]) - int(before[1])) * (total or 0)
+        if orders or spent:
+            with self._lock:
+                self._merge(email, orders, spent, None, None)
+
+    def record_created(self, order) -> None:
+        counted, paid = order_state(order)
+        with self._lock:
+            self._merge(
+                order.customer_email, int(counted), (order.total or 0) if paid else 0.0,
+                order.created_at, _profile(order),
+            )
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _write(self, db: Session, batch: List[Tuple[str, dict]]) -> None:
+        db.execute(_apply_delta, [{
+            "b_email": email,
+            "b_orders": entry["orders"],
+            "b_spent": round(entry["spent"]),
+            "b_last": entry["last_order_at"],
+        } for email, entry in batch])
+        emails = [email for email, _ in batch]
+        existing = set(db.scalars(select(CustomerModel.email).where(CustomerModel.email.in_(emails))))
+        # Customer baru (checkout guest): buat dengan profil dari order
+        db.add_all([CustomerModel(
+            email=email,
+            **(entry["profile"] or {"name": email}),
+            total_orders=entry["orders"],
+            total_spent=round(entry["spent"]),
+            last_order_at=entry["last_order_at"],
+        ) for email, entry in batch if email not in existing])
+        db.commit()
+
+    def flush(self) -> int:
+        """
+        Tulis semua delta ke database per batch. Kalau satu batch gagal (mis.
+        customer yang sama dibuat bersamaan), batch itu dan sisanya
+        dikembalikan ke buffer untuk flush berikutnya. Returns jumlah customer yang ditulis.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            items = sorted(pending.items())
+            written = 0
+            db = SessionLocal()
+            try:
+                for start in range(0, len(items), self.batch_size):
+                    batch = items[start:start + self.batch_size]
+                    try:
+                        self._write(db, batch)
+                        written += len(batch)
+                    except Exception:
+                        db.rollback()
+                        with self._lock:
+                            for email, entry in items[start:]:
+                                self._merge(email, entry["orders"], entry["spent"], entry["last_order_at"], entry["profile"])
+                        raise
+            finally:
+                db.close()
+            return written
+
+customer_stats = CustomerStatsAggregator(batch_size=settings.CUSTOMER_STATS_BATCH_SIZE)
+
+async def run_customer_stats_flusher(interval: float = settings.CUSTOMER_STATS_FLUSH_INTERVAL) -> None:
+    """
+    Background task (dijalankan dari lifespan): flush buffer setiap
+    `interval` detik
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(customer_stats.flush)
+        except IntegrityError:
+            logger.info("Customer stats flush conflicted, retrying next interval")
+        except Exception:
+            logger.exception("Customer stats flush failed")
+
+def recompute_customers(db: Session, emails: List[str]) -> int:
+    """
+    Hitung ulang aggregates untuk `emails` dari orders dan orders_archive
+    (satu query GROUP BY per table) dan tulis nilai absolutnya; customer yang
+    belum ada dibuat dari order terbarunya. Returns jumlah customer yang
+    ditulis.
+    """
+    if not emails:
+        return 0
+    stats: Dict[str, dict] = {}
+    # Archive dulu: order di table hot selalu lebih baru
+    for model in (ArchivedOrderModel, OrderModel):
+        rows = db.execute(
+            select(
+                model.customer_email,
+                func.sum(case((model.status != OrderStatus.CANCELLED, 1), else_=0)).label("orders"),
+                func.sum(case((model.payment_status == PaymentStatus.PAID, model.total), else_=0)).label("spent"),
+                func.max(model.created_at).label("last_order_at"),
+                func.max(model.id).label("latest_id"),
+            ).where(model.customer_email.in_(emails)).group_by(model.customer_email)
+        )
+        for row in rows:
+            entry = stats.setdefault(row.customer_email, {"orders": 0, "spent": 0.0, "last_order_at": None})
+            entry["orders"] += int(row.orders or 0)
+            entry["spent"] += float(row.spent or 0)
+            entry["last_order_at"] = max(filter(None, (entry["last_order_at"], row.last_order_at)), default=None)
+            entry["latest"] = (model, row.latest_id)
+    customers = {c.email: c for c in db.query(CustomerModel).filter(CustomerModel.email.in_(emails))}
+
+    latest = {}
+    for model in (ArchivedOrderModel, OrderModel):
+        ids = [entry["latest"][1] for email, entry in stats.items()
+               if email not in customers and entry["latest"][0] is model]
+        if ids:
+            latest.update({o.customer_email: o for o in db.query(model).filter(model.id.in_(ids))})
+
+    for email in emails:
+        entry = stats.get(email)
+        customer = customers.get(email)
+        if customer is None:
+            if entry is None:
+                continue
+            customer = CustomerModel(email=email, **_profile(latest[email]))
+            db.add(customer)
+        customer.total_orders = entry["orders"] if entry else 0
+        customer.total_spent = round(entry["spent"]) if entry else 0
+        customer.last_order_at = entry["last_order_at"] if entry else None
+    db.commit()
+    return len(emails)
@@ -0,0 +1,111 @@
+"""
+Dashboard stats - satu query conditional aggregation + snapshot cache
+
+Semua angka dashboard (orders, revenue, pending, bulan ini, ditambah
+aggregates order yang diarsipkan, jumlah customer dan product) dihitung
+dengan satu SELECT. Hasilnya disimpan sebagai snapshot selama
+DASHBOARD_CACHE_TTL detik; background task menghitung ulang setiap
+DASHBOARD_REFRESH_INTERVAL detik (lebih pendek dari TTL) sehingga request
+admin hanya membaca snapshot. `stale_at` di response = kapan snapshot
+dianggap kedaluwarsa.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.customer import Customer as CustomerModel
+from app.models.order import Order as OrderModel, OrderStatus, PaymentStatus
+from app.models.order_archive import OrderArchiveDaily as OrderArchiveDailyModel
+from app.models.product import Product as ProductModel
+from app.services.sales_rollup import sales_day_start, sales_today
+
+logger = logging.getLogger(__name__)
+
+dashboard_cache = TTLCache("dashboard", ttl=settings.DASHBOARD_CACHE_TTL, maxsize=1)
+SNAPSHOT_KEY = "stats"
+
+def _sum_if(condition, value):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+def compute_dashboard(db: Session) -> dict:
+    """
+    Hitung semua statistik dashboard dengan satu query
+    """
+    # Bulan berjalan di SALES_TIMEZONE, sama dengan sales chart
+    month_start = sales_today().replace(day=1)
+    paid = OrderModel.payment_status == PaymentStatus.PAID
+    this_month = OrderModel.created_at >= sales_day_start(month_start)
+    archive_this_month = OrderArchiveDailyModel.date >= month_start
+
+    def archived(value, condition=None):
+        # Order yang sudah diarsipkan dibaca dari aggregates harian
+        query = select(func.coalesce(func.sum(value), 0))
+        return (query.where(condition) if condition is not None else query).scalar_subquery()
+
+    row = db.execute(
+        select(
+            func.count(OrderModel.id).label("orders"),
+            _sum_if(paid, OrderModel.total).label("revenue"),
+            _sum_if(OrderModel.status == OrderStatus.PENDING, 1).label("pending_orders"),
+            _sum_if(this_month, 1).label("orders_this_month"),
+            _sum_if(this_month & paid, OrderModel.total).label("revenue_this_month"),
+            archived(OrderArchiveDailyModel.order_count).label("archived_orders"),
+            archived(OrderArchiveDailyModel.revenue).label("archived_revenue"),
+            archived(OrderArchiveDailyModel.order_count, archive_this_month).label("archived_orders_this_month"),
+            archived(OrderArchiveDailyModel.revenue, archive_this_month).label("archived_revenue_this_month"),
+            select(func.count(CustomerModel.id)).scalar_subquery().label("customers"),
+            select(func.count(ProductModel.id)).where(ProductModel.is_active == True).scalar_subquery().label("products"),
+        ).select_from(OrderModel)
+    ).one()
+
+    computed_at = datetime.utcnow()
+    return {
+        "total_revenue": float(row.revenue + row.archived_revenue),
+        "total_orders": int(row.orders + row.archived_orders),
+        "total_customers": row.customers or 0,
+        "total_products": row.products or 0,
+        "pending_orders": int(row.pending_orders),
+        "orders_this_month": int(row.orders_this_month + row.archived_orders_this_month),
+        "revenue_this_month": float(row.revenue_this_month + row.archived_revenue_this_month),
+        "computed_at": computed_at,
+        "stale_at": computed_at + timedelta(seconds=settings.DASHBOARD_CACHE_TTL),
+    }
+
+def _load() -> dict:
+    db = SessionLocal()
+    try:
+        return compute_dashboard(db)
+    finally:
+        db.close()
+
+def refresh_dashboard() -> dict:
+    """
+    Hitung ulang snapshot dan simpan ke cache
+    """
+    snapshot = _load()
+    dashboard_cache.set(SNAPSHOT_KEY, snapshot)
+    return snapshot
+
+def get_dashboard() -> dict:
+    """
+    Snapshot dari cache; kalau belum ada / kedaluwarsa (refresher belum
+    jalan), satu request menghitungnya dan request lain menunggu hasilnya
+    """
+    return dashboard_cache.get_or_set(SNAPSHOT_KEY, _load)
+
+async def run_dashboard_refresher(interval: float = settings.DASHBOARD_REFRESH_INTERVAL) -> None:
+    """
+    Background task (dijalankan dari lifespan): hitung ulang snapshot setiap
+    `interval` detik
+    """
+    while True:
+        try:
+            await run_in_threadpool(refresh_dashboard)
+        except Exception:
+            logger.exception("Dashboard refresh failed")
+        await asyncio.sleep(interval)
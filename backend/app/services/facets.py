@@ -0,0 +1,77 @@
+"""
+Product facets - hitungan per category, subcategory, release_tag, brand
+dan price range untuk navigasi katalog
+"""
+from sqlalchemy import String, case, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.product import Product as ProductModel, Category as CategoryModel, Subcategory as SubcategoryModel
+
+def _price_bucket_expression():
+    bounds = settings.FACET_PRICE_BUCKETS
+    return case(
+        *[(ProductModel.price < bound, index) for index, bound in enumerate(bounds)],
+        else_=len(bounds),
+    )
+
+def _price_bucket_label(index: int) -> str:
+    bounds = settings.FACET_PRICE_BUCKETS
+    lower = bounds[index - 1] if index > 0 else 0
+    if index >= len(bounds):
+        return f"{lower}+"
+    return f"{lower}-{bounds[index]}"
+
+def compute_facets(db: Session, query) -> dict:
+    """
+    Hitung semua facet untuk product query yang sudah difilter.
+
+    Query difilter sekali sebagai CTE lalu tiap facet di-GROUP BY dan
+    digabung dengan UNION ALL, jadi cukup satu round trip ke database.
+    """
+    base = query.with_entities(
+        ProductModel.category_id,
+        ProductModel.subcategory_id,
+        ProductModel.release_tag,
+        ProductModel.brand,
+        _price_bucket_expression().label("price_bucket"),
+    ).cte("filtered_products")
+
+    def facet(name, column, label_column=None, join=None):
+        label = label_column if label_column is not None else cast(column, String)
+        stmt = select(
+            literal(name).label("facet"),
+            cast(column, String).label("value"),
+            label.label("label"),
+            func.count().label("count"),
+        ).select_from(base)
+        if join is not None:
+            stmt = stmt.join(*join)
+        group_by = [column] if label_column is None else [column, label_column]
+        return stmt.where(column.isnot(None)).group_by(*group_by)
+
+    stmt = union_all(
+        facet("categories", base.c.category_id, CategoryModel.name,
+              (CategoryModel, CategoryModel.id == base.c.category_id)),
+        facet("subcategories", base.c.subcategory_id, SubcategoryModel.name,
+              (SubcategoryModel, SubcategoryModel.id == base.c.subcategory_id)),
+        facet("release_tags", base.c.release_tag),
+        facet("brands", base.c.brand),
+        facet("price_ranges", base.c.price_bucket),
+    )
+
+    facets = {name: [] for name in ("categories", "subcategories", "release_tags", "brands", "price_ranges")}
+    for row in db.execute(stmt):
+        label = row.label
+        if row.facet == "price_ranges":
+            label = _price_bucket_label(int(row.value))
+        facets[row.facet].append({"value": row.value, "label": label, "count": row.count})
+
+    for name, values in facets.items():
+        if name == "price_ranges":
+            values.sort(key=lambda v: int(v["value"]))
+        else:
+            values.sort(key=lambda v: (-v["count"], v["label"]))
+
+    # Setiap product masuk tepat satu price range
+    facets["total"] = sum(v["count"] for v in facets["price_ranges"])
+    return facets
@@ -0,0 +1,263 @@
+"""
+Idempotency-Key - request POST yang di-retry dengan key yang sama
+mendapat response yang tersimpan, bukan transaksi baru
+
+Row `idempotency_keys` di-claim (INSERT) di transaksi tersendiri sebelum
+handler jalan; response disimpan di transaksi yang sama dengan data yang
+dibuat handler, jadi tidak ada order yang tersimpan tanpa response-nya.
+Cache in-memory di depan table membuat retry cukup cache hit.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.idempotency import IdempotencyKey as IdempotencyKeyModel
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Interval cek row milik process lain yang masih diproses
+POLL_INTERVAL = 0.1
+
+# (scope, key) -> (fingerprint, status_code, body)
+response_cache = TTLCache("idempotency", ttl=settings.IDEMPOTENCY_TTL, maxsize=settings.IDEMPOTENCY_CACHE_SIZE)
+
+# Request yang sedang diproses di process ini; duplikat menunggu event-nya
+_inflight: Dict[Tuple[str, str], threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    """
+    sha256 dari method, path dan body (JSON dinormalisasi: urutan key
+    dan whitespace tidak berpengaruh)
+    """
+    try:
+        canonical = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        canonical = body
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), canonical):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _replay(stored: tuple, fingerprint: str) -> JSONResponse:
+    stored_fingerprint, status_code, body = stored
+    if stored_fingerprint != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    return JSONResponse(content=json.loads(body), status_code=status_code, headers={REPLAY_HEADER: "true"})
+
+class IdempotentRequest:
+    """
+    Handle untuk endpoint. Kalau `replay` bukan None, kembalikan langsung;
+    kalau tidak, panggil `record()` sebelum commit.
+    """
+
+    def __init__(self, scope: str, key: Optional[str], fingerprint: Optional[str]):
+        self.scope = scope
+        self.key = key
+        self.fingerprint = fingerprint
+        self.replay: Optional[JSONResponse] = None
+        self.claimed = False
+        self.stored: Optional[tuple] = None
+
+    def record(self, db: Session, response, status_code: int = 200) -> None:
+        """
+        Simpan response di transaksi `db` (ikut commit bersama data handler)
+        """
+        if not self.claimed:
+            return
+        body = json.dumps(jsonable_encoder(response), separators=(",", ":"))
+        db.execute(
+            update(IdempotencyKeyModel).where(
+                IdempotencyKeyModel.scope == self.scope,
+                IdempotencyKeyModel.key == self.key
+            ).values(status_code=status_code, response_body=body)
+        )
+        self.stored = (self.fingerprint, status_code, body)
+
+def _claim(scope: str, key: str, fingerprint: str):
+    """
+    Coba claim key. Returns (True, None) kalau berhasil, atau (False, row)
+    dengan row yang sudah ada.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.add(IdempotencyKeyModel(
+            scope=scope,
+            key=key,
+            fingerprint=fingerprint,
+            locked_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL),
+        ))
+        try:
+            db.commit()
+            return True, None
+        except IntegrityError:
+            db.rollback()
+        row = db.query(IdempotencyKeyModel).filter(
+            IdempotencyKeyModel.scope == scope,
+            IdempotencyKeyModel.key == key
+        ).first()
+        if row is None:
+            return False, None  # baru saja dihapus; coba lagi
+        stale = row.status_code is None and \
+            row.locked_at < now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+        if row.expires_at <= now or stale:
+            # Response kedaluwarsa atau pemilik claim mati: buang dan claim ulang
+            db.execute(delete(IdempotencyKeyModel).where(IdempotencyKeyModel.id == row.id))
+            db.commit()
+            return False, None
+        db.expunge(row)
+        return False, row
+    finally:
+        db.close()
+
+def _release(scope: str, key: str) -> None:
+    """
+    Hapus claim yang belum selesai (handler gagal) supaya client bisa retry
+    """
+    db = SessionLocal()
+    try:
+        db.execute(delete(IdempotencyKeyModel).where(
+            IdempotencyKeyModel.scope == scope,
+            IdempotencyKeyModel.key == key,
+            IdempotencyKeyModel.status_code == None
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+def begin(scope: str, key: str, fingerprint: str) -> IdempotentRequest:
+    """
+    Replay dari cache/table, tunggu request yang sama yang sedang berjalan,
+    atau claim key untuk request ini
+    """
+    handle = IdempotentRequest(scope, key, fingerprint)
+    cache_key = (scope, key)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    while True:
+        stored = response_cache.get(cache_key)
+        if stored is not None:
+            handle.replay = _replay(stored, fingerprint)
+            return handle
+
+        with _inflight_lock:
+            event = _inflight.get(cache_key)
+        if event is None:
+            claimed, row = _claim(scope, key, fingerprint)
+            if claimed:
+                with _inflight_lock:
+                    _inflight[cache_key] = threading.Event()
+                handle.claimed = True
+                return handle
+            if row is not None and row.status_code is not None:
+                stored = (row.fingerprint, row.status_code, row.response_body)
+                response_cache.set(cache_key, stored)
+                handle.replay = _replay(stored, fingerprint)
+                return handle
+            if row is not None and row.fingerprint != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        if event is not None:
+            event.wait(remaining)
+        elif row is not None:
+            # Diproses process lain: poll table
+            time.sleep(min(POLL_INTERVAL, remaining))
+
+def finish(handle: IdempotentRequest) -> None:
+    """
+    Dipanggil setelah handler selesai (sukses atau gagal): isi cache atau
+    lepas claim, lalu bangunkan duplikat yang menunggu
+    """
+    if not handle.claimed:
+        return
+    cache_key = (handle.scope, handle.key)
+    try:
+        if handle.stored is not None:
+            response_cache.set(cache_key, handle.stored)
+        else:
+            _release(handle.scope, handle.key)
+    finally:
+        with _inflight_lock:
+            event = _inflight.pop(cache_key, None)
+        if event is not None:
+            event.set()
+
+def idempotent(scope: str):
+    """
+    Dependency factory: `idem: IdempotentRequest = Depends(idempotent("orders.create"))`.
+    Tanpa header Idempotency-Key request diproses seperti biasa.
+    """
+    async def dependency(request: Request):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            yield IdempotentRequest(scope, None, None)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} too long (max {MAX_KEY_LENGTH})")
+        fingerprint = request_fingerprint(request.method, request.url.path, await request.body())
+        handle = await run_in_threadpool(begin, scope, key, fingerprint)
+        try:
+            yield handle
+        except Exception:
+            # Transaksi handler gagal/rollback: response jangan di-cache
+            handle.stored = None
+            raise
+        finally:
+            await run_in_threadpool(finish, handle)
+    return dependency
+
+def purge_expired_keys(batch_size: int = settings.IDEMPOTENCY_PURGE_BATCH) -> int:
+    """
+    Hapus row yang sudah kedaluwarsa per batch (satu transaksi pendek per
+    batch, memakai index expires_at). Returns jumlah row.
+    """
+    purged = 0
+    db = SessionLocal()
+    try:
+        while True:
+            ids = list(db.scalars(
+                select(IdempotencyKeyModel.id).where(
+                    IdempotencyKeyModel.expires_at <= datetime.utcnow()
+                ).limit(batch_size)
+            ))
+            if not ids:
+                return purged
+            db.execute(delete(IdempotencyKeyModel).where(IdempotencyKeyModel.id.in_(ids)))
+            db.commit()
+            purged += len(ids)
+    finally:
+        db.close()
+
+async def run_idempotency_purger(interval: float = settings.IDEMPOTENCY_PURGE_INTERVAL) -> None:
+    """
+    Background task (dijalankan dari lifespan): buang Idempotency-Key yang
+    kedaluwarsa saat startup lalu setiap `interval` detik
+    """
+    while True:
+        try:
+            await run_in_threadpool(purge_expired_keys)
+        except Exception:
+            logger.exception("Idempotency key purge failed")
+        await asyncio.sleep(interval)
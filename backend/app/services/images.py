@@ -0,0 +1,339 @@
+"""
+Image upload - file disimpan secara streaming lalu dibuatkan derivatives
+(WebP/JPEG beberapa lebar) di process pool supaya resize tidak memblokir
+event loop. Semua file disimpan dengan nama content hash sehingga bisa
+di-cache immutable (lihat app/core/static.py).
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+import aiofiles
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.static import content_hash_name
+from app.models.product import Product as ProductModel, ProductImage as ProductImageModel
+
+try:
+    import magic
+except ImportError:  # libmagic tidak terpasang (mis. Windows tanpa python-magic-bin)
+    magic = None
+
+IMAGES_SUBDIR = "images"
+UPLOAD_URL_PREFIX = "/uploads"
+# Ruang untuk boundary & header multipart di atas MAX_UPLOAD_SIZE
+MULTIPART_OVERHEAD = 16384
+SNIFF_SIZE = 2048
+MANIFEST_NAME = "manifest.json"
+
+MIME_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "webp": "webp"}
+
+class ImageUploadError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+def sniff_mime(head: bytes) -> str:
+    """
+    MIME type dari isi file (bukan dari nama file / header client)
+    """
+    if magic is not None:
+        return magic.from_buffer(head, mime=True)
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+async def limit_stream(stream: AsyncIterator[bytes], limit: int) -> AsyncIterator[bytes]:
+    """
+    Bungkus request body stream; hentikan upload begitu melewati limit,
+    sebelum sisa body dibaca
+    """
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > limit:
+            raise ImageUploadError(413, f"File too large (max {settings.MAX_UPLOAD_SIZE} bytes)")
+        yield chunk
+
+async def save_upload(upload: UploadFile, dest: Path) -> tuple:
+    """
+    Tulis upload ke disk per chunk. MIME dicek dari chunk pertama dan ukuran
+    dicek setiap chunk; file dihapus kalau gagal. Returns (mime, size, sha256).
+    """
+    mime = None
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(dest, "wb") as out:
+            while True:
+                chunk = await upload.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if mime is None:
+                    mime = sniff_mime(chunk[:SNIFF_SIZE])
+                    if mime not in settings.ALLOWED_IMAGE_TYPES:
+                        raise ImageUploadError(415, f"Unsupported file type: {mime}")
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_SIZE:
+                    raise ImageUploadError(413, f"File too large (max {settings.MAX_UPLOAD_SIZE} bytes)")
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    if mime is None:
+        dest.unlink(missing_ok=True)
+        raise ImageUploadError(400, "Empty file")
+    return mime, size, digest.hexdigest()
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_derivatives(
+    source: str,
+    out_dir: str,
+    stem: str,
+    widths: List[int],
+    formats: List[str],
+    quality: int,
+    max_pixels: int,
+) -> dict:
+    """
+    Resize + encode (jalan di worker process). Lebar yang lebih besar dari
+    original tidak di-upscale; GIF animasi diambil frame pertamanya. Tiap
+    derivative di-rename ke nama content hash setelah ditulis.
+    """
+    from PIL import ImageOps
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(source) as img:
+        img.verify()
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        width, height = img.size
+
+        variants = []
+        for target in sorted({min(w, width) for w in widths}):
+            target_height = max(1, round(height * target / width))
+            resized = img if target == width else img.resize((target, target_height), Image.LANCZOS)
+            for fmt in formats:
+                frame = resized
+                if fmt == "jpeg":
+                    if frame.mode == "RGBA":
+                        background = Image.new("RGB", frame.size, (255, 255, 255))
+                        background.paste(frame, mask=frame.getchannel("A"))
+                        frame = background
+                    options = {"quality": quality, "optimize": True, "progressive": True}
+                else:
+                    options = {"quality": quality, "method": 4}
+                extension = FORMAT_EXTENSIONS[fmt]
+                temp = os.path.join(out_dir, f"{stem}-{target}.{extension}")
+                frame.save(temp, format=fmt.upper(), **options)
+                name = content_hash_name(_file_digest(temp), extension)
+                path = os.path.join(out_dir, name)
+                os.replace(temp, path)
+                variants.append({
+                    "format": fmt,
+                    "width": target,
+                    "height": target_height,
+                    "name": name,
+                    "size": os.path.getsize(path),
+                })
+    return {"width": width, "height": height, "variants": variants}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """
+    Process pool dibuat saat upload pertama. Memakai spawn karena fork dari
+    server yang multi-thread bisa deadlock.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+def shutdown_image_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+def image_dir() -> Path:
+    return Path(settings.UPLOAD_DIR) / IMAGES_SUBDIR
+
+def image_url(name: str) -> str:
+    return f"{UPLOAD_URL_PREFIX}/{IMAGES_SUBDIR}/{name}"
+
+def _remove_files(directory: Path, stem: str) -> None:
+    for path in directory.glob(f"{stem}*"):
+        path.unlink(missing_ok=True)
+
+_manifest_lock = threading.Lock()
+
+def manifest_path() -> Path:
+    return Path(settings.UPLOAD_DIR) / MANIFEST_NAME
+
+def load_manifest() -> dict:
+    try:
+        with open(manifest_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"images": {}}
+
+def update_manifest(image_id: str, entry: dict) -> None:
+    """
+    Tambahkan entry ke manifest (image id -> URL ber-hash). Ditulis atomic
+    (tmp + rename) bersama versi .gz yang dilayani ke client yang mendukung.
+    """
+    with _manifest_lock:
+        manifest = load_manifest()
+        manifest.setdefault("images", {})[image_id] = entry
+        data = json.dumps(manifest, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        path = manifest_path()
+        for target, content in ((path, data), (Path(f"{path}.gz"), gzip.compress(data, mtime=0))):
+            temp = target.with_name(f"{target.name}.tmp")
+            temp.write_bytes(content)
+            os.replace(temp, target)
+
+async def process_upload(upload: UploadFile) -> dict:
+    """
+    Simpan original + buat derivatives, lalu catat di manifest. Returns info
+    file dan daftar variants (semua URL ber-hash).
+    """
+    extension = Path(upload.filename or "").suffix.lower()
+    if extension not in settings.ALLOWED_EXTENSIONS:
+        raise ImageUploadError(415, f"Extension not allowed: {extension or '(none)'}")
+
+    directory = image_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = uuid.uuid4().hex
+    temp = directory / f"{stem}.part"
+    mime, size, digest = await save_upload(upload, temp)
+    original = directory / content_hash_name(digest, MIME_EXTENSIONS[mime])
+    os.replace(temp, original)
+
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            get_image_pool(),
+            build_derivatives,
+            str(original),
+            str(directory),
+            stem,
+            settings.IMAGE_DERIVATIVE_WIDTHS,
+            settings.IMAGE_DERIVATIVE_FORMATS,
+            settings.IMAGE_QUALITY,
+            settings.IMAGE_MAX_PIXELS,
+        )
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        _remove_files(directory, stem)
+        original.unlink(missing_ok=True)
+        raise ImageUploadError(422, f"Invalid image: {e}")
+    except BaseException:
+        _remove_files(directory, stem)
+        original.unlink(missing_ok=True)
+        raise
+
+    variants = [{
+        "format": variant["format"],
+        "width": variant["width"],
+        "height": variant["height"],
+        "url": image_url(variant["name"]),
+        "size": variant["size"],
+    } for variant in result["variants"]]
+    await run_in_threadpool(update_manifest, stem, {
+        "original": image_url(original.name),
+        "width": result["width"],
+        "height": result["height"],
+        "variants": [
+            {"format": v["format"], "width": v["width"], "url": v["url"]} for v in variants
+        ],
+    })
+    return {
+        "image_id": stem,
+        "filename": original.name,
+        "url": image_url(original.name),
+        "mime_type": mime,
+        "size": size,
+        "width": result["width"],
+        "height": result["height"],
+        "variants": variants,
+    }
+
+def preferred_variants(variants: List[dict]) -> List[dict]:
+    """
+    Variants dalam format utama (format pertama di settings), kecil ke besar
+    """
+    preferred = settings.IMAGE_DERIVATIVE_FORMATS[0]
+    return sorted((v for v in variants if v["format"] == preferred), key=lambda v: v["width"])
+
+def attach_product_image(db: Session, product_id: int, upload: dict, is_primary: bool) -> ProductImageModel:
+    """
+    Catat hasil upload sebagai ProductImage. image_url/thumbnail memakai
+    derivative (bukan original) supaya storefront tidak mengunduh file besar.
+    """
+    product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
+    sized = preferred_variants(upload["variants"])
+    sort_order = db.query(func.count(ProductImageModel.id)).filter(
+        ProductImageModel.product_id == product_id
+    ).scalar()
+    if is_primary:
+        db.query(ProductImageModel).filter(
+            ProductImageModel.product_id == product_id,
+            ProductImageModel.is_primary == True
+        ).update({ProductImageModel.is_primary: False}, synchronize_session=False)
+        product.thumbnail = sized[0]["url"]
+
+    image = ProductImageModel(
+        product_id=product_id,
+        image_url=sized[-1]["url"],
+        is_primary=is_primary,
+        sort_order=sort_order,
+        width=upload["width"],
+        height=upload["height"],
+        variants=upload["variants"],
+    )
+    db.add(image)
+    # Bump versi product supaya ETag detail product berubah
+    product.updated_at = func.now()
+    db.commit()
+    db.refresh(image)
+    return image
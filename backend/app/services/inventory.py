@@ -0,0 +1,398 @@
+"""
+Inventory - reservasi stock yang aman untuk checkout bersamaan
+
+Stock dikurangi dengan conditional UPDATE (`stock = stock - :qty WHERE
+stock - reserved >= :qty`) sehingga database yang memutuskan, bukan
+read-modify-write di Python. Semua baris dikirim sebagai satu executemany
+per table dengan urutan id yang tetap supaya dua checkout tidak saling
+deadlock.
+
+Hold cart (`inventory_holds`) menahan unit sebelum checkout. Jumlahnya
+dijaga di counter `reserved` per product/variation, jadi ketersediaan
+(`stock - reserved`) cukup dibaca dari satu row tanpa menjumlah hold.
+Setiap perubahan hold mengubah counter di transaksi yang sama, dan row hold
+selalu dihapus sebelum counter dikurangi (rowcount 1 = pemilik) supaya
+checkout dan sweeper tidak melepas hold yang sama dua kali.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.inventory import InventoryHold as InventoryHoldModel
+from app.models.product import Product as ProductModel, ProductVariation as ProductVariationModel
+from app.schemas.order import OrderItemCreate
+
+logger = logging.getLogger(__name__)
+
+class StockError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+_products_table = ProductModel.__table__
+_variations_table = ProductVariationModel.__table__
+_holds_table = InventoryHoldModel.__table__
+
+def _reserve_stmt(table):
+    """
+    Jual b_qty unit sekaligus melepas b_held unit milik hold cart ini:
+    unit yang di-hold pembeli sendiri dihitung tersedia untuknya
+    """
+    return update(table).where(
+        table.c.id == bindparam("b_id"),
+        table.c.is_active == True,
+        table.c.stock - table.c.reserved + bindparam("b_held") >= bindparam("b_qty"),
+    ).values(
+        stock=table.c.stock - bindparam("b_qty"),
+        reserved=table.c.reserved - bindparam("b_held"),
+    )
+
+def _hold_stmt(table):
+    return update(table).where(
+        table.c.id == bindparam("b_id"),
+        table.c.is_active == True,
+        table.c.stock - table.c.reserved >= bindparam("b_qty"),
+    ).values(reserved=table.c.reserved + bindparam("b_qty"))
+
+def _release_stmt(table):
+    return update(table).where(
+        table.c.id == bindparam("b_id")
+    ).values(reserved=table.c.reserved - bindparam("b_held"))
+
+# Core UPDATE (bukan ORM) supaya executemany tidak diperlakukan sebagai
+# bulk UPDATE by primary key dan rowcount bisa dipakai
+_reserve_product = _reserve_stmt(_products_table)
+_reserve_variation = _reserve_stmt(_variations_table)
+_hold_product = _hold_stmt(_products_table)
+_hold_variation = _hold_stmt(_variations_table)
+_release_product = _release_stmt(_products_table)
+_release_variation = _release_stmt(_variations_table)
+
+_delete_hold = delete(_holds_table).where(_holds_table.c.id == bindparam("b_id"))
+
+def _quantities(items: List[OrderItemCreate]) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Jumlahkan quantity per product (item tanpa variasi) dan per variation
+    """
+    products: Dict[int, int] = {}
+    variations: Dict[int, int] = {}
+    for item in items:
+        if item.variation_id is not None:
+            variations[item.variation_id] = variations.get(item.variation_id, 0) + item.quantity
+        else:
+            products[item.product_id] = products.get(item.product_id, 0) + item.quantity
+    return products, variations
+
+def load_order_lines(db: Session, items: List[OrderItemCreate]) -> List[dict]:
+    """
+    Ambil product & variation untuk semua item (satu query IN per table)
+    dan hitung harga. Raise StockError 404 kalau ada yang tidak ditemukan.
+    """
+    product_ids = {item.product_id for item in items}
+    variation_ids = {item.variation_id for item in items if item.variation_id is not None}
+
+    products = {row.id: row for row in db.execute(
+        select(ProductModel.id, ProductModel.name, ProductModel.price).where(
+            ProductModel.id.in_(product_ids),
+            ProductModel.is_active == True
+        )
+    )}
+    variations = {row.id: row for row in db.execute(
+        select(
+            ProductVariationModel.id, ProductVariationModel.product_id,
+            ProductVariationModel.name, ProductVariationModel.price
+        ).where(
+            ProductVariationModel.id.in_(variation_ids),
+            ProductVariationModel.is_active == True
+        )
+    )} if variation_ids else {}
+
+    lines = []
+    for item in items:
+        product = products.get(item.product_id)
+        if product is None:
+            raise StockError(404, f"Product {item.product_id} not found")
+        variation = None
+        if item.variation_id is not None:
+            variation = variations.get(item.variation_id)
+            if variation is None or variation.product_id != product.id:
+                raise StockError(404, f"Variation {item.variation_id} not found for product {product.id}")
+        price = variation.price if variation is not None and variation.price is not None else product.price
+        lines.append({
+            "product_id": product.id,
+            "variation_id": item.variation_id,
+            "product_name": product.name,
+            "variation_name": variation.name if variation is not None else None,
+            "product_price": price,
+            "quantity": item.quantity,
+            "subtotal": price * item.quantity,
+        })
+    return lines
+
+def _insufficient(db: Session, model, quantities: Dict[int, int], held: Dict[int, int]) -> str:
+    """
+    Cari item pertama yang stock-nya tidak cukup (untuk pesan error)
+    """
+    rows = db.execute(
+        select(model.id, model.name, model.stock, model.reserved).where(model.id.in_(quantities))
+    ).all()
+    for row in sorted(rows, key=lambda r: r.id):
+        if (row.stock or 0) - row.reserved + held.get(row.id, 0) < quantities[row.id]:
+            return row.name
+    return rows[0].name if rows else "item"
+
+def _execute_batch(db: Session, stmt, rows: List[dict]) -> bool:
+    if not rows:
+        return True
+    if db.get_bind().dialect.supports_sane_multi_rowcount:
+        return db.execute(stmt, rows).rowcount == len(rows)
+    # Driver yang tidak melaporkan rowcount executemany: satu per satu
+    return all(db.execute(stmt, row).rowcount == 1 for row in rows)
+
+def _release_counters(db: Session, held: Tuple[Dict[int, int], Dict[int, int]]) -> None:
+    products, variations = held
+    for stmt, counts in ((_release_product, products), (_release_variation, variations)):
+        if counts:
+            db.execute(stmt, [{"b_id": key, "b_held": qty} for key, qty in sorted(counts.items())])
+
+def reserve_stock(
+    db: Session,
+    items: List[OrderItemCreate],
+    held: Optional[Tuple[Dict[int, int], Dict[int, int]]] = None,
+) -> None:
+    """
+    Kurangi stock untuk semua item di transaksi yang sedang berjalan.
+    Item dengan variation_id memakai stock variation; lainnya stock product.
+    `held` (dari claim_cart_holds) ikut dilepas dari counter `reserved`.
+
+    Kalau ada satu saja yang tidak cukup, transaksi di-rollback dan
+    StockError 400 di-raise - tidak ada stock yang berkurang sebagian.
+    """
+    held_products, held_variations = held or ({}, {})
+    products, variations = _quantities(items)
+    for stmt, model, quantities, holds in (
+        (_reserve_product, ProductModel, products, held_products),
+        (_reserve_variation, ProductVariationModel, variations, held_variations),
+    ):
+        rows = [
+            {"b_id": key, "b_qty": qty, "b_held": holds.get(key, 0)}
+            for key, qty in sorted(quantities.items())
+        ]
+        if not _execute_batch(db, stmt, rows):
+            db.rollback()
+            raise StockError(400, f"Insufficient stock for {_insufficient(db, model, quantities, holds)}")
+    # Hold untuk barang yang tidak jadi dibeli cukup dilepas
+    _release_counters(db, (
+        {key: qty for key, qty in held_products.items() if key not in products},
+        {key: qty for key, qty in held_variations.items() if key not in variations},
+    ))
+
+# Inventory holds
+
+def _hold_target(product_id: int, variation_id: Optional[int]):
+    if variation_id is not None:
+        return ProductVariationModel, _hold_variation, _release_variation, variation_id
+    return ProductModel, _hold_product, _release_product, product_id
+
+def _delete_holds(db: Session, rows) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Hapus row hold satu per satu dan jumlahkan quantity yang benar-benar
+    terhapus oleh transaksi ini (row yang sudah diambil sweeper/checkout
+    lain dilewati)
+    """
+    products: Dict[int, int] = {}
+    variations: Dict[int, int] = {}
+    for row in rows:
+        if db.execute(_delete_hold, {"b_id": row.id}).rowcount != 1:
+            continue
+        if row.variation_id is not None:
+            variations[row.variation_id] = variations.get(row.variation_id, 0) + row.quantity
+        else:
+            products[row.product_id] = products.get(row.product_id, 0) + row.quantity
+    return products, variations
+
+def _cart_hold_rows(db: Session, cart_id: str):
+    return db.execute(
+        select(
+            InventoryHoldModel.id, InventoryHoldModel.product_id,
+            InventoryHoldModel.variation_id, InventoryHoldModel.quantity
+        ).where(InventoryHoldModel.cart_id == cart_id).order_by(InventoryHoldModel.id)
+    ).all()
+
+def list_holds(db: Session, cart_id: str) -> List[InventoryHoldModel]:
+    return db.query(InventoryHoldModel).filter(
+        InventoryHoldModel.cart_id == cart_id
+    ).order_by(InventoryHoldModel.id).all()
+
+def set_hold(
+    db: Session,
+    cart_id: str,
+    product_id: int,
+    variation_id: Optional[int],
+    quantity: int,
+) -> None:
+    """
+    Set jumlah unit yang di-hold cart untuk satu product/variation
+    (0 = lepas) dan perpanjang TTL semua hold cart tersebut. Hanya selisih
+    terhadap hold lama yang di-reserve/dilepas dari counter.
+
+    Raise StockError 404 kalau product/variation tidak ada, 400 kalau stock
+    tersedia tidak cukup, 409 kalau hold berubah bersamaan (retry).
+    """
+    model, hold_stmt, release_stmt, target_id = _hold_target(product_id, variation_id)
+    target = db.execute(select(model.id).where(
+        model.id == target_id,
+        model.is_active == True,
+        *((ProductVariationModel.product_id == product_id,) if variation_id is not None else ())
+    )).first()
+    if target is None:
+        kind = "Variation" if variation_id is not None else "Product"
+        raise StockError(404, f"{kind} {target_id} not found")
+
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=settings.INVENTORY_HOLD_TTL)
+    existing = db.execute(select(InventoryHoldModel.id, InventoryHoldModel.quantity).where(
+        InventoryHoldModel.cart_id == cart_id,
+        InventoryHoldModel.product_id == product_id,
+        InventoryHoldModel.variation_id == variation_id if variation_id is not None
+        else InventoryHoldModel.variation_id.is_(None),
+    )).first()
+    current = existing.quantity if existing is not None else 0
+
+    # Row hold disentuh dulu, baru counter (urutan lock sama dengan sweeper)
+    if existing is None:
+        if quantity > 0:
+            db.add(InventoryHoldModel(
+                cart_id=cart_id, product_id=product_id, variation_id=variation_id,
+                quantity=quantity, created_at=now, expires_at=expires_at,
+            ))
+            db.flush()
+    elif quantity > 0:
+        changed = db.execute(update(_holds_table).where(
+            _holds_table.c.id == existing.id,
+            _holds_table.c.quantity == current,
+        ).values(quantity=quantity)).rowcount
+    else:
+        changed = db.execute(_delete_hold, {"b_id": existing.id}).rowcount
+    if existing is not None and changed != 1:
+        db.rollback()
+        raise StockError(409, "Cart hold changed concurrently, please retry")
+
+    delta = quantity - current
+    if delta > 0 and db.execute(hold_stmt, {"b_id": target_id, "b_qty": delta}).rowcount != 1:
+        db.rollback()
+        raise StockError(400, "Insufficient stock")
+    if delta < 0:
+        db.execute(release_stmt, {"b_id": target_id, "b_held": -delta})
+
+    db.execute(update(_holds_table).where(
+        _holds_table.c.cart_id == cart_id
+    ).values(expires_at=expires_at))
+    db.commit()
+
+def release_cart_holds(db: Session, cart_id: str) -> int:
+    """
+    Lepas semua hold cart. Returns jumlah unit yang dilepas.
+    """
+    held = _delete_holds(db, _cart_hold_rows(db, cart_id))
+    _release_counters(db, held)
+    db.commit()
+    return sum(held[0].values()) + sum(held[1].values())
+
+def claim_cart_holds(db: Session, cart_id: str) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Ambil (hapus) semua hold cart di transaksi checkout. Hasilnya diteruskan
+    ke reserve_stock supaya counter `reserved` turun bersamaan dengan stock;
+    kalau checkout gagal, rollback mengembalikan hold-nya.
+    """
+    return _delete_holds(db, _cart_hold_rows(db, cart_id))
+
+def release_expired_holds(batch_size: int) -> int:
+    """
+    Lepas maksimal `batch_size` hold yang sudah kedaluwarsa dalam satu
+    transaksi. Returns jumlah row yang diproses (== batch_size berarti
+    kemungkinan masih ada sisa).
+    """
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(
+                InventoryHoldModel.id, InventoryHoldModel.product_id,
+                InventoryHoldModel.variation_id, InventoryHoldModel.quantity
+            ).where(
+                InventoryHoldModel.expires_at <= datetime.utcnow()
+            ).order_by(InventoryHoldModel.expires_at, InventoryHoldModel.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return 0
+        # Jalur cepat: satu DELETE ... IN; kalau ada yang keburu diambil
+        # checkout/sweeper lain, ulangi per row supaya counter tetap tepat
+        deleted = db.execute(delete(_holds_table).where(_holds_table.c.id.in_([row.id for row in rows]))).rowcount
+        if deleted == len(rows):
+            held = ({}, {})
+            for row in rows:
+                counts, key = (held[1], row.variation_id) if row.variation_id is not None else (held[0], row.product_id)
+                counts[key] = counts.get(key, 0) + row.quantity
+        else:
+            db.rollback()
+            held = _delete_holds(db, rows)
+        _release_counters(db, held)
+        db.commit()
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def run_hold_sweeper(
+    interval: float = settings.INVENTORY_HOLD_SWEEP_INTERVAL,
+    batch_size: int = settings.INVENTORY_HOLD_SWEEP_BATCH,
+) -> None:
+    """
+    Background task (dijalankan dari lifespan): lepas hold kedaluwarsa per
+    batch sampai habis, lalu tidur `interval` detik. Aman dijalankan di
+    beberapa worker sekaligus.
+    """
+    while True:
+        try:
+            released = await run_in_threadpool(release_expired_holds, batch_size)
+        except Exception:
+            logger.exception("Inventory hold sweep failed")
+            released = 0
+        if released < batch_size:
+            await asyncio.sleep(interval)
+
+def availability(db: Session, product_id: int) -> Optional[dict]:
+    """
+    Stock tersedia product dan variation-nya (stock - reserved); dibaca
+    langsung dari counter, dua query by index
+    """
+    product = db.execute(select(
+        ProductModel.id, ProductModel.stock, ProductModel.reserved
+    ).where(ProductModel.id == product_id, ProductModel.is_active == True)).first()
+    if product is None:
+        return None
+    variations = db.execute(select(
+        ProductVariationModel.id, ProductVariationModel.name,
+        ProductVariationModel.stock, ProductVariationModel.reserved
+    ).where(
+        ProductVariationModel.product_id == product_id,
+        ProductVariationModel.is_active == True
+    ).order_by(ProductVariationModel.id)).all()
+
+    def entry(row) -> dict:
+        stock = row.stock or 0
+        return {"stock": stock, "reserved": row.reserved, "available": max(stock - row.reserved, 0)}
+
+    return {
+        "product_id": product.id,
+        **entry(product),
+        "variations": [{"id": row.id, "name": row.name, **entry(row)} for row in variations],
+    }
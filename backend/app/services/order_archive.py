@@ -0,0 +1,213 @@
+"""
+Order archive - pindahkan order delivered/cancelled yang sudah lama ke
+orders_archive/order_items_archive per batch
+
+Setiap batch satu transaksi: INSERT ... SELECT ke table archive, tambahkan
+aggregates-nya ke order_archive_daily/order_archive_products (dibaca
+analytics), lalu DELETE dari table hot. Lookup order by id/number jatuh ke
+archive kalau tidak ada di table hot.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import bindparam, func, insert, literal, select, update, DateTime
+from sqlalchemy.orm import Session, selectinload
+from app.core.database import SessionLocal
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel, OrderStatus, PaymentStatus
+from app.models.order_archive import (
+    ArchivedOrder as ArchivedOrderModel, ArchivedOrderItem as ArchivedOrderItemModel,
+    OrderArchiveDaily as OrderArchiveDailyModel, OrderArchiveProduct as OrderArchiveProductModel,
+)
+from app.services.order_cache import invalidate_order_counts
+from app.services.sales_rollup import sales_date
+
+# Status final; order lain tidak pernah diarsipkan
+ARCHIVABLE_STATUSES = [OrderStatus.DELIVERED, OrderStatus.CANCELLED]
+
+_orders = OrderModel.__table__
+_items = OrderItemModel.__table__
+_orders_archive = ArchivedOrderModel.__table__
+_items_archive = ArchivedOrderItemModel.__table__
+_daily = OrderArchiveDailyModel.__table__
+_products = OrderArchiveProductModel.__table__
+
+_ORDER_COLUMNS = [c.name for c in _orders_archive.c if c.name != "archived_at"]
+_ITEM_COLUMNS = [c.name for c in _items_archive.c]
+
+_add_daily = update(_daily).where(_daily.c.date == bindparam("b_date")).values(
+    order_count=_daily.c.order_count + bindparam("b_orders"),
+    paid_count=_daily.c.paid_count + bindparam("b_paid"),
+    revenue=_daily.c.revenue + bindparam("b_revenue"),
+)
+_add_product = update(_products).where(_products.c.product_id == bindparam("b_product")).values(
+    quantity=_products.c.quantity + bindparam("b_quantity"),
+    revenue=_products.c.revenue + bindparam("b_revenue"),
+)
+
+def _daily_totals(orders, totals: Optional[dict] = None) -> dict:
+    """
+    {hari: [orders, paid, revenue]}; hari = sales_date(created_at) di
+    SALES_TIMEZONE, sama dengan rollup sales_daily
+    """
+    totals = {} if totals is None else totals
+    for order in orders:
+        entry = totals.setdefault(sales_date(order.created_at), [0, 0, 0.0])
+        entry[0] += 1
+        if order.payment_status == PaymentStatus.PAID:
+            entry[1] += 1
+            entry[2] += order.total or 0
+    return totals
+
+def _add_daily_rows(db: Session, rows: List[dict]) -> None:
+    """
+    Tambahkan delta ke order_archive_daily (UPDATE row yang ada, INSERT sisanya)
+    """
+    if not rows:
+        return
+    db.execute(_add_daily, rows)
+    existing = set(db.scalars(select(_daily.c.date).where(_daily.c.date.in_([row["b_date"] for row in rows]))))
+    missing = [row for row in rows if row["b_date"] not in existing]
+    if missing:
+        db.execute(insert(_daily), [{
+            "date": row["b_date"], "order_count": row["b_orders"],
+            "paid_count": row["b_paid"], "revenue": row["b_revenue"],
+        } for row in missing])
+
+def _add_product_rows(db: Session, rows: List[dict]) -> None:
+    if not rows:
+        return
+    db.execute(_add_product, rows)
+    existing = set(db.scalars(
+        select(_products.c.product_id).where(_products.c.product_id.in_([row["b_product"] for row in rows]))
+    ))
+    missing = [row for row in rows if row["b_product"] not in existing]
+    if missing:
+        db.execute(insert(_products), [{
+            "product_id": row["b_product"], "quantity": row["b_quantity"], "revenue": row["b_revenue"],
+        } for row in missing])
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """
+    Arsipkan maksimal `batch_size` order final yang dibuat sebelum `cutoff`
+    dalam satu transaksi. Returns jumlah order yang dipindahkan.
+    """
+    ids = list(db.scalars(
+        select(OrderModel.id).where(
+            OrderModel.status.in_(ARCHIVABLE_STATUSES),
+            OrderModel.created_at < cutoff
+        ).order_by(OrderModel.id).limit(batch_size).with_for_update()
+    ))
+    if not ids:
+        return 0
+
+    now = datetime.utcnow()
+    db.execute(insert(_orders_archive).from_select(
+        _ORDER_COLUMNS + ["archived_at"],
+        select(*[_orders.c[name] for name in _ORDER_COLUMNS], literal(now, DateTime)).where(_orders.c.id.in_(ids))
+    ))
+    db.execute(insert(_items_archive).from_select(
+        _ITEM_COLUMNS,
+        select(*[_items.c[name] for name in _ITEM_COLUMNS]).where(_items.c.order_id.in_(ids))
+    ))
+
+    orders = db.execute(
+        select(OrderModel.created_at, OrderModel.payment_status, OrderModel.total).where(OrderModel.id.in_(ids))
+    ).all()
+    _add_daily_rows(db, [{
+        "b_date": day, "b_orders": count, "b_paid": paid, "b_revenue": float(revenue),
+    } for day, (count, paid, revenue) in sorted(_daily_totals(orders).items())])
+
+    products = db.execute(
+        select(
+            OrderItemModel.product_id,
+            func.sum(OrderItemModel.quantity).label("quantity"),
+            func.sum(OrderItemModel.subtotal).label("revenue"),
+        ).where(OrderItemModel.order_id.in_(ids)).group_by(OrderItemModel.product_id)
+    ).all()
+    _add_product_rows(db, [{
+        "b_product": row.product_id, "b_quantity": int(row.quantity or 0), "b_revenue": float(row.revenue or 0),
+    } for row in products])
+
+    db.execute(_items.delete().where(_items.c.order_id.in_(ids)))
+    deleted = db.execute(_orders.delete().where(
+        _orders.c.id.in_(ids), _orders.c.status.in_(ARCHIVABLE_STATUSES)
+    )).rowcount
+    if deleted != len(ids):
+        db.rollback()
+        raise RuntimeError("Orders changed while archiving, batch rolled back")
+    db.commit()
+    invalidate_order_counts()
+    return len(ids)
+
+def archive_orders(older_than_days: int, batch_size: int, max_batches: Optional[int] = None) -> int:
+    """
+    Arsipkan semua order final yang lebih tua dari `older_than_days` hari.
+    Returns jumlah order yang dipindahkan.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    total = 0
+    batches = 0
+    db = SessionLocal()
+    try:
+        while max_batches is None or batches < max_batches:
+            moved = archive_batch(db, cutoff, batch_size)
+            total += moved
+            batches += 1
+            if moved < batch_size:
+                break
+    finally:
+        db.close()
+    return total
+
+def rebuild_archive_daily(db: Session, batch_size: int = 1000) -> int:
+    """
+    Hitung ulang order_archive_daily dan order_archive_products dari
+    orders_archive/order_items_archive dalam satu pass (keyset per id, satu
+    GROUP BY item per batch) dengan pembagian hari yang sama dengan
+    archive_batch. Returns jumlah hari.
+    """
+    totals = {}
+    products = {}
+    last_id = 0
+    while True:
+        orders = db.execute(
+            select(
+                ArchivedOrderModel.id, ArchivedOrderModel.created_at,
+                ArchivedOrderModel.payment_status, ArchivedOrderModel.total,
+            ).where(ArchivedOrderModel.id > last_id).order_by(ArchivedOrderModel.id).limit(batch_size)
+        ).all()
+        if not orders:
+            break
+        last_id = orders[-1].id
+        _daily_totals(orders, totals)
+        for row in db.execute(
+            select(
+                ArchivedOrderItemModel.product_id,
+                func.sum(ArchivedOrderItemModel.quantity).label("quantity"),
+                func.sum(ArchivedOrderItemModel.subtotal).label("revenue"),
+            ).where(
+                ArchivedOrderItemModel.order_id.in_([order.id for order in orders])
+            ).group_by(ArchivedOrderItemModel.product_id)
+        ):
+            entry = products.setdefault(row.product_id, [0, 0.0])
+            entry[0] += int(row.quantity or 0)
+            entry[1] += float(row.revenue or 0)
+    db.execute(_daily.delete())
+    db.execute(_products.delete())
+    if totals:
+        db.execute(insert(_daily), [{
+            "date": day, "order_count": count, "paid_count": paid, "revenue": float(revenue),
+        } for day, (count, paid, revenue) in sorted(totals.items())])
+    if products:
+        db.execute(insert(_products), [{
+            "product_id": product_id, "quantity": quantity, "revenue": revenue,
+        } for product_id, (quantity, revenue) in sorted(products.items())])
+    db.commit()
+    return len(totals)
+
+def get_archived_order(db: Session, condition) -> Optional[ArchivedOrderModel]:
+    """
+    Order dari archive (dengan items); `condition` atas ArchivedOrderModel
+    """
+    return db.query(ArchivedOrderModel).options(
+        selectinload(ArchivedOrderModel.items)
+    ).filter(condition).first()
@@ -0,0 +1,157 @@
+"""
+Bulk order status - transisi status/payment_status untuk banyak order
+sekaligus (mis. hari pengiriman) dengan satu SELECT dan satu UPDATE
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+from app.models.order import Order as OrderModel, OrderStatus, PaymentStatus
+from app.models.order_event import OrderEventType
+from app.schemas.order import OrderBulkStatus
+from app.services.customer_stats import customer_stats, order_state
+from app.services.order_events import add_order_events, order_event_row
+from app.services.sales_rollup import payment_sign, record_payment_changes
+
+# Status asal yang boleh pindah ke status tujuan
+STATUS_TRANSITIONS: Dict[str, set] = {
+    OrderStatus.PENDING.value: {OrderStatus.PROCESSING.value, OrderStatus.SHIPPED.value, OrderStatus.CANCELLED.value},
+    OrderStatus.PROCESSING.value: {OrderStatus.SHIPPED.value, OrderStatus.CANCELLED.value},
+    OrderStatus.SHIPPED.value: {OrderStatus.DELIVERED.value},
+    OrderStatus.DELIVERED.value: set(),
+    OrderStatus.CANCELLED.value: set(),
+}
+PAYMENT_TRANSITIONS: Dict[str, set] = {
+    PaymentStatus.PENDING.value: {PaymentStatus.PAID.value, PaymentStatus.FAILED.value},
+    PaymentStatus.FAILED.value: {PaymentStatus.PENDING.value, PaymentStatus.PAID.value},
+    PaymentStatus.PAID.value: {PaymentStatus.REFUNDED.value},
+    PaymentStatus.REFUNDED.value: set(),
+}
+
+class BulkStatusConflict(Exception):
+    pass
+
+def _value(value) -> Optional[str]:
+    return value.value if hasattr(value, "value") else value
+
+def _check(transitions: Dict[str, set], current: str, target: Optional[str]) -> Optional[bool]:
+    """
+    None = tidak berubah, True = transisi valid, False = tidak valid
+    """
+    if target is None or current == target:
+        return None
+    return target in transitions.get(current, set())
+
+def _updated_event(row, payload: OrderBulkStatus, now: datetime) -> dict:
+    """
+    Event order.updated dengan payload yang sama seperti PUT /orders/{id}
+    """
+    status, payment_status = _value(row.status), _value(row.payment_status)
+    changes = {}
+    if payload.status is not None and payload.status != status:
+        changes["status"] = {"from": status, "to": payload.status}
+    if payload.payment_status is not None and payload.payment_status != payment_status:
+        changes["payment_status"] = {"from": payment_status, "to": payload.payment_status}
+    order = {
+        "id": row.id,
+        "order_number": row.order_number,
+        "customer_email": row.customer_email,
+        "total": row.total,
+        "status": payload.status or status,
+        "payment_status": payload.payment_status or payment_status,
+    }
+    return order_event_row(row.id, row.order_number, OrderEventType.UPDATED, {"order": order, "changes": changes}, now)
+
+def bulk_update_status(db: Session, payload: OrderBulkStatus) -> dict:
+    """
+    Terapkan transisi ke semua order yang valid dalam satu transaksi.
+    Order dikunci (SELECT ... FOR UPDATE) lalu di-UPDATE dengan satu
+    statement yang juga mengisi shipped_at/delivered_at. Returns hasil per
+    order sesuai urutan request.
+    """
+    ids = list(dict.fromkeys(payload.ids))
+    numbers = list(dict.fromkeys(payload.order_numbers))
+    conditions = []
+    if ids:
+        conditions.append(OrderModel.id.in_(ids))
+    if numbers:
+        conditions.append(OrderModel.order_number.in_(numbers))
+    rows = db.execute(
+        select(
+            OrderModel.id, OrderModel.order_number, OrderModel.status, OrderModel.payment_status,
+            OrderModel.customer_email, OrderModel.total, OrderModel.created_at
+        ).where(or_(*conditions)).with_for_update()
+    ).all()
+    by_id = {row.id: row for row in rows}
+    by_number = {row.order_number: row for row in rows}
+
+    targets = [("id", key, by_id.get(key)) for key in ids] + \
+        [("order_number", key, by_number.get(key)) for key in numbers]
+    results = []
+    eligible = {}
+    seen = set()
+    for field, key, row in targets:
+        if row is None:
+            results.append({field: key, "result": "not_found"})
+            continue
+        status, payment_status = _value(row.status), _value(row.payment_status)
+        item = {"id": row.id, "order_number": row.order_number, "status": status, "payment_status": payment_status}
+        if row.id in seen:
+            continue  # sama dengan target sebelumnya (id dan order_number)
+        seen.add(row.id)
+        status_ok = _check(STATUS_TRANSITIONS, status, payload.status)
+        payment_ok = _check(PAYMENT_TRANSITIONS, payment_status, payload.payment_status)
+        if status_ok is False or payment_ok is False:
+            wrong = (f"status {status} -> {payload.status}" if status_ok is False
+                     else f"payment_status {payment_status} -> {payload.payment_status}")
+            results.append({**item, "result": "invalid_transition", "detail": f"Transition not allowed: {wrong}"})
+        elif status_ok is None and payment_ok is None:
+            results.append({**item, "result": "unchanged"})
+        else:
+            eligible[row.id] = row
+            results.append({
+                **item,
+                "result": "updated",
+                "status": payload.status or status,
+                "payment_status": payload.payment_status or payment_status,
+            })
+
+    if eligible:
+        now = datetime.utcnow()
+        values = {"updated_at": now}
+        guards = [OrderModel.id.in_(eligible)]
+        if payload.status is not None:
+            values["status"] = OrderStatus(payload.status)
+            if payload.status == OrderStatus.SHIPPED.value:
+                values["shipped_at"] = func.coalesce(OrderModel.shipped_at, now)
+            elif payload.status == OrderStatus.DELIVERED.value:
+                values["delivered_at"] = func.coalesce(OrderModel.delivered_at, now)
+            sources = {s for s, targets in STATUS_TRANSITIONS.items() if payload.status in targets}
+            guards.append(OrderModel.status.in_([OrderStatus(s) for s in sources | {payload.status}]))
+        if payload.payment_status is not None:
+            values["payment_status"] = PaymentStatus(payload.payment_status)
+            sources = {s for s, targets in PAYMENT_TRANSITIONS.items() if payload.payment_status in targets}
+            guards.append(OrderModel.payment_status.in_([PaymentStatus(s) for s in sources | {payload.payment_status}]))
+        updated = db.execute(
+            update(OrderModel).where(*guards).values(values).execution_options(synchronize_session=False)
+        ).rowcount
+        if updated != len(eligible):
+            # Ada order yang berubah di antara SELECT dan UPDATE
+            db.rollback()
+            raise BulkStatusConflict("Orders changed concurrently, please retry")
+        add_order_events(db, [_updated_event(row, payload, now) for row in eligible.values()])
+        if payload.payment_status is not None:
+            paid = payload.payment_status == PaymentStatus.PAID.value
+            record_payment_changes(db, [
+                (row.id, row.created_at, row.total, payment_sign(order_state(row)[1], paid))
+                for row in eligible.values()
+            ])
+    db.commit()
+
+    for row in eligible.values():
+        after = (
+            (payload.status or _value(row.status)) != OrderStatus.CANCELLED.value,
+            (payload.payment_status or _value(row.payment_status)) == PaymentStatus.PAID.value,
+        )
+        customer_stats.record_change(row.customer_email, row.total, order_state(row), after)
+    return {"updated": len(eligible), "results": results}
@@ -0,0 +1,17 @@
+"""
+Order caches - total order per kombinasi filter untuk GET /orders/?approx_total=true
+
+Semua write ke table orders (create, update, cancel, bulk status, arsip)
+harus memanggil invalidate_order_counts() setelah commit.
+"""
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+order_count_cache = TTLCache("order_counts", ttl=settings.ORDER_COUNT_CACHE_TTL, maxsize=settings.ORDER_COUNT_CACHE_SIZE)
+
+def invalidate_order_counts() -> None:
+    """
+    Order dibuat/diubah/dipindah ke arsip: semua total per filter basi
+    (cache in-process; proses lain tertinggal maksimal ORDER_COUNT_CACHE_TTL)
+    """
+    order_count_cache.clear()
@@ -0,0 +1,382 @@
+"""
+Order events - transactional outbox untuk lifecycle order
+
+Endpoint order menulis row `order_events` di transaksi yang sama dengan
+perubahan order (add_order_event), jadi event tidak pernah hilang atau
+terkirim untuk transaksi yang di-rollback. Background dispatcher mengambil
+event pending per batch dan memanggil handler lokal yang terdaftar
+(register_handler) di luar request, sehingga checkout tidak menunggu
+email, rollup, dsb.
+
+Jaminan:
+- at-least-once: event ditandai dispatched setelah semua handler sukses;
+  handler gagal -> retry dengan backoff, jadi handler harus idempotent
+  (pakai event["id"] untuk dedup)
+- urutan per order: event berikutnya dari order yang sama tidak dikirim
+  selama event sebelumnya belum dispatched (menunggu retry atau dipegang
+  dispatcher lain)
+- setelah ORDER_EVENTS_MAX_ATTEMPTS event ditandai failed dan tidak lagi
+  menahan event berikutnya
+
+Event dikunci dengan lease (claimed_by + available_at), jadi beberapa
+process boleh menjalankan dispatcher bersamaan; lease dari process yang
+mati otomatis kedaluwarsa.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.order_event import OrderEvent as OrderEventModel, OrderEventStatus
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[dict], None]
+# Handler untuk semua event type
+ALL_EVENTS = "*"
+
+_events_table = OrderEventModel.__table__
+
+def order_snapshot(order) -> dict:
+    """
+    Field yang disertakan di setiap event (handler tidak perlu query order)
+    """
+    return {
+        "id": order.id,
+        "order_number": order.order_number,
+        "customer_email": order.customer_email,
+        "total": order.total,
+        "status": order.status,
+        "payment_status": order.payment_status,
+    }
+
+def order_event_row(order_id: int, order_number: str, event_type: str, payload: dict, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.utcnow()
+    return {
+        "order_id": order_id,
+        "order_number": order_number,
+        "event_type": event_type,
+        "payload": json.dumps(jsonable_encoder(payload), separators=(",", ":")),
+        "status": OrderEventStatus.PENDING,
+        "attempts": 0,
+        "created_at": now,
+        "available_at": now,
+    }
+
+def add_order_events(db: Session, rows: List[dict]) -> None:
+    """
+    Insert event (dari order_event_row) di transaksi `db`; ikut commit atau
+    rollback bersama perubahan order
+    """
+    if rows:
+        db.execute(insert(_events_table), rows)
+
+def add_order_event(db: Session, order, event_type: str, payload: dict) -> None:
+    add_order_events(db, [order_event_row(order.id, order.order_number, event_type, payload)])
+
+# Handlers
+
+_handlers: Dict[str, List[EventHandler]] = {}
+
+def register_handler(event_type: str = ALL_EVENTS):
+    """
+    Decorator: `@register_handler("order.created")`. Handler menerima dict
+    event (id, order_id, order_number, type, payload, created_at, attempts)
+    dan dijalankan di thread dispatcher.
+    """
+    def decorator(handler: EventHandler) -> EventHandler:
+        _handlers.setdefault(event_type, []).append(handler)
+        return handler
+    return decorator
+
+def unregister_handler(handler: EventHandler) -> None:
+    for handlers in _handlers.values():
+        if handler in handlers:
+            handlers.remove(handler)
+
+def handlers_for(event_type: str) -> List[EventHandler]:
+    return _handlers.get(event_type, []) + _handlers.get(ALL_EVENTS, [])
+
+class FileEventSink:
+    """
+    Handler yang menulis event sebagai NDJSON ke file - pengganti broker
+    untuk development/test (ORDER_EVENTS_FILE)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict) -> None:
+        line = json.dumps(jsonable_encoder(event), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+if settings.ORDER_EVENTS_FILE:
+    register_handler(ALL_EVENTS)(FileEventSink(settings.ORDER_EVENTS_FILE))
+
+# Dispatcher
+
+_claim_stmt = update(_events_table).where(
+    _events_table.c.id.in_(bindparam("b_ids", expanding=True)),
+    _events_table.c.status == OrderEventStatus.PENDING,
+    _events_table.c.available_at <= bindparam("b_now"),
+).values(
+    claimed_by=bindparam("b_token"),
+    available_at=bindparam("b_lease_until"),
+    attempts=_events_table.c.attempts + 1,
+).execution_options(synchronize_session=False)
+
+# Semua update setelah claim hanya berlaku kalau lease masih milik batch ini
+_done_stmt = update(_events_table).where(
+    _events_table.c.id == bindparam("b_id"),
+    _events_table.c.claimed_by == bindparam("b_token"),
+).values(
+    status=OrderEventStatus.DISPATCHED,
+    dispatched_at=bindparam("b_at"),
+    claimed_by=None,
+    last_error=None,
+).execution_options(synchronize_session=False)
+
+_retry_stmt = update(_events_table).where(
+    _events_table.c.id == bindparam("b_id"),
+    _events_table.c.claimed_by == bindparam("b_token"),
+).values(
+    status=bindparam("b_status"),
+    available_at=bindparam("b_available_at"),
+    last_error=bindparam("b_error"),
+    claimed_by=None,
+).execution_options(synchronize_session=False)
+
+# Event yang di-claim tapi tidak dikirim (event sebelumnya dari order yang sama gagal)
+_release_stmt = update(_events_table).where(
+    _events_table.c.id == bindparam("b_id"),
+    _events_table.c.claimed_by == bindparam("b_token"),
+).values(
+    available_at=bindparam("b_now"),
+    attempts=_events_table.c.attempts - 1,
+    claimed_by=None,
+).execution_options(synchronize_session=False)
+
+def retry_delay(attempts: int) -> float:
+    """
+    Exponential backoff (detik) setelah percobaan ke-`attempts`
+    """
+    return min(settings.ORDER_EVENTS_RETRY_BASE * 2 ** (attempts - 1), settings.ORDER_EVENTS_RETRY_MAX)
+
+def _event_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "order_id": row.order_id,
+        "order_number": row.order_number,
+        "type": row.event_type,
+        "payload": json.loads(row.payload),
+        "created_at": row.created_at,
+        "attempts": row.attempts,
+    }
+
+class OrderEventDispatcher:
+    """
+    Kirim event pending ke handlers per batch. dispatch_batch() aman
+    dipanggil dari beberapa thread/process sekaligus.
+    """
+
+    def __init__(self, batch_size: int, lease: int, max_attempts: int):
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.counters = {"dispatched": 0, "retried": 0, "failed": 0}
+        self.last_run_at: Optional[datetime] = None
+
+    def _count(self, key: str, n: int) -> None:
+        if n:
+            with self._lock:
+                self.counters[key] += n
+
+    def _claim(self, db: Session, now: datetime) -> tuple:
+        """
+        Lease event pending yang bisa dikirim. Returns (token, rows) urut id.
+        """
+        # Order yang punya event pending sedang di-lease / menunggu retry
+        blocked = select(OrderEventModel.order_id).where(
+            OrderEventModel.status == OrderEventStatus.PENDING,
+            OrderEventModel.available_at > now,
+        )
+        ids = list(db.scalars(
+            select(OrderEventModel.id).where(
+                OrderEventModel.status == OrderEventStatus.PENDING,
+                OrderEventModel.available_at <= now,
+                OrderEventModel.order_id.not_in(blocked),
+            ).order_by(OrderEventModel.id).limit(self.batch_size)
+        ))
+        if not ids:
+            return None, []
+        token = uuid.uuid4().hex
+        db.execute(_claim_stmt, {
+            "b_ids": ids,
+            "b_now": now,
+            "b_token": token,
+            "b_lease_until": now + timedelta(seconds=self.lease),
+        })
+        db.commit()
+        rows = db.execute(
+            select(_events_table).where(
+                _events_table.c.claimed_by == token,
+            ).order_by(_events_table.c.id)
+        ).all()
+        return token, rows
+
+    def dispatch_batch(self) -> int:
+        """
+        Satu putaran: claim <= batch_size event, panggil handlers, tandai
+        hasilnya. Returns jumlah event yang di-claim.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            self.last_run_at = now
+            token, rows = self._claim(db, now)
+            if not rows:
+                return 0
+
+            # Event lebih awal dari order yang sama yang tidak dipegang batch ini
+            # (di-claim dispatcher lain di antara SELECT dan UPDATE)
+            earlier = dict(db.execute(
+                select(OrderEventModel.order_id, func.min(OrderEventModel.id)).where(
+                    OrderEventModel.status == OrderEventStatus.PENDING,
+                    OrderEventModel.order_id.in_({row.order_id for row in rows}),
+                    or_(OrderEventModel.claimed_by == None, OrderEventModel.claimed_by != token),
+                ).group_by(OrderEventModel.order_id)
+            ).all())
+
+            done, retry, release = [], [], []
+            stalled = set()
+            for row in rows:
+                if row.order_id in stalled or row.id > earlier.get(row.order_id, row.id):
+                    release.append({"b_id": row.id, "b_token": token, "b_now": now})
+                    continue
+                try:
+                    event = _event_dict(row)
+                    for handler in handlers_for(row.event_type):
+                        handler(event)
+                except Exception as e:
+                    failed = row.attempts >= self.max_attempts
+                    if failed:
+                        logger.error("Order event %s (%s) failed after %d attempts", row.id, row.event_type, row.attempts)
+                    else:
+                        logger.warning("Order event %s (%s) attempt %d failed: %r", row.id, row.event_type, row.attempts, e)
+                        stalled.add(row.order_id)
+                    retry.append({
+                        "b_id": row.id,
+                        "b_token": token,
+                        "b_status": OrderEventStatus.FAILED if failed else OrderEventStatus.PENDING,
+                        "b_available_at": datetime.utcnow() + timedelta(seconds=retry_delay(row.attempts)),
+                        "b_error": repr(e)[:1000],
+                    })
+                    continue
+                done.append({"b_id": row.id, "b_token": token, "b_at": datetime.utcnow()})
+
+            for stmt, params in ((_done_stmt, done), (_retry_stmt, retry), (_release_stmt, release)):
+                if params:
+                    db.execute(stmt, params)
+            db.commit()
+
+            failed = sum(1 for params in retry if params["b_status"] == OrderEventStatus.FAILED)
+            self._count("dispatched", len(done))
+            self._count("retried", len(retry) - failed)
+            self._count("failed", failed)
+            return len(rows)
+        finally:
+            db.close()
+
+    def drain(self, max_batches: Optional[int] = None) -> int:
+        """
+        Dispatch sampai tidak ada event yang bisa dikirim (mis. di test /
+        script). Returns jumlah event yang di-claim.
+        """
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            claimed = self.dispatch_batch()
+            total += claimed
+            batches += 1
+            if claimed == 0:
+                break
+        return total
+
+order_event_dispatcher = OrderEventDispatcher(
+    batch_size=settings.ORDER_EVENTS_BATCH_SIZE,
+    lease=settings.ORDER_EVENTS_LEASE,
+    max_attempts=settings.ORDER_EVENTS_MAX_ATTEMPTS,
+)
+
+def purge_dispatched_events(older_than_days: int = settings.ORDER_EVENTS_RETENTION_DAYS) -> int:
+    """
+    Hapus event dispatched yang lebih tua dari `older_than_days`. Returns
+    jumlah row.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(delete(OrderEventModel).where(
+            OrderEventModel.status == OrderEventStatus.DISPATCHED,
+            OrderEventModel.dispatched_at < datetime.utcnow() - timedelta(days=older_than_days),
+        ))
+        db.commit()
+        return result.rowcount
+    finally:
+        db.close()
+
+def outbox_lag(db: Session) -> dict:
+    """
+    Lag outbox: jumlah event pending/failed dan umur event pending tertua
+    (detik), plus counters dispatcher process ini
+    """
+    now = datetime.utcnow()
+    counts = dict(db.execute(
+        select(OrderEventModel.status, func.count(OrderEventModel.id)).where(
+            OrderEventModel.status.in_([OrderEventStatus.PENDING, OrderEventStatus.FAILED])
+        ).group_by(OrderEventModel.status)
+    ).all())
+    oldest = db.scalar(
+        select(OrderEventModel.created_at).where(
+            OrderEventModel.status == OrderEventStatus.PENDING
+        ).order_by(OrderEventModel.id).limit(1)
+    )
+    dispatcher = order_event_dispatcher
+    return {
+        "pending": counts.get(OrderEventStatus.PENDING, 0),
+        "failed": counts.get(OrderEventStatus.FAILED, 0),
+        "oldest_pending_at": oldest,
+        "lag_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+        "dispatcher": {**dispatcher.counters, "last_run_at": dispatcher.last_run_at},
+    }
+
+async def run_order_event_dispatcher(interval: float = settings.ORDER_EVENTS_DISPATCH_INTERVAL) -> None:
+    """
+    Background task (dijalankan dari lifespan): dispatch terus selama batch
+    penuh, lalu tunggu `interval` detik. Event dispatched yang lama dibuang
+    setiap jam.
+    """
+    next_purge = 0.0
+    while True:
+        claimed = 0
+        try:
+            claimed = await run_in_threadpool(order_event_dispatcher.dispatch_batch)
+            if time.monotonic() >= next_purge:
+                await run_in_threadpool(purge_dispatched_events)
+                next_purge = time.monotonic() + 3600
+        except Exception:
+            logger.exception("Order event dispatch failed")
+        if claimed < order_event_dispatcher.batch_size:
+            await asyncio.sleep(interval)
@@ -0,0 +1,123 @@
+"""
+Order export - streaming CSV & NDJSON (order + line items) untuk finance
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator, List, Optional
+from sqlalchemy import select
+from app.core.database import SessionLocal
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+LAYOUT_FLAT = "flat"
+LAYOUT_NESTED = "nested"
+
+EXPORT_BATCH_SIZE = 1000
+
+ORDER_FIELDS = [
+    "id", "order_number", "created_at", "status", "payment_status", "payment_method",
+    "customer_name", "customer_email", "customer_phone",
+    "shipping_address", "shipping_city", "shipping_province", "shipping_postal_code",
+    "subtotal", "shipping_cost", "tax", "discount", "total", "promotion_code",
+    "shipped_at", "delivered_at",
+]
+ITEM_FIELDS = [
+    "product_id", "variation_id", "product_name", "variation_name",
+    "product_price", "quantity", "subtotal",
+]
+# Kolom item di-label "item_<nama>" supaya tidak bentrok dengan kolom order
+ITEM_LABELS = [f"item_{name}" for name in ITEM_FIELDS]
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+def _plain(value):
+    return value.value if hasattr(value, "value") else value  # Enum
+
+def _order_dict(row) -> dict:
+    return {name: _plain(getattr(row, name)) for name in ORDER_FIELDS}
+
+def _item_dict(row) -> Optional[dict]:
+    if getattr(row, "item_product_id") is None:
+        return None  # order tanpa item (LEFT JOIN)
+    return {name: getattr(row, label) for name, label in zip(ITEM_FIELDS, ITEM_LABELS)}
+
+def _group_orders(rows: Iterable) -> Iterator[tuple]:
+    """
+    (order, [items]) dari row JOIN yang sudah urut per order; hanya satu
+    order yang ditahan di memory
+    """
+    current = None
+    items: List[dict] = []
+    for row in rows:
+        if current is None or row.id != current.id:
+            if current is not None:
+                yield current, items
+            current, items = row, []
+        item = _item_dict(row)
+        if item is not None:
+            items.append(item)
+    if current is not None:
+        yield current, items
+
+def _chunks(lines: Iterable[str], size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    buffer: List[str] = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+def _csv_line(values: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+    return buffer.getvalue()
+
+def _lines(fmt: str, layout: str, rows: Iterable) -> Iterator[str]:
+    if layout == LAYOUT_FLAT:
+        # Satu baris per line item (kolom order diulang)
+        if fmt == FORMAT_CSV:
+            yield _csv_line(ORDER_FIELDS + ITEM_LABELS)
+        for row in rows:
+            order = _order_dict(row)
+            item = _item_dict(row) or dict.fromkeys(ITEM_FIELDS)
+            if fmt == FORMAT_CSV:
+                yield _csv_line(list(order.values()) + list(item.values()))
+            else:
+                yield json.dumps({**order, **{f"item_{k}": v for k, v in item.items()}}, default=_json_default) + "\n"
+        return
+
+    # Nested: satu record per order dengan array items
+    if fmt == FORMAT_CSV:
+        yield _csv_line(ORDER_FIELDS + ["items"])
+    for row, items in _group_orders(rows):
+        order = _order_dict(row)
+        if fmt == FORMAT_CSV:
+            yield _csv_line(list(order.values()) + [json.dumps(items, default=_json_default)])
+        else:
+            yield json.dumps({**order, "items": items}, default=_json_default) + "\n"
+
+def export_orders(fmt: str, layout: str, filters) -> Iterable[str]:
+    """
+    Generator export. Orders + order_items dibaca dalam satu SELECT ... LEFT
+    JOIN lewat server-side cursor (stream_results + yield_per), diurutkan
+    per order sehingga memory konstan berapa pun rentang tanggalnya.
+    `filters` adalah OrderFilters dari endpoint list.
+    """
+    db = SessionLocal()
+    try:
+        stmt = select(
+            *[getattr(OrderModel, name) for name in ORDER_FIELDS],
+            *[getattr(OrderItemModel, name).label(label) for name, label in zip(ITEM_FIELDS, ITEM_LABELS)],
+        ).outerjoin(OrderItemModel, OrderItemModel.order_id == OrderModel.id)
+        stmt = filters.apply(stmt).order_by(OrderModel.created_at, OrderModel.id, OrderItemModel.id)
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        yield from _chunks(_lines(fmt, layout, result))
+    finally:
+        db.close()
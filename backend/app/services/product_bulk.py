@@ -0,0 +1,120 @@
+"""
+Bulk product update - repricing & stock reconciliation dalam satu transaksi
+"""
+from typing import List
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+from app.models.product import Product as ProductModel
+from app.schemas.product import ProductBulkAdjustment, ProductBulkItem
+from app.services import search as search_service
+
+BULK_FIELDS = ("price", "original_price", "discount", "stock", "is_active")
+
+def _resolve_ids(db: Session, items: List[ProductBulkItem]):
+    """
+    Map setiap item ke product id dengan satu query (id atau sku).
+    Kalau ada item yang mengubah stock, rows dikunci (FOR UPDATE) supaya
+    `reserved` tidak berubah sampai transaksi selesai.
+    Returns (list of (item, product_id)), not_found, {product_id: reserved}.
+    """
+    ids = {item.id for item in items if item.id is not None}
+    skus = {item.sku for item in items if item.id is None}
+    conditions = []
+    if ids:
+        conditions.append(ProductModel.id.in_(ids))
+    if skus:
+        conditions.append(ProductModel.sku.in_(skus))
+    query = select(ProductModel.id, ProductModel.sku, ProductModel.reserved).where(or_(*conditions))
+    if any(item.stock is not None for item in items):
+        query = query.with_for_update()
+    rows = db.execute(query).all()
+    reserved = {row.id: row.reserved or 0 for row in rows}
+    id_by_sku = {row.sku: row.id for row in rows if row.sku}
+
+    resolved = []
+    not_found = []
+    for item in items:
+        if item.id is not None:
+            if item.id in reserved:
+                resolved.append((item, item.id))
+            else:
+                not_found.append(str(item.id))
+        elif item.sku in id_by_sku:
+            resolved.append((item, id_by_sku[item.sku]))
+        else:
+            not_found.append(item.sku)
+    return resolved, not_found, reserved
+
+def apply_items(db: Session, items: List[ProductBulkItem]):
+    """
+    Update per product lewat ORM bulk UPDATE by primary key (executemany,
+    dikelompokkan per kombinasi kolom). Item yang stock-nya di bawah unit
+    yang sedang di-hold (`reserved`) ditolak seluruhnya. Returns (updated,
+    not_found, rejected, ids yang is_active-nya berubah).
+    """
+    if not items:
+        return 0, [], [], []
+    resolved, not_found, reserved = _resolve_ids(db, items)
+    rows = []
+    rejected = []
+    activation_changed = []
+    for item, product_id in resolved:
+        values = item.model_dump(include=set(BULK_FIELDS), exclude_none=True)
+        if not values:
+            continue
+        if "stock" in values and values["stock"] < reserved[product_id]:
+            rejected.append(str(item.id) if item.id is not None else item.sku)
+            continue
+        if "is_active" in values:
+            activation_changed.append(product_id)
+        rows.append({"id": product_id, **values})
+    if rows:
+        db.execute(update(ProductModel), rows)
+    return len(rows), not_found, rejected, activation_changed
+
+def apply_adjustment(db: Session, adjustment: ProductBulkAdjustment):
+    """
+    Satu UPDATE ... WHERE untuk semua product di category/release_tag.
+    Percent: price * (1 + value/100); absolute: price + value. Hasil tidak
+    pernah negatif, dan stock tidak pernah di bawah `reserved`.
+    Returns (jumlah row, ids yang stock-nya ditahan di reserved).
+    """
+    column = getattr(ProductModel, adjustment.field)
+    if adjustment.mode == "percent":
+        new_value = column * (1 + adjustment.value / 100)
+    else:
+        new_value = column + adjustment.value
+    if adjustment.field == "stock":
+        new_value = func.round(new_value)
+    else:
+        new_value = func.round(new_value, 2)
+    new_value = case((new_value < 0, 0), else_=new_value)
+
+    conditions = []
+    if adjustment.category_id is not None:
+        conditions.append(ProductModel.category_id == adjustment.category_id)
+    if adjustment.release_tag:
+        conditions.append(ProductModel.release_tag == adjustment.release_tag)
+
+    clamped = []
+    if adjustment.field == "stock":
+        # Kunci rows dulu supaya reserved yang dibandingkan sama dengan saat UPDATE
+        clamped = list(db.scalars(
+            select(ProductModel.id).where(*conditions, new_value < ProductModel.reserved)
+            .order_by(ProductModel.id).with_for_update()
+        ))
+        new_value = case((new_value < ProductModel.reserved, ProductModel.reserved), else_=new_value)
+
+    stmt = update(ProductModel).where(*conditions).values({adjustment.field: new_value})
+    result = db.execute(stmt.execution_options(synchronize_session=False))
+    return result.rowcount, clamped
+
+def bulk_update(db: Session, items: List[ProductBulkItem], adjustment=None) -> dict:
+    """
+    Jalankan item updates + adjustment dalam satu transaksi
+    """
+    updated, not_found, rejected, activation_changed = apply_items(db, items)
+    adjusted, clamped = apply_adjustment(db, adjustment) if adjustment else (0, [])
+    search_service.sync_products(db, activation_changed)
+    db.commit()
+    return {"updated": updated, "adjusted": adjusted, "not_found": not_found, "rejected": rejected, "clamped": clamped}
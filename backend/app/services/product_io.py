@@ -0,0 +1,283 @@
+"""
+Product import/export - streaming CSV & NDJSON untuk bulk onboarding katalog
+"""
+import csv
+import io
+import json
+import re
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.product import Product as ProductModel, ProductVariation as ProductVariationModel
+from app.schemas.product import ProductBase, ProductCreate, ProductVariationBase, ProductVariationCreate
+from app.services import search as search_service
+
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+# Batas jumlah error yang dikembalikan di response (sisanya hanya dihitung)
+MAX_REPORTED_ERRORS = 1000
+
+EXPORT_FIELDS = ["id"] + list(ProductBase.model_fields) + ["is_active"]
+VARIATION_FIELDS = list(ProductVariationBase.model_fields)
+
+def slugify(name: str) -> str:
+    """
+    Slug dari nama product (sama dengan create_product)
+    """
+    return re.sub(r'[^a-zA-Z0-9\-]', '-', name.lower()).strip('-')
+
+def detect_format(filename: Optional[str], requested: Optional[str]) -> str:
+    if requested:
+        return requested
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return FORMAT_NDJSON
+    return FORMAT_CSV
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def _iter_csv(stream: io.TextIOBase) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # Kolom kosong dianggap tidak diisi supaya default schema berlaku
+        data = {key: value for key, value in row.items() if key and value not in (None, "")}
+        if "variations" in data:
+            try:
+                data["variations"] = json.loads(data["variations"])
+            except ValueError:
+                pass  # dilaporkan oleh validasi di bawah
+        yield reader.line_num, data
+
+def _iter_ndjson(stream: io.TextIOBase) -> Iterator[Tuple[int, dict]]:
+    for line_num, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except ValueError as e:
+            yield line_num, e
+
+def _validate_row(data) -> Tuple[dict, List[dict]]:
+    """
+    Validasi satu row dengan ProductCreate / ProductVariationCreate.
+    Returns (product values, variation values); raise ValueError kalau invalid.
+    """
+    if isinstance(data, Exception):
+        raise ValueError(f"Invalid JSON: {data}")
+    if not isinstance(data, dict):
+        raise ValueError("Row must be an object")
+    variations = data.pop("variations", None) or []
+    if not isinstance(variations, list):
+        raise ValueError("variations must be a list")
+    data.setdefault("slug", "")
+    try:
+        product = ProductCreate.model_validate(data)
+        variation_models = [ProductVariationCreate.model_validate(v) for v in variations]
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+        ))
+    if not product.slug:
+        product.slug = slugify(product.name)
+    if not product.sku:
+        product.sku = f"PRD-{uuid.uuid4().hex[:8].upper()}"
+    values = product.model_dump()
+    values["has_variations"] = values["has_variations"] or bool(variation_models)
+    variation_values = []
+    for variation in variation_models:
+        if not variation.sku:
+            variation.sku = f"VAR-{uuid.uuid4().hex[:8].upper()}"
+        variation_values.append(variation.model_dump())
+    return values, variation_values
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def error(self, row: int, message: str, sku: Optional[str] = None) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "sku": sku, "error": message})
+
+    def as_dict(self) -> dict:
+        return {"created": self.created, "failed": self.failed, "errors": self.errors}
+
+def _drop_conflicts(db: Session, chunk: list, report: ImportReport) -> list:
+    """
+    Buang row yang slug/sku-nya sudah ada (di database atau di chunk yang
+    sama) sebelum insert, supaya satu duplikat tidak menggagalkan satu chunk.
+    """
+    slugs = [values["slug"] for _, values, _ in chunk]
+    skus = [values["sku"] for _, values, _ in chunk]
+    variation_skus = [v["sku"] for _, _, variations in chunk for v in variations]
+    existing_slugs = set(db.scalars(select(ProductModel.slug).where(ProductModel.slug.in_(slugs))))
+    existing_skus = set(db.scalars(select(ProductModel.sku).where(ProductModel.sku.in_(skus))))
+    existing_variation_skus = set(db.scalars(
+        select(ProductVariationModel.sku).where(ProductVariationModel.sku.in_(variation_skus))
+    )) if variation_skus else set()
+
+    accepted = []
+    for row_num, values, variations in chunk:
+        if values["slug"] in existing_slugs:
+            report.error(row_num, f"Duplicate slug '{values['slug']}'", values["sku"])
+            continue
+        if values["sku"] in existing_skus:
+            report.error(row_num, f"Duplicate sku '{values['sku']}'", values["sku"])
+            continue
+        duplicate_variation = next((v["sku"] for v in variations if v["sku"] in existing_variation_skus), None)
+        if duplicate_variation:
+            report.error(row_num, f"Duplicate variation sku '{duplicate_variation}'", values["sku"])
+            continue
+        existing_slugs.add(values["slug"])
+        existing_skus.add(values["sku"])
+        existing_variation_skus.update(v["sku"] for v in variations)
+        accepted.append((row_num, values, variations))
+    return accepted
+
+def _insert_chunk(db: Session, chunk: list) -> List[int]:
+    """
+    Insert products + variations dengan executemany. Returns product ids.
+    """
+    db.execute(insert(ProductModel), [values for _, values, _ in chunk])
+    # MySQL tidak mendukung RETURNING untuk executemany; ambil id lewat slug (unik)
+    ids_by_slug = dict(db.execute(
+        select(ProductModel.slug, ProductModel.id).where(
+            ProductModel.slug.in_([values["slug"] for _, values, _ in chunk])
+        )
+    ).all())
+    variation_rows = [
+        {"product_id": ids_by_slug[values["slug"]], **variation}
+        for _, values, variations in chunk
+        for variation in variations
+    ]
+    if variation_rows:
+        db.execute(insert(ProductVariationModel), variation_rows)
+    return list(ids_by_slug.values())
+
+def _write_chunk(db: Session, chunk: list, report: ImportReport) -> None:
+    chunk = _drop_conflicts(db, chunk, report)
+    if not chunk:
+        return
+    try:
+        product_ids = _insert_chunk(db, chunk)
+        search_service.sync_products(db, product_ids)
+        db.commit()
+        report.created += len(chunk)
+        return
+    except IntegrityError:
+        db.rollback()
+
+    # Fallback: insert satu per satu untuk menemukan row yang bermasalah
+    for row in chunk:
+        try:
+            product_ids = _insert_chunk(db, [row])
+            search_service.sync_products(db, product_ids)
+            db.commit()
+            report.created += 1
+        except IntegrityError as e:
+            db.rollback()
+            report.error(row[0], str(e.orig), row[1]["sku"])
+
+def import_products(db: Session, stream: io.TextIOBase, fmt: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> dict:
+    """
+    Import products dari stream CSV/NDJSON. Rows divalidasi satu per satu
+    dan ditulis per chunk (commit per chunk), error dilaporkan per row.
+    """
+    rows = _iter_ndjson(stream) if fmt == FORMAT_NDJSON else _iter_csv(stream)
+    report = ImportReport()
+    chunk = []
+    for row_num, data in rows:
+        try:
+            values, variations = _validate_row(data)
+        except ValueError as e:
+            sku = data.get("sku") if isinstance(data, dict) else None
+            report.error(row_num, str(e), sku)
+            continue
+        chunk.append((row_num, values, variations))
+        if len(chunk) >= chunk_size:
+            _write_chunk(db, chunk, report)
+            chunk = []
+    if chunk:
+        _write_chunk(db, chunk, report)
+    return report.as_dict()
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+def _load_variations(db: Session, product_ids: List[int]) -> Dict[int, List[dict]]:
+    columns = [getattr(ProductVariationModel, name) for name in VARIATION_FIELDS]
+    variations: Dict[int, List[dict]] = {}
+    rows = db.execute(
+        select(ProductVariationModel.product_id, *columns).where(
+            ProductVariationModel.product_id.in_(product_ids),
+            ProductVariationModel.is_active == True
+        ).order_by(ProductVariationModel.id)
+    )
+    for row in rows:
+        variations.setdefault(row.product_id, []).append(
+            {name: getattr(row, name) for name in VARIATION_FIELDS}
+        )
+    return variations
+
+def export_products(fmt: str, include_inactive: bool = False) -> Iterable[str]:
+    """
+    Generator baris export. Products dibaca lewat server-side cursor
+    (stream_results + yield_per) sehingga memory konstan; variations diambil
+    per batch lewat koneksi kedua karena koneksi pertama sedang streaming.
+    """
+    stream_db = SessionLocal()
+    lookup_db = SessionLocal()
+    try:
+        columns = [getattr(ProductModel, name) for name in EXPORT_FIELDS]
+        stmt = select(*columns).order_by(ProductModel.id)
+        if not include_inactive:
+            stmt = stmt.where(ProductModel.is_active == True)
+        result = stream_db.execute(
+            stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if fmt == FORMAT_CSV:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS + ["variations"])
+            writer.writeheader()
+            yield buffer.getvalue()
+
+        for batch in result.partitions():
+            variations = _load_variations(lookup_db, [row.id for row in batch])
+            lookup_db.rollback()  # jangan tahan transaksi/snapshot di koneksi kedua
+            if fmt == FORMAT_NDJSON:
+                yield "".join(
+                    json.dumps({**row._asdict(), "variations": variations.get(row.id, [])},
+                               default=_json_default) + "\n"
+                    for row in batch
+                )
+            else:
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS + ["variations"])
+                for row in batch:
+                    row_variations = variations.get(row.id)
+                    writer.writerow({
+                        **row._asdict(),
+                        "variations": json.dumps(row_variations, default=_json_default) if row_variations else "",
+                    })
+                yield buffer.getvalue()
+    finally:
+        stream_db.close()
+        lookup_db.close()
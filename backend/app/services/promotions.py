@@ -0,0 +1,287 @@
+"""
+Promotions - index in-memory promo aktif dan perhitungan discount checkout
+
+Promo yang sedang berlaku (is_active, dalam rentang tanggal, kuota belum
+habis) disimpan di dict per code, jadi validasi code di checkout/quote
+cukup satu lookup. Index dibangun ulang kalau promo ditulis (invalidate()
+setelah commit), saat melewati start_date/end_date terdekat, atau paling
+lama setelah PROMOTION_INDEX_TTL detik (write dari process lain).
+
+Pemakaian dicatat oleh redeem_promotion() di transaksi order:
+- promotion_redemptions: satu row per order, (promotion_id, customer_email,
+  seq) unik untuk menegakkan max_uses_per_customer
+- promotion_usage_shards: counter global dipecah ke beberapa row yang
+  masing-masing punya quota (jumlahnya = max_uses). Checkout mengambil satu
+  unit dari shard acak dengan conditional UPDATE, jadi flash sale tidak
+  antre di satu row dan total tidak pernah melewati max_uses.
+current_uses di response = SUM(used) semua shard; di index hanya snapshot.
+"""
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import bindparam, exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.promotion import (
+    Promotion as PromotionModel, PromotionRedemption as PromotionRedemptionModel,
+    PromotionType, PromotionUsageShard as PromotionUsageShardModel,
+)
+from app.schemas.promotion import Promotion
+
+class PromotionError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Datetime naive UTC (kolom tanggal promo bisa tersimpan dengan timezone)
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def promotion_uses(db: Session, promotion_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Total pemakaian per promo dari shards (satu GROUP BY)
+    """
+    ids = list(promotion_ids)
+    if not ids:
+        return {}
+    return dict(db.execute(
+        select(PromotionUsageShardModel.promotion_id, func.sum(PromotionUsageShardModel.used)).where(
+            PromotionUsageShardModel.promotion_id.in_(ids)
+        ).group_by(PromotionUsageShardModel.promotion_id)
+    ).all())
+
+def with_uses(db: Session, rows: List[PromotionModel]) -> List[Promotion]:
+    """
+    Schema Promotion dengan current_uses dari shards (promo lama yang belum
+    punya shard memakai kolom current_uses)
+    """
+    uses = promotion_uses(db, [row.id for row in rows])
+    return [
+        Promotion.model_validate(row).model_copy(update={"current_uses": int(uses.get(row.id, row.current_uses or 0))})
+        for row in rows
+    ]
+
+def _invalid_reason(promotion, now: datetime) -> Optional[str]:
+    if not promotion.is_active:
+        return "Promotion is not active"
+    if promotion.start_date and _utc(promotion.start_date) > now:
+        return "Promotion has not started yet"
+    if promotion.end_date and _utc(promotion.end_date) < now:
+        return "Promotion has expired"
+    if promotion.max_uses and (promotion.current_uses or 0) >= promotion.max_uses:
+        return "Promotion usage limit reached"
+    return None
+
+class PromotionIndex:
+    """
+    Promo yang berlaku per code (uppercase) -> schema Promotion
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._by_code: Optional[Dict[str, Promotion]] = None
+        self._valid_until: Optional[datetime] = None
+        self.rebuilds = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._by_code = None
+
+    def discard(self, code: str) -> None:
+        """
+        Keluarkan satu code (mis. kuota habis saat checkout) sampai rebuild berikutnya
+        """
+        with self._lock:
+            if self._by_code is not None:
+                self._by_code.pop(code, None)
+
+    def _rebuild(self, now: datetime) -> Dict[str, Promotion]:
+        # Dipanggil dengan self._lock terkunci
+        db = SessionLocal()
+        try:
+            rows = db.query(PromotionModel).filter(
+                PromotionModel.is_active == True,
+                (PromotionModel.end_date == None) | (PromotionModel.end_date >= now),
+            ).all()
+            by_code = {}
+            boundaries = [now + timedelta(seconds=self.max_age)]
+            for promotion in with_uses(db, rows):
+                start, end = _utc(promotion.start_date), _utc(promotion.end_date)
+                if start and start > now:
+                    boundaries.append(start)  # mulai berlaku
+                    continue
+                if end:
+                    boundaries.append(end + timedelta(microseconds=1))  # kedaluwarsa
+                if _invalid_reason(promotion, now) is None:
+                    by_code[promotion.code] = promotion
+        finally:
+            db.close()
+        self._by_code = by_code
+        self._valid_until = min(boundaries)
+        self.rebuilds += 1
+        return by_code
+
+    def get(self, code: str) -> Optional[Promotion]:
+        """
+        Promo yang berlaku untuk `code`, atau None
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            by_code = self._by_code
+            if by_code is None or now >= self._valid_until:
+                by_code = self._rebuild(now)
+            return by_code.get(code.upper())
+
+promotion_index = PromotionIndex(max_age=settings.PROMOTION_INDEX_TTL)
+
+def validate_code(db: Session, code: str) -> Promotion:
+    """
+    Promo untuk `code` dari index. Kalau tidak ada, cari di database hanya
+    untuk pesan error yang tepat (404 / 400).
+    """
+    promotion = promotion_index.get(code)
+    if promotion is not None:
+        return promotion
+    row = db.query(PromotionModel).filter(PromotionModel.code == code.upper()).first()
+    if row is None:
+        raise PromotionError(404, "Promotion code not found")
+    promotion = with_uses(db, [row])[0]
+    raise PromotionError(400, _invalid_reason(promotion, datetime.utcnow()) or "Promotion is not available")
+
+def compute_discount(promotion: Promotion, subtotal: float, shipping_cost: float) -> float:
+    """
+    Discount untuk subtotal (tidak pernah melebihi subtotal/ongkir). Raise
+    PromotionError 400 kalau min_purchase belum terpenuhi.
+    """
+    if subtotal < (promotion.min_purchase or 0):
+        raise PromotionError(400, f"Minimum purchase for this promotion is {promotion.min_purchase:g}")
+    if promotion.type == PromotionType.PERCENTAGE.value:
+        return round(min(subtotal * promotion.value / 100, subtotal), 2)
+    if promotion.type == PromotionType.FIXED_AMOUNT.value:
+        return min(promotion.value, subtotal)
+    if promotion.type == PromotionType.FREE_SHIPPING.value:
+        return shipping_cost
+    return 0
+
+def order_totals(subtotal: float, promotion: Optional[Promotion]) -> dict:
+    """
+    Rincian total order (dipakai checkout dan cart quote)
+    """
+    shipping_cost = 0  # You can add logic here
+    tax = 0  # You can add logic here
+    discount = compute_discount(promotion, subtotal, shipping_cost) if promotion is not None else 0
+    return {
+        "subtotal": subtotal,
+        "shipping_cost": shipping_cost,
+        "tax": tax,
+        "discount": discount,
+        "total": subtotal + shipping_cost + tax - discount,
+    }
+
+def allocate_usage_shards(db: Session, promotion_id: int, max_uses: Optional[int], shards: Optional[int] = None) -> None:
+    """
+    Buat/atur ulang shard counter promo (dipanggil di transaksi yang menulis
+    promo). Sisa kuota (max_uses - total used) dibagi rata ke `shards` row;
+    quota shard tidak pernah di bawah used-nya. Promo tanpa shard mulai dari
+    kolom current_uses.
+    """
+    count = shards or settings.PROMOTION_USAGE_SHARDS
+    limit = max_uses or None  # 0 = tanpa batas (sama dengan validasi code)
+    if limit is not None:
+        count = max(1, min(count, limit))
+    rows = {row.shard: row for row in db.query(PromotionUsageShardModel).filter(
+        PromotionUsageShardModel.promotion_id == promotion_id
+    ).with_for_update()}
+    if not rows:
+        legacy = db.scalar(select(PromotionModel.current_uses).where(PromotionModel.id == promotion_id)) or 0
+        rows[0] = PromotionUsageShardModel(promotion_id=promotion_id, shard=0, used=legacy)
+        db.add(rows[0])
+    for shard in range(count):
+        if shard not in rows:
+            rows[shard] = PromotionUsageShardModel(promotion_id=promotion_id, shard=shard, used=0)
+            db.add(rows[shard])
+
+    ordered = [rows[shard] for shard in sorted(rows)]
+    if limit is None:
+        for row in ordered:
+            row.quota = None
+        return
+    remaining = max(0, limit - sum(row.used for row in ordered))
+    share, extra = divmod(remaining, count)
+    for row in ordered:
+        # Shard di luar `count` (konfigurasi lama) ditutup
+        row.quota = row.used + (share + (1 if row.shard < extra else 0) if row.shard < count else 0)
+
+# Ambil satu unit dari shard kalau quota-nya masih ada dan promo masih berlaku
+# (EXISTS hanya membaca row promo, tidak mengunci untuk update)
+_take_stmt = update(PromotionUsageShardModel).where(
+    PromotionUsageShardModel.promotion_id == bindparam("b_promotion"),
+    PromotionUsageShardModel.shard == bindparam("b_shard"),
+    or_(PromotionUsageShardModel.quota == None, PromotionUsageShardModel.used < PromotionUsageShardModel.quota),
+    exists().where(
+        PromotionModel.id == PromotionUsageShardModel.promotion_id,
+        PromotionModel.is_active == True,
+        or_(PromotionModel.start_date == None, PromotionModel.start_date <= bindparam("b_now")),
+        or_(PromotionModel.end_date == None, PromotionModel.end_date >= bindparam("b_now")),
+    ),
+).values(used=PromotionUsageShardModel.used + 1).execution_options(synchronize_session=False)
+
+def _open_shards(db: Session, promotion_id: int) -> List[int]:
+    return list(db.scalars(select(PromotionUsageShardModel.shard).where(
+        PromotionUsageShardModel.promotion_id == promotion_id,
+        or_(PromotionUsageShardModel.quota == None, PromotionUsageShardModel.used < PromotionUsageShardModel.quota),
+    )))
+
+def redeem_promotion(db: Session, promotion: Promotion, customer_email: str, order_id: int) -> None:
+    """
+    Catat pemakaian promo untuk order di transaksi `db`: cek & insert
+    redemption customer, lalu ambil satu unit dari shard acak yang masih
+    punya quota. Raise PromotionError 400 (batas customer / kuota habis /
+    promo tidak berlaku) atau 409 (customer yang sama checkout bersamaan).
+    """
+    now = datetime.utcnow()
+    email = customer_email.lower()
+
+    # Per customer: lookup (promotion_id, customer_email) di unique index
+    seq = None
+    if promotion.max_uses_per_customer:
+        used = db.scalar(select(func.count(PromotionRedemptionModel.id)).where(
+            PromotionRedemptionModel.promotion_id == promotion.id,
+            PromotionRedemptionModel.customer_email == email,
+        ))
+        if used >= promotion.max_uses_per_customer:
+            raise PromotionError(400, "Promotion usage limit reached for this customer")
+        seq = used + 1
+    db.add(PromotionRedemptionModel(
+        promotion_id=promotion.id, customer_email=email, seq=seq, order_id=order_id, created_at=now,
+    ))
+    try:
+        db.flush()
+    except IntegrityError:
+        raise PromotionError(409, "Promotion is being redeemed concurrently for this customer, please retry")
+
+    # Global: shard dikunci paling akhir, hanya sampai commit order
+    shards = _open_shards(db, promotion.id)
+    if not shards and not db.scalar(select(exists().where(PromotionUsageShardModel.promotion_id == promotion.id))):
+        # Promo yang belum punya shard (mis. di-insert lewat SQL)
+        allocate_usage_shards(db, promotion.id, promotion.max_uses)
+        try:
+            db.flush()
+        except IntegrityError:
+            raise PromotionError(409, "Promotion is being redeemed concurrently, please retry")
+        shards = _open_shards(db, promotion.id)
+    random.shuffle(shards)
+    for shard in shards:
+        if db.execute(_take_stmt, {"b_promotion": promotion.id, "b_shard": shard, "b_now": now}).rowcount == 1:
+            return
+    promotion_index.discard(promotion.code)
+    raise PromotionError(400, "Promotion is no longer available")
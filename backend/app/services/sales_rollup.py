@@ -0,0 +1,170 @@
+"""
+Sales rollup - sales_daily & sales_daily_categories dijaga incremental dari
+perubahan payment_status order
+
+Order yang menjadi paid menambah (order_count, revenue, items_sold) ke hari
+created_at-nya di SALES_TIMEZONE; order yang berhenti paid (refunded, dsb.)
+menguranginya. Delta ditulis dengan upsert di transaksi yang sama dengan
+perubahan order, jadi rollup selalu konsisten dengan table orders.
+Order yang diarsipkan tidak mengubah rollup. Hitung ulang dari orders +
+orders_archive: scripts/backfill_sales_daily.py.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timezone
+from typing import Dict, Iterable, List, Tuple
+from dateutil import tz
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel, PaymentStatus
+from app.models.order_archive import ArchivedOrder as ArchivedOrderModel, ArchivedOrderItem as ArchivedOrderItemModel
+from app.models.product import Product as ProductModel
+from app.models.sales import SalesDaily as SalesDailyModel, SalesDailyCategory as SalesDailyCategoryModel
+
+SALES_TZ = tz.gettz(settings.SALES_TIMEZONE)
+
+_daily = SalesDailyModel.__table__
+_categories = SalesDailyCategoryModel.__table__
+_VALUE_COLUMNS = ("order_count", "revenue", "items_sold")
+
+# (order_id, created_at, total, sign): sign +1 = menjadi paid, -1 = berhenti paid
+PaymentChange = Tuple[int, datetime, float, int]
+
+def sales_date(created_at: datetime) -> date:
+    """
+    Tanggal lokal (SALES_TIMEZONE) untuk created_at. Nilai naive = UTC:
+    semua timestamp database ditulis dalam UTC (lihat app/core/database.py)
+    """
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(SALES_TZ).date()
+
+def sales_today() -> date:
+    return datetime.now(SALES_TZ).date()
+
+def sales_day_start(day: date) -> datetime:
+    """
+    Awal hari `day` di SALES_TIMEZONE sebagai UTC naive (untuk dibandingkan
+    dengan kolom timestamp)
+    """
+    return datetime.combine(day, time(), tzinfo=SALES_TZ).astimezone(timezone.utc).replace(tzinfo=None)
+
+def payment_sign(before_paid: bool, after_paid: bool) -> int:
+    return int(after_paid) - int(before_paid)
+
+def _order_items(db: Session, item_model, order_ids: List[int]):
+    """
+    (order_id, category_id, quantity, subtotal) untuk item order-order tersebut
+    """
+    return db.execute(
+        select(item_model.order_id, ProductModel.category_id, item_model.quantity, item_model.subtotal)
+        .outerjoin(ProductModel, ProductModel.id == item_model.product_id)
+        .where(item_model.order_id.in_(order_ids))
+    ).all()
+
+def _aggregate(changes: Iterable[PaymentChange], items, daily: Dict, categories: Dict) -> None:
+    """
+    Tambahkan delta per hari dan per (category, hari) ke `daily`/`categories`
+    """
+    by_order = defaultdict(list)
+    for item in items:
+        by_order[item.order_id].append(item)
+    for order_id, created_at, total, sign in changes:
+        day = sales_date(created_at)
+        order_items = by_order.get(order_id, [])
+        entry = daily[day]
+        entry[0] += sign
+        entry[1] += sign * (total or 0)
+        entry[2] += sign * sum(item.quantity for item in order_items)
+
+        per_category = defaultdict(lambda: [0.0, 0])
+        for item in order_items:
+            if item.category_id is not None:
+                per_category[item.category_id][0] += item.subtotal or 0
+                per_category[item.category_id][1] += item.quantity
+        for category_id, (revenue, quantity) in per_category.items():
+            entry = categories[(category_id, day)]
+            entry[0] += sign
+            entry[1] += sign * revenue
+            entry[2] += sign * quantity
+
+def _new_totals() -> Tuple[Dict, Dict]:
+    return defaultdict(lambda: [0, 0.0, 0]), defaultdict(lambda: [0, 0.0, 0])
+
+def _rows(daily: Dict, categories: Dict) -> Tuple[List[dict], List[dict]]:
+    return (
+        [{"date": day, **dict(zip(_VALUE_COLUMNS, values))} for day, values in sorted(daily.items())],
+        [{"category_id": category_id, "date": day, **dict(zip(_VALUE_COLUMNS, values))}
+         for (category_id, day), values in sorted(categories.items())],
+    )
+
+def _upsert(db: Session, table, keys: List[str], rows: List[dict]) -> None:
+    """
+    INSERT, atau tambahkan nilai ke row yang sudah ada (atomik, aman untuk
+    transaksi bersamaan di hari yang sama)
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update({
+            column: table.c[column] + stmt.inserted[column] for column in _VALUE_COLUMNS
+        })
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(index_elements=keys, set_={
+            column: table.c[column] + stmt.excluded[column] for column in _VALUE_COLUMNS
+        })
+    db.execute(stmt)
+
+def record_payment_changes(db: Session, changes: List[PaymentChange]) -> None:
+    """
+    Terapkan perubahan status paid ke rollup di transaksi `db` (dipanggil
+    sebelum commit perubahan order)
+    """
+    changes = [change for change in changes if change[3]]
+    if not changes:
+        return
+    daily, categories = _new_totals()
+    _aggregate(changes, _order_items(db, OrderItemModel, [change[0] for change in changes]), daily, categories)
+    daily_rows, category_rows = _rows(daily, categories)
+    _upsert(db, _daily, ["date"], daily_rows)
+    _upsert(db, _categories, ["category_id", "date"], category_rows)
+
+def rebuild_sales_daily(db: Session, batch_size: int = 1000) -> int:
+    """
+    Hitung ulang seluruh rollup dari order paid di orders + orders_archive
+    (keyset per id, satu query item per batch) dan ganti isi table dalam
+    satu transaksi. Returns jumlah hari.
+    """
+    daily, categories = _new_totals()
+    for order_model, item_model in ((ArchivedOrderModel, ArchivedOrderItemModel), (OrderModel, OrderItemModel)):
+        last_id = 0
+        while True:
+            orders = db.execute(
+                select(order_model.id, order_model.created_at, order_model.total).where(
+                    order_model.payment_status == PaymentStatus.PAID,
+                    order_model.id > last_id,
+                ).order_by(order_model.id).limit(batch_size)
+            ).all()
+            if not orders:
+                break
+            last_id = orders[-1].id
+            changes = [(order.id, order.created_at, order.total, 1) for order in orders]
+            _aggregate(changes, _order_items(db, item_model, [order.id for order in orders]), daily, categories)
+
+    daily_rows, category_rows = _rows(daily, categories)
+    db.execute(delete(_categories))
+    db.execute(delete(_daily))
+    if daily_rows:
+        db.execute(insert(_daily), daily_rows)
+    if category_rows:
+        db.execute(insert(_categories), category_rows)
+    db.commit()
+    return len(daily_rows)
@@ -0,0 +1,195 @@
+"""
+Product search - full-text search untuk katalog
+
+MySQL memakai FULLTEXT index `ft_products_search` (dibuat oleh
+database/update_product_search.sql) yang di-maintain otomatis oleh InnoDB.
+SQLite (local/test) memakai FTS5 virtual table `products_fts` yang di-sync
+dari aplikasi lewat `sync_product`.
+"""
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+from sqlalchemy import Column, Integer, MetaData, Table, Text, func, literal_column, or_, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+from app.models.product import Product as ProductModel
+
+# Kolom yang diindex, urutannya sama dengan bobot relevansi di bawah
+SEARCH_COLUMNS = ["name", "short_description", "brand", "meta_keywords", "sku"]
+SEARCH_WEIGHTS = [10.0, 2.0, 4.0, 3.0, 6.0]
+
+FTS_TABLE = "products_fts"
+
+# Table object hanya untuk membangun query; tidak didaftarkan ke Base.metadata
+# supaya create_all tidak membuatnya sebagai table biasa.
+products_fts = Table(
+    FTS_TABLE,
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column(FTS_TABLE, Text),
+    *[Column(name, Text) for name in SEARCH_COLUMNS],
+)
+
+# Suffix yang dibuang saat normalisasi (partikel Indonesia & plural Inggris)
+_ID_PARTICLES = ("nya", "lah", "kah", "pun")
+# Akhiran -s yang bukan plural (kata Indonesia: kaos, tas, manis, kursus; status)
+_KEEP_S = ("ss", "us", "is")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def _strip_accents(value: str) -> str:
+    normalized = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+def _stem(token: str) -> str:
+    """
+    Light stemming: cukup untuk menyamakan "kaosnya"/"kaos" dan
+    "hoodies"/"hoodie"; sisanya ditangani prefix matching.
+
+    Hasilnya selalu prefix dari token asli (hanya membuang suffix), jadi
+    `stem*` juga cocok dengan kata yang tidak di-stem (FULLTEXT MySQL).
+    """
+    for particle in _ID_PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 3:
+            return token[:-len(particle)]
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-1]
+    if token.endswith(("ses", "xes", "ches", "shes")) and len(token) > 4:
+        return token[:-2]
+    if not token.endswith("s") or token.endswith(_KEEP_S) or len(token) <= 4:
+        return token
+    # -as/-os pendek kebanyakan kata Indonesia (kipas, emas, beras)
+    if token.endswith(("as", "os")) and len(token) <= 5:
+        return token
+    return token[:-1]
+
+def normalize_tokens(value: Optional[str]) -> List[str]:
+    """
+    Lowercase, buang aksen & tanda baca, lalu stem setiap token
+    """
+    if not value:
+        return []
+    value = _strip_accents(value.lower())
+    return [_stem(token) for token in _TOKEN_RE.findall(value)]
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+def _fts_document(product: ProductModel) -> dict:
+    return {
+        name: " ".join(normalize_tokens(getattr(product, name)))
+        for name in SEARCH_COLUMNS
+    }
+
+def apply_search(query, db: Session, term: str) -> Tuple[object, Optional[object]]:
+    """
+    Tambahkan filter full-text ke product query.
+
+    Returns (query, rank_expression). Urutkan dengan `rank_expression.desc()`
+    untuk hasil paling relevan dulu; None kalau term kosong setelah normalisasi.
+    """
+    tokens = normalize_tokens(term)
+    if not tokens:
+        return query, None
+
+    dialect = _dialect(db)
+    if dialect == "mysql":
+        # FULLTEXT index berisi kata asli (tidak di-stem); stem selalu prefix
+        # dari kata asli jadi `stem*` cocok dengan bentuk tunggal & plural.
+        # Boolean mode: token >= 3 karakter wajib ada (innodb_ft_min_token_size).
+        against = " ".join(
+            f"+{token}*" if len(token) >= 3 else f"{token}*" for token in tokens
+        )
+        relevance = match(
+            *[getattr(ProductModel, name) for name in SEARCH_COLUMNS],
+            against=against,
+        ).in_boolean_mode()
+        return query.filter(relevance), relevance
+
+    if dialect == "sqlite":
+        fts_query = " ".join(f'"{token}"*' for token in tokens)
+        # bm25() bernilai negatif (semakin kecil semakin relevan), jadi dibalik
+        relevance = -func.bm25(literal_column(FTS_TABLE), *SEARCH_WEIGHTS)
+        query = query.join(products_fts, products_fts.c.rowid == ProductModel.id).filter(
+            products_fts.c[FTS_TABLE].op("MATCH")(fts_query)
+        )
+        return query, relevance
+
+    # Fallback untuk database lain: LIKE per token di semua kolom
+    for token in tokens:
+        query = query.filter(or_(*[
+            getattr(ProductModel, name).ilike(f"%{token}%") for name in SEARCH_COLUMNS
+        ]))
+    return query, None
+
+def sync_product(db: Session, product: ProductModel) -> None:
+    """
+    Sync satu product ke search index (dalam transaksi yang sama).
+
+    Product yang di-soft-delete dibuang dari index. No-op di MySQL karena
+    FULLTEXT index di-maintain oleh InnoDB dan listing sudah filter is_active.
+    """
+    if _dialect(db) != "sqlite":
+        return
+    db.flush()
+    db.execute(products_fts.delete().where(products_fts.c.rowid == product.id))
+    if product.is_active:
+        db.execute(products_fts.insert().values(rowid=product.id, **_fts_document(product)))
+
+def sync_products(db: Session, product_ids: List[int]) -> None:
+    """
+    Sync banyak product sekaligus (bulk import/update), satu query per arah
+    """
+    if _dialect(db) != "sqlite" or not product_ids:
+        return
+    db.flush()
+    db.execute(products_fts.delete().where(products_fts.c.rowid.in_(product_ids)))
+    rows = db.query(ProductModel.id, *[getattr(ProductModel, name) for name in SEARCH_COLUMNS]).filter(
+        ProductModel.id.in_(product_ids),
+        ProductModel.is_active == True
+    ).all()
+    if rows:
+        db.execute(products_fts.insert(), [
+            {"rowid": row.id, **{name: " ".join(normalize_tokens(getattr(row, name))) for name in SEARCH_COLUMNS}}
+            for row in rows
+        ])
+
+def ensure_search_index(engine) -> None:
+    """
+    Buat FTS5 table kalau belum ada (SQLite saja) dan isi ulang dari products.
+    Selalu di-rebuild supaya dokumen di index memakai normalisasi/stemming
+    yang sama dengan query (SQLite hanya untuk local/test).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        columns = ", ".join(SEARCH_COLUMNS)
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5({columns}, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+    with Session(bind=engine) as db:
+        rebuild_search_index(db)
+
+def rebuild_search_index(db: Session, chunk_size: int = 1000) -> int:
+    """
+    Rebuild seluruh FTS index dari products aktif. Returns jumlah product.
+    """
+    if _dialect(db) != "sqlite":
+        return 0
+    db.execute(products_fts.delete())
+    count = 0
+    last_id = 0
+    while True:
+        products = db.query(ProductModel).filter(
+            ProductModel.is_active == True,
+            ProductModel.id > last_id
+        ).order_by(ProductModel.id).limit(chunk_size).all()
+        if not products:
+            break
+        db.execute(products_fts.insert(), [
+            {"rowid": product.id, **_fts_document(product)} for product in products
+        ])
+        count += len(products)
+        last_id = products[-1].id
+    db.commit()
+    return count
@@ -0,0 +1,77 @@
+"""
+HTTP caching helpers - ETag, Last-Modified dan 304 Not Modified
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+
+# Naikkan kalau bentuk response berubah supaya ETag lama tidak dianggap valid
+ETAG_SCHEMA_VERSION = "1"
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag dari versi row (id, updated_at, kolom yang sering berubah)
+    """
+    raw = ":".join([ETAG_SCHEMA_VERSION] + [
+        part.isoformat() if isinstance(part, datetime) else str(part)
+        for part in parts
+    ])
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+def _as_utc(value: datetime) -> datetime:
+    # Kolom DateTime dari MySQL/SQLite biasanya naive; anggap UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 7232 2.3.2) - cukup untuk GET
+    candidates = [tag.strip() for tag in header.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates)
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluasi If-None-Match / If-Modified-Since. If-None-Match selalu
+    didahulukan kalau ada (RFC 7232 6).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since is None:
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP date hanya presisi detik
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+def apply_cache_headers(
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime],
+    cache_control: str,
+) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+def not_modified(etag: str, last_modified: Optional[datetime], cache_control: str) -> Response:
+    response = Response(status_code=304)
+    apply_cache_headers(response, etag, last_modified, cache_control)
+    return response
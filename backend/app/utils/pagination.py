@@ -0,0 +1,130 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import and_, or_
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    return value
+
+# Tipe nilai sort key yang boleh ada di cursor (setelah decode)
+CURSOR_VALUE_TYPES = (str, int, float, datetime, type(None))
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    if isinstance(value, bool) or not isinstance(value, CURSOR_VALUE_TYPES):
+        raise ValueError("Invalid cursor value")
+    return value
+
+def sort_key(columns: list, descending: bool) -> str:
+    """
+    Identitas urutan (kolom + arah) yang disimpan di cursor, mis.
+    "Product.price,Product.id:asc"
+    """
+    return ",".join(str(column) for column in columns) + (":desc" if descending else ":asc")
+
+def encode_cursor(values: List[Any], direction: str = CURSOR_NEXT, sort: Optional[str] = None) -> str:
+    """
+    Encode sort key values (dan `sort_key` urutannya) menjadi opaque cursor string
+    """
+    payload = {"v": [_encode_value(v) for v in values], "d": direction, "s": sort}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: Optional[int] = None, sort: Optional[str] = None) -> Tuple[List[Any], str]:
+    """
+    Decode cursor string, raise ValueError kalau cursor tidak valid (bukan
+    list nilai skalar, jumlah nilai != `size` kolom sort, atau dibuat untuk
+    urutan lain dari `sort`)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload["v"], list):
+            raise ValueError("Invalid cursor values")
+        values = [_decode_value(v) for v in payload["v"]]
+        direction = payload.get("d", CURSOR_NEXT)
+        cursor_sort = payload.get("s")
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if direction not in (CURSOR_NEXT, CURSOR_PREV) or (size is not None and len(values) != size):
+        raise ValueError("Invalid cursor")
+    if sort is not None and cursor_sort != sort:
+        raise ValueError("Cursor belongs to a different sort order")
+    return values, direction
+
+def keyset_predicate(columns: list, values: List[Any], descending: bool):
+    """
+    Build predicate "setelah" posisi cursor untuk urutan (col1, col2, ..., id).
+
+    Ditulis sebagai OR dari prefix-equality supaya MySQL bisa memakai
+    composite index pada kolom sort (row constructor tidak selalu bisa).
+    """
+    if len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    clauses = []
+    for i, column in enumerate(columns):
+        compare = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*[columns[j] == values[j] for j in range(i)], compare))
+    return or_(*clauses)
+
+def row_key(row: Any, columns: list) -> List[Any]:
+    """
+    Ambil nilai sort key dari ORM object atau Row hasil query
+    """
+    return [getattr(row, column.key) for column in columns]
+
+def paginate_keyset(
+    query,
+    columns: list,
+    descending: bool,
+    limit: int,
+    cursor: Optional[str] = None,
+):
+    """
+    Jalankan query dengan keyset pagination.
+
+    `columns` adalah kolom sort dengan kolom unik (biasanya id) di posisi
+    terakhir sebagai tiebreaker. Cursor dari urutan lain ditolak
+    (ValueError). Returns (items, next_cursor, prev_cursor).
+    """
+    sort = sort_key(columns, descending)
+    values, direction = decode_cursor(cursor, len(columns), sort) if cursor else (None, CURSOR_NEXT)
+    backwards = direction == CURSOR_PREV
+    scan_descending = descending != backwards
+
+    if values is not None:
+        query = query.filter(keyset_predicate(columns, values, scan_descending))
+
+    ordering = [c.desc() if scan_descending else c.asc() for c in columns]
+    rows = query.order_by(*ordering).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    next_cursor = None
+    prev_cursor = None
+    if rows:
+        first_key = row_key(rows[0], columns)
+        last_key = row_key(rows[-1], columns)
+        if backwards:
+            next_cursor = encode_cursor(last_key, CURSOR_NEXT, sort)
+            prev_cursor = encode_cursor(first_key, CURSOR_PREV, sort) if has_more else None
+        else:
+            next_cursor = encode_cursor(last_key, CURSOR_NEXT, sort) if has_more else None
+            prev_cursor = encode_cursor(first_key, CURSOR_PREV, sort) if values is not None else None
+
+    return rows, next_cursor, prev_cursor
@@ -0,0 +1,50 @@
+"""
+Query counter - hitung jumlah SQL statement yang dijalankan
+
+Dipakai untuk memastikan endpoint tidak kena N+1, misalnya di test:
+
+    with count_queries(engine) as counter:
+        client.get("/api/v1/products/?limit=100")
+    assert counter.count <= 4, counter.statements
+"""
+from contextlib import contextmanager
+from typing import List
+from sqlalchemy import event
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextmanager
+def count_queries(engine):
+    """
+    Context manager yang mencatat semua statement di engine selama block
+    """
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+def assert_max_queries(engine, max_queries: int):
+    """
+    Seperti count_queries tapi langsung gagal kalau melebihi batas
+    """
+    @contextmanager
+    def _checker():
+        with count_queries(engine) as counter:
+            yield counter
+        if counter.count > max_queries:
+            listing = "\n".join(counter.statements)
+            raise AssertionError(
+                f"Expected at most {max_queries} queries, got {counter.count}:\n{listing}"
+            )
+    return _checker()
@@ -4,6 +4,8 @@
 -- Single file with schema + sample data
 -- Created: 2025-10-20
 -- Usage: Import this ONE file in phpMyAdmin
+-- Setelah import: `alembic stamp 0001 && alembic upgrade head`
+-- (perubahan schema berikutnya ada di alembic/versions)
 -- =============================================
 
 -- Drop tables if exists (in reverse order due to foreign keys)
@@ -99,6 +101,11 @@ CREATE INDEX idx_products_slug ON products(slug);
 CREATE INDEX idx_products_sku ON products(sku);
 CREATE INDEX idx_products_release_tag ON products(release_tag);
 CREATE INDEX idx_products_category_id ON products(category_id);
+CREATE INDEX ix_products_active_price ON products(is_active, price);
+CREATE INDEX ix_products_active_name ON products(is_active, name);
+CREATE INDEX ix_products_active_category_price ON products(is_active, category_id, price);
+CREATE INDEX ix_products_active_featured ON products(is_active, is_featured);
+CREATE INDEX ix_products_active_release_tag ON products(is_active, release_tag);
 
 -- Table: product_images
 CREATE TABLE product_images (
@@ -143,6 +150,8 @@ CREATE INDEX idx_orders_order_number ON orders(order_number);
 CREATE INDEX idx_orders_customer_email ON orders(customer_email);
 CREATE INDEX idx_orders_status ON orders(status);
 CREATE INDEX idx_orders_payment_status ON orders(payment_status);
+CREATE INDEX ix_orders_status_created_at ON orders(status, created_at);
+CREATE INDEX ix_orders_payment_status_created_at ON orders(payment_status, created_at);
 
 -- Table: order_items
 CREATE TABLE order_items (
@@ -181,6 +190,7 @@ CREATE TABLE promotions (
 
 CREATE INDEX idx_promotions_code ON promotions(code);
 CREATE INDEX idx_promotions_is_active ON promotions(is_active);
+CREATE INDEX ix_promotions_active_dates ON promotions(is_active, start_date, end_date);
 
 -- =============================================
 -- DATA: Insert Sample Data
@@ -0,0 +1,6 @@
+-- Add Product Full-Text Search Index
+-- Run this script after update_products.sql (needs short_description & meta_keywords)
+-- Used by GET /api/v1/products/?search=... (MATCH ... AGAINST in boolean mode)
+
+ALTER TABLE products
+ADD FULLTEXT INDEX ft_products_search (name, short_description, brand, meta_keywords, sku);
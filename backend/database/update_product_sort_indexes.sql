@@ -0,0 +1,6 @@
+-- Add Product Listing Sort Indexes
+-- Run this script on existing databases to support keyset pagination
+-- (GET /api/v1/products/?cursor=...) for every sort option
+
+CREATE INDEX ix_products_active_price ON products(is_active, price);
+CREATE INDEX ix_products_active_name ON products(is_active, name);
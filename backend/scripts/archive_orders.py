@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Archive Orders
+==============
+Pindahkan order delivered/cancelled yang lebih tua dari ORDER_ARCHIVE_AFTER_DAYS
+ke orders_archive/order_items_archive per batch (satu transaksi per batch).
+Aggregates-nya masuk ke order_archive_daily/order_archive_products sehingga
+analytics tetap menghitung histori. Jalankan berkala (mis. cron harian).
+
+Usage (dari folder backend):
+    python scripts/archive_orders.py
+    python scripts/archive_orders.py --days 90 --batch-size 1000
+    python scripts/archive_orders.py --max-batches 10   # batasi durasi satu run
+    python scripts/archive_orders.py --rebuild-daily    # hitung ulang order_archive_daily & order_archive_products
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.order_archive import archive_orders, rebuild_archive_daily
+
+def main():
+    parser = argparse.ArgumentParser(description="Arsipkan order lama yang sudah selesai")
+    parser.add_argument("--days", type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+                        help="umur minimum order (hari, dari created_at)")
+    parser.add_argument("--batch-size", type=int, default=settings.ORDER_ARCHIVE_BATCH_SIZE,
+                        help="jumlah order per transaksi")
+    parser.add_argument("--max-batches", type=int, help="berhenti setelah N batch")
+    parser.add_argument("--rebuild-daily", action="store_true",
+                        help="hitung ulang order_archive_daily & order_archive_products dari orders_archive (hari di SALES_TIMEZONE), tanpa mengarsipkan")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    if args.rebuild_daily:
+        db = SessionLocal()
+        try:
+            days = rebuild_archive_daily(db, args.batch_size)
+        finally:
+            db.close()
+        print(f"{days} hari order_archive_daily + order_archive_products dihitung ulang ({time.monotonic() - started:.1f}s)")
+        return
+    moved = archive_orders(args.days, args.batch_size, args.max_batches)
+    print(f"{moved} order diarsipkan ({time.monotonic() - started:.1f}s)")
+
+if __name__ == "__main__":
+    main()
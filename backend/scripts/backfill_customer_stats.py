@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Backfill Customer Stats
+=======================
+Hitung ulang total_orders, total_spent dan last_order_at semua customer dari
+table orders + orders_archive, per chunk email (keyset, satu GROUP BY per
+table per chunk). Customer
+yang belum ada (checkout guest) dibuat dari order terbarunya; customer tanpa
+order di-reset ke 0.
+
+Aman dijalankan ulang. Jalankan saat aplikasi sepi: delta write-behind yang
+belum di-flush ketika backfill berjalan bisa terhitung dua kali.
+
+Usage (dari folder backend):
+    python scripts/backfill_customer_stats.py
+    python scripts/backfill_customer_stats.py --chunk-size 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select, union, update
+
+from app.core.database import SessionLocal
+from app.models.customer import Customer as CustomerModel
+from app.models.order import Order as OrderModel
+from app.models.order_archive import ArchivedOrder as ArchivedOrderModel
+from app.services.customer_stats import recompute_customers
+
+def _email_chunks(db, chunk_size: int):
+    """
+    Email distinct dari orders + orders_archive, berurutan, per chunk
+    (memakai index customer_email di kedua table)
+    """
+    last = None
+    while True:
+        selects = []
+        for model in (OrderModel, ArchivedOrderModel):
+            query = select(model.customer_email.label("email")).distinct()
+            if last is not None:
+                query = query.where(model.customer_email > last)
+            selects.append(query.order_by(model.customer_email).limit(chunk_size).subquery().select())
+        emails = sorted(set(db.scalars(union(*selects))))[:chunk_size]
+        if not emails:
+            return
+        yield emails
+        last = emails[-1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Hitung ulang aggregates customer dari orders")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="jumlah email per transaksi")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        written = 0
+        for emails in _email_chunks(db, args.chunk_size):
+            written += recompute_customers(db, emails)
+            print(f"{written} customers ...", end="\r", flush=True)
+
+        # Customer tanpa order sama sekali
+        reset = db.execute(
+            update(CustomerModel).where(
+                ~CustomerModel.email.in_(select(OrderModel.customer_email)),
+                ~CustomerModel.email.in_(select(ArchivedOrderModel.customer_email))
+            ).values(total_orders=0, total_spent=0, last_order_at=None)
+        ).rowcount
+        db.commit()
+    finally:
+        db.close()
+    print(f"{written} customers dihitung ulang, {reset} customer tanpa order di-reset "
+          f"({time.monotonic() - started:.1f}s)")
+
+if __name__ == "__main__":
+    main()
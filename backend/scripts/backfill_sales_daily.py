@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Backfill Sales Daily
+====================
+Hitung ulang rollup sales_daily dan sales_daily_categories dari semua order
+paid di orders + orders_archive (keyset per id, satu query item per batch),
+hari dihitung di SALES_TIMEZONE. Isi table diganti dalam satu transaksi.
+
+Aman dijalankan ulang. Jalankan sekali setelah migration 0012, atau kalau
+rollup diduga tidak sinkron; perubahan payment yang di-commit selama
+backfill berjalan bisa terlewat, jadi jalankan saat aplikasi sepi.
+
+Usage (dari folder backend):
+    python scripts/backfill_sales_daily.py
+    python scripts/backfill_sales_daily.py --batch-size 5000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.sales_rollup import rebuild_sales_daily
+
+def main():
+    parser = argparse.ArgumentParser(description="Hitung ulang rollup sales_daily dari orders")
+    parser.add_argument("--batch-size", type=int, default=1000, help="jumlah order per query")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        days = rebuild_sales_daily(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"{days} hari sales_daily dihitung ulang ({settings.SALES_TIMEZONE}, "
+          f"{time.monotonic() - started:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Explain Hot Queries
+===================
+Jalankan EXPLAIN untuk query utama tiap endpoint lalu laporkan query yang
+masih full table scan (index belum terpakai).
+
+Usage (dari folder backend):
+    python scripts/explain_queries.py            # laporan saja
+    python scripts/explain_queries.py --strict   # exit code 1 kalau ada full scan
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import func, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.database import Base, SessionLocal, engine
+from app.api.endpoints.products import ProductFilters
+from app.models.inventory import InventoryHold as InventoryHoldModel
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel, OrderStatus, PaymentStatus
+from app.models.order_archive import ArchivedOrder as ArchivedOrderModel
+from app.models.order_event import OrderEvent as OrderEventModel, OrderEventStatus
+from app.models.product import Product as ProductModel
+from app.models.promotion import (
+    Promotion as PromotionModel, PromotionRedemption as PromotionRedemptionModel,
+    PromotionUsageShard as PromotionUsageShardModel,
+)
+from app.models.sales import SalesDaily as SalesDailyModel, SalesDailyCategory as SalesDailyCategoryModel
+from app.services.facets import compute_facets
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, stmt):
+        self.statement = stmt
+
+@compiles(Explain)
+def _explain_default(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+def _statement(query):
+    return query.statement if hasattr(query, "statement") else query
+
+class _Captured(Exception):
+    pass
+
+def hot_queries(db):
+    """
+    (nama, statement) untuk query yang sama dengan yang dijalankan endpoint
+    """
+    now = datetime.utcnow()
+    products = db.query(ProductModel)
+
+    def listing(**filters):
+        query, _ = ProductFilters(**filters).apply(products, db)
+        return query
+
+    captured = {}
+
+    class _CaptureFacets:
+        # compute_facets langsung mengeksekusi query; ambil statement-nya saja
+        def __init__(self, real):
+            self.real = real
+
+        def execute(self, stmt, *args, **kwargs):
+            captured["facets"] = stmt
+            raise _Captured()
+
+        def __getattr__(self, name):
+            return getattr(self.real, name)
+
+    try:
+        compute_facets(_CaptureFacets(db), listing(category_id=1))
+    except _Captured:
+        pass
+
+    queries = [
+        ("products: list by category + price",
+         listing(category_id=1).order_by(ProductModel.price, ProductModel.id).limit(20)),
+        ("products: featured", listing(is_featured=True).order_by(ProductModel.id.desc()).limit(20)),
+        ("products: release tag", listing(release_tag="2024").order_by(ProductModel.id.desc()).limit(20)),
+        ("products: by slug", products.filter(ProductModel.slug == "example")),
+        ("orders: list by status",
+         db.query(OrderModel).filter(OrderModel.status == OrderStatus.PENDING)
+         .order_by(OrderModel.created_at.desc()).limit(20)),
+        ("orders: list by payment status",
+         db.query(OrderModel).filter(OrderModel.payment_status == PaymentStatus.PAID)
+         .order_by(OrderModel.created_at.desc()).limit(20)),
+        ("orders: list (keyset page)",
+         db.query(OrderModel).filter(
+             (OrderModel.created_at < now) | ((OrderModel.created_at == now) & (OrderModel.id < 1000))
+         ).order_by(OrderModel.created_at.desc(), OrderModel.id.desc()).limit(20)),
+        ("orders: by customer email",
+         db.query(OrderModel).filter(OrderModel.customer_email == "a@example.com")
+         .order_by(OrderModel.created_at.desc(), OrderModel.id.desc()).limit(20)),
+        ("orders: by customer phone",
+         db.query(OrderModel).filter(OrderModel.customer_phone == "0800000000")
+         .order_by(OrderModel.created_at.desc(), OrderModel.id.desc()).limit(20)),
+        ("orders: order number prefix",
+         db.query(OrderModel).filter(OrderModel.order_number >= "ORD-2026", OrderModel.order_number < "ORD-2027")),
+        ("orders: by number", db.query(OrderModel).filter(OrderModel.order_number == "ORD-EXAMPLE")),
+        ("orders: archive candidates",
+         db.query(OrderModel.id).filter(
+             OrderModel.status.in_([OrderStatus.DELIVERED, OrderStatus.CANCELLED]),
+             OrderModel.created_at < now
+         ).order_by(OrderModel.id).limit(500)),
+        ("orders_archive: by number",
+         db.query(ArchivedOrderModel).filter(ArchivedOrderModel.order_number == "ORD-EXAMPLE")),
+        ("order_events: dispatch batch",
+         db.query(OrderEventModel.id).filter(
+             OrderEventModel.status == OrderEventStatus.PENDING,
+             OrderEventModel.available_at <= now
+         ).order_by(OrderEventModel.id).limit(100)),
+        ("order_events: earlier per order",
+         db.query(OrderEventModel.order_id, func.min(OrderEventModel.id)).filter(
+             OrderEventModel.status == OrderEventStatus.PENDING,
+             OrderEventModel.order_id.in_([1, 2, 3])
+         ).group_by(OrderEventModel.order_id)),
+        ("promotion_redemptions: per customer",
+         db.query(func.count(PromotionRedemptionModel.id)).filter(
+             PromotionRedemptionModel.promotion_id == 1,
+             PromotionRedemptionModel.customer_email == "a@example.com"
+         )),
+        ("promotion_usage_shards: open shards",
+         db.query(PromotionUsageShardModel.shard).filter(
+             PromotionUsageShardModel.promotion_id == 1,
+             (PromotionUsageShardModel.quota == None) | (PromotionUsageShardModel.used < PromotionUsageShardModel.quota)
+         )),
+        ("sales_daily: chart range",
+         db.query(SalesDailyModel).filter(SalesDailyModel.date >= now.date(), SalesDailyModel.date <= now.date())),
+        ("sales_daily_categories: chart range",
+         db.query(SalesDailyCategoryModel).filter(
+             SalesDailyCategoryModel.category_id == 1,
+             SalesDailyCategoryModel.date >= now.date(), SalesDailyCategoryModel.date <= now.date()
+         )),
+        ("order_items: by order", db.query(OrderItemModel).filter(OrderItemModel.order_id.in_([1, 2, 3]))),
+        ("order_items: by product", db.query(OrderItemModel).filter(OrderItemModel.product_id == 1)),
+        ("promotions: active",
+         db.query(PromotionModel).filter(
+             PromotionModel.is_active == True,
+             (PromotionModel.start_date == None) | (PromotionModel.start_date <= now),
+             (PromotionModel.end_date == None) | (PromotionModel.end_date >= now),
+         )),
+        ("inventory_holds: by cart", db.query(InventoryHoldModel).filter(InventoryHoldModel.cart_id == "cart-example")),
+        ("inventory_holds: expired (sweeper)",
+         db.query(InventoryHoldModel).filter(InventoryHoldModel.expires_at <= now)
+         .order_by(InventoryHoldModel.expires_at, InventoryHoldModel.id).limit(500)),
+    ]
+    if "facets" in captured:
+        queries.append(("products: facets", captured["facets"]))
+    return [(name, _statement(query)) for name, query in queries]
+
+def _explain(db, stmt) -> list:
+    """
+    Rows EXPLAIN sebagai dict. Nama kolom dan rows diambil langsung dari
+    cursor karena result map SQLAlchemy (dan type processor-nya, mis. Date)
+    mengikuti kolom statement yang di-explain.
+    """
+    result = db.execute(Explain(stmt))
+    keys = [column[0] for column in result.cursor.description]
+    return [dict(zip(keys, row)) for row in result.cursor.fetchall()]
+
+def _full_scans(dialect: str, rows) -> list:
+    """
+    Ambil table yang di-scan penuh dari hasil EXPLAIN. Scan atas CTE/derived
+    table (sudah difilter lewat index) tidak dihitung.
+    """
+    tables = set(Base.metadata.tables)
+    scans = []
+    for data in rows:
+        if dialect == "sqlite":
+            # "SCAN products" = full scan; "SCAN products USING INDEX ..." tidak
+            detail = data["detail"]
+            if detail.startswith("SCAN ") and " USING " not in detail:
+                scans.append(detail[5:].split()[0])
+        elif dialect == "mysql":
+            if data.get("type") == "ALL":
+                scans.append(data.get("table"))
+        elif dialect == "postgresql":
+            plan = str(next(iter(data.values())))
+            if "Seq Scan on" in plan:
+                scans.append(plan.split("Seq Scan on", 1)[1].split()[0])
+    return [table for table in scans if table in tables]
+
+def _plan_lines(dialect: str, rows) -> list:
+    lines = []
+    for data in rows:
+        if dialect == "sqlite":
+            lines.append(data["detail"])
+        elif dialect == "mysql":
+            lines.append(f"{data.get('table')}: type={data.get('type')} key={data.get('key')} rows={data.get('rows')}")
+        else:
+            lines.append(str(next(iter(data.values()))))
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN query utama tiap endpoint")
+    parser.add_argument("--strict", action="store_true", help="exit 1 kalau ada full table scan")
+    parser.add_argument("--verbose", "-v", action="store_true", help="tampilkan plan lengkap")
+    args = parser.parse_args()
+
+    dialect = engine.dialect.name
+    print(f"Database: {dialect}\n")
+
+    flagged = []
+    db = SessionLocal()
+    try:
+        for name, stmt in hot_queries(db):
+            rows = _explain(db, stmt)
+            scans = _full_scans(dialect, rows)
+            status = "FULL SCAN (" + ", ".join(scans) + ")" if scans else "ok"
+            print(f"{name:<36} {status}")
+            if args.verbose or scans:
+                for line in _plan_lines(dialect, rows):
+                    print(f"    {line}")
+            if scans:
+                flagged.append(name)
+    finally:
+        db.close()
+
+    print()
+    if flagged:
+        print(f"{len(flagged)} query masih full scan. Cek index (alembic upgrade head).")
+        print("Catatan: di table kecil optimizer kadang tetap memilih scan; cek ulang dengan data nyata.")
+    else:
+        print("Semua query memakai index.")
+    if flagged and args.strict:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Promotion Load Test
+===================
+Tembakkan ratusan checkout paralel dengan satu promo code lalu laporkan
+throughput redemption (checkout/detik, latency p50/p95) dan pastikan:
+- order sukses tidak melebihi max_uses, dan sama dengan SUM(used) shards
+  serta jumlah promotion_redemptions
+- tidak ada customer yang melebihi max_uses_per_customer
+
+Bandingkan --shards 1 (satu row counter, seperti current_uses lama) dengan
+default PROMOTION_USAGE_SHARDS untuk melihat efek lock contention (paling
+terlihat di MySQL; SQLite men-serialize semua write).
+
+Product dan promo uji dibuat sementara di database DATABASE_URL lalu
+dihapus lagi beserta order-nya.
+Cek batas yang sama (otomatis, SQLite): tests/test_promotion_redemptions.py.
+
+Usage (dari folder backend):
+    python scripts/promotion_load.py                              # in-process (TestClient)
+    python scripts/promotion_load.py --checkouts 500 --max-uses 300 --shards 1
+    python scripts/promotion_load.py --customers 100 --per-customer 2
+    python scripts/promotion_load.py --url http://localhost:8000
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel
+from app.models.product import Product as ProductModel
+from app.models.promotion import (
+    Promotion as PromotionModel, PromotionRedemption as PromotionRedemptionModel,
+    PromotionType, PromotionUsageShard as PromotionUsageShardModel,
+)
+from app.services.promotions import allocate_usage_shards
+
+def _create_fixture(stock: int, max_uses: int, per_customer: int, shards: int) -> tuple:
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        product = ProductModel(
+            name=f"Promo load {tag}", slug=f"promo-load-{tag}", sku=f"PROMO-{tag}",
+            price=100000, stock=stock, is_active=True,
+        )
+        promotion = PromotionModel(
+            name=f"Promo load {tag}", code=f"LOAD{tag}".upper(), type=PromotionType.PERCENTAGE,
+            value=10, max_uses=max_uses, max_uses_per_customer=per_customer, is_active=True,
+        )
+        db.add_all([product, promotion])
+        db.flush()
+        allocate_usage_shards(db, promotion.id, max_uses, shards)
+        db.commit()
+        return product.id, promotion.id, promotion.code
+    finally:
+        db.close()
+
+def _check(promotion_id: int, per_customer: int) -> tuple:
+    db = SessionLocal()
+    try:
+        used = db.query(func.sum(PromotionUsageShardModel.used)).filter(
+            PromotionUsageShardModel.promotion_id == promotion_id
+        ).scalar() or 0
+        per_email = dict(db.query(PromotionRedemptionModel.customer_email, func.count(PromotionRedemptionModel.id)).filter(
+            PromotionRedemptionModel.promotion_id == promotion_id
+        ).group_by(PromotionRedemptionModel.customer_email).all())
+        over = sum(1 for count in per_email.values() if per_customer and count > per_customer)
+        return used, sum(per_email.values()), over
+    finally:
+        db.close()
+
+def _cleanup(product_id: int, promotion_id: int) -> None:
+    db = SessionLocal()
+    try:
+        order_ids = [row.order_id for row in db.query(OrderItemModel.order_id).filter(
+            OrderItemModel.product_id == product_id
+        ).distinct()]
+        db.query(OrderItemModel).filter(OrderItemModel.order_id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(OrderModel).filter(OrderModel.id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(PromotionRedemptionModel).filter(PromotionRedemptionModel.promotion_id == promotion_id).delete()
+        db.query(PromotionUsageShardModel).filter(PromotionUsageShardModel.promotion_id == promotion_id).delete()
+        db.query(PromotionModel).filter(PromotionModel.id == promotion_id).delete()
+        db.query(ProductModel).filter(ProductModel.id == product_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+def _payload(product_id: int, code: str, customer: int) -> dict:
+    return {
+        "customer_name": f"Promo {customer}",
+        "customer_email": f"promo{customer}@example.com",
+        "customer_phone": "0800000000",
+        "shipping_address": "Jl. Test",
+        "shipping_city": "Jakarta",
+        "shipping_province": "DKI Jakarta",
+        "items": [{"product_id": product_id, "quantity": 1}],
+        "promotion_code": code,
+    }
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput redemption promo dengan checkout paralel")
+    parser.add_argument("--checkouts", type=int, default=500, help="jumlah checkout paralel")
+    parser.add_argument("--max-uses", type=int, default=300, help="max_uses promo uji")
+    parser.add_argument("--customers", type=int, help="jumlah email berbeda (default: satu per checkout)")
+    parser.add_argument("--per-customer", type=int, default=1, help="max_uses_per_customer (0 = tanpa batas)")
+    parser.add_argument("--shards", type=int, default=settings.PROMOTION_USAGE_SHARDS, help="jumlah shard counter")
+    parser.add_argument("--workers", type=int, default=64, help="jumlah thread client")
+    parser.add_argument("--url", help="base URL server (default: in-process TestClient)")
+    args = parser.parse_args()
+    customers = args.customers or args.checkouts
+
+    product_id, promotion_id, code = _create_fixture(args.checkouts, args.max_uses, args.per_customer, args.shards)
+    endpoint = f"{settings.API_PREFIX}/orders/"
+    try:
+        if args.url:
+            import httpx
+            client = httpx.Client(base_url=args.url, timeout=60)
+        else:
+            from fastapi.testclient import TestClient
+            from app.main import app
+            client = TestClient(app)
+
+        with client:
+            def one(n):
+                started = time.perf_counter()
+                try:
+                    status = client.post(endpoint, json=_payload(product_id, code, n % customers)).status_code
+                except Exception as e:
+                    status = type(e).__name__
+                return status, time.perf_counter() - started
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                results = list(pool.map(one, range(args.checkouts)))
+            elapsed = time.perf_counter() - started
+    finally:
+        used, redemptions, over = _check(promotion_id, args.per_customer)
+        _cleanup(product_id, promotion_id)
+
+    statuses = Counter(status for status, _ in results)
+    latencies = [latency for _, latency in results]
+    succeeded = statuses.get(200, 0)
+    expected = min(args.max_uses, customers * args.per_customer if args.per_customer else args.checkouts, args.checkouts)
+    ok = succeeded == used == redemptions and used <= args.max_uses and over == 0
+    print(f"checkouts {args.checkouts} ({customers} customers), shards {args.shards}, workers {args.workers}")
+    print(f"  {elapsed:.2f}s, {args.checkouts / elapsed:.1f} checkout/s, "
+          f"p50 {_percentile(latencies, 0.5) * 1000:.0f}ms, p95 {_percentile(latencies, 0.95) * 1000:.0f}ms")
+    print(f"  status {dict(statuses)}")
+    print(f"  redeemed {succeeded}/{expected} (max_uses {args.max_uses}), shards used {used}, "
+          f"redemptions {redemptions}, customers over limit {over} => {'OK' if ok else 'MISMATCH'}")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
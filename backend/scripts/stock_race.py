@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Stock Race Check
+================
+Tembakkan ratusan order paralel ke satu product dengan stock kecil lalu
+pastikan tidak ada oversell: jumlah order sukses x quantity harus sama
+dengan stock yang berkurang, dan stock akhir tidak pernah negatif.
+
+Product (dan variation) uji dibuat sementara di database DATABASE_URL lalu
+dihapus lagi beserta order-nya.
+Versi otomatis di SQLite sementara: tests/test_stock_race.py.
+
+Usage (dari folder backend):
+    python scripts/stock_race.py                          # in-process (TestClient)
+    python scripts/stock_race.py --orders 500 --stock 25
+    python scripts/stock_race.py --url http://localhost:8000
+"""
+import argparse
+import sys
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel
+from app.models.product import Product as ProductModel, ProductVariation as ProductVariationModel
+
+def _create_fixture(stock: int) -> tuple:
+    tag = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        product = ProductModel(
+            name=f"Stock race {tag}", slug=f"stock-race-{tag}", sku=f"RACE-{tag}",
+            price=1000, stock=stock, is_active=True, has_variations=True,
+        )
+        db.add(product)
+        db.flush()
+        variation = ProductVariationModel(
+            product_id=product.id, name="XL", type="size", sku=f"RACE-{tag}-XL",
+            stock=stock, is_active=True,
+        )
+        db.add(variation)
+        db.commit()
+        return product.id, variation.id
+    finally:
+        db.close()
+
+def _read_stock(product_id: int, variation_id: int) -> tuple:
+    db = SessionLocal()
+    try:
+        product_stock = db.query(ProductModel.stock).filter(ProductModel.id == product_id).scalar()
+        variation_stock = db.query(ProductVariationModel.stock).filter(
+            ProductVariationModel.id == variation_id
+        ).scalar()
+        return product_stock, variation_stock
+    finally:
+        db.close()
+
+def _cleanup(product_id: int, variation_id: int) -> None:
+    db = SessionLocal()
+    try:
+        order_ids = [row.order_id for row in db.query(OrderItemModel.order_id).filter(
+            OrderItemModel.product_id == product_id
+        ).distinct()]
+        db.query(OrderItemModel).filter(OrderItemModel.order_id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(OrderModel).filter(OrderModel.id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(ProductVariationModel).filter(ProductVariationModel.id == variation_id).delete()
+        db.query(ProductModel).filter(ProductModel.id == product_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+def _payload(product_id: int, variation_id, quantity: int, n: int) -> dict:
+    item = {"product_id": product_id, "quantity": quantity}
+    if variation_id is not None:
+        item["variation_id"] = variation_id
+    return {
+        "customer_name": f"Race {n}",
+        "customer_email": f"race{n}@example.com",
+        "customer_phone": "0800000000",
+        "shipping_address": "Jl. Test",
+        "shipping_city": "Jakarta",
+        "shipping_province": "DKI Jakarta",
+        "items": [item],
+    }
+
+def _run(post, product_id: int, variation_id, orders: int, quantity: int, workers: int) -> Counter:
+    def one(n):
+        try:
+            return post(_payload(product_id, variation_id, quantity, n))
+        except Exception as e:
+            return type(e).__name__
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return Counter(pool.map(one, range(orders)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek oversell dengan order paralel")
+    parser.add_argument("--orders", type=int, default=300, help="jumlah order paralel per target")
+    parser.add_argument("--stock", type=int, default=10, help="stock awal product & variation")
+    parser.add_argument("--quantity", type=int, default=1, help="quantity per order")
+    parser.add_argument("--workers", type=int, default=32, help="jumlah thread client")
+    parser.add_argument("--url", help="base URL server (default: in-process TestClient)")
+    args = parser.parse_args()
+
+    product_id, variation_id = _create_fixture(args.stock)
+    endpoint = f"{settings.API_PREFIX}/orders/"
+    failed = False
+    try:
+        if args.url:
+            import httpx
+            client = httpx.Client(base_url=args.url, timeout=30)
+        else:
+            from fastapi.testclient import TestClient
+            from app.main import app
+            client = TestClient(app)
+
+        with client:
+            post = lambda payload: client.post(endpoint, json=payload).status_code
+            for label, target_variation in (("product", None), ("variation", variation_id)):
+                before = _read_stock(product_id, variation_id)
+                statuses = _run(post, product_id, target_variation, args.orders, args.quantity, args.workers)
+                after = _read_stock(product_id, variation_id)
+                index = 0 if target_variation is None else 1
+                sold = before[index] - after[index]
+                succeeded = statuses.get(200, 0)
+                ok = after[index] >= 0 and sold == succeeded * args.quantity and \
+                    succeeded <= args.stock // args.quantity
+                failed = failed or not ok
+                print(f"[{label}] stock {before[index]} -> {after[index]}, "
+                      f"orders sukses {succeeded}, status {dict(statuses)} => {'OK' if ok else 'OVERSOLD'}")
+    finally:
+        _cleanup(product_id, variation_id)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Test fixtures - database SQLite sementara, dibuat ulang per test
+"""
+import os
+import tempfile
+
+# Harus di-set sebelum app diimport (engine dibuat dari settings)
+_TEST_DIR = tempfile.mkdtemp(prefix="fanatic-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import app.models  # noqa: F401 - daftarkan semua model ke Base.metadata
+from app.core import cache
+from app.core.database import Base, SessionLocal, engine
+from app.main import app as fastapi_app
+from app.api.endpoints.auth import get_current_admin_user
+from app.services.customer_stats import customer_stats
+from app.services.promotions import promotion_index
+from app.services.search import FTS_TABLE, ensure_search_index
+
+@pytest.fixture(autouse=True)
+def reset_database():
+    """
+    Schema kosong + cache bersih untuk setiap test
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    ensure_search_index(engine)
+    clear_caches()
+    promotion_index.invalidate()
+    # Delta customer stats dari test sebelumnya tidak ikut di-flush
+    customer_stats._pending.clear()
+    yield
+
+def clear_caches() -> None:
+    """
+    Kosongkan semua TTLCache in-process
+    """
+    for registered in cache._registry.values():
+        registered.clear()
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    """
+    TestClient tanpa lifespan (background tasks tidak dijalankan) dengan
+    admin auth di-bypass
+    """
+    fastapi_app.dependency_overrides[get_current_admin_user] = lambda: None
+    try:
+        yield TestClient(fastapi_app)
+    finally:
+        fastapi_app.dependency_overrides.clear()
+
+def order_payload(product_id: int, n: int = 0, quantity: int = 1, **extra) -> dict:
+    """
+    Body POST /orders/ minimal untuk satu product
+    """
+    return {
+        "customer_name": f"Customer {n}",
+        "customer_email": f"customer{n}@example.com",
+        "customer_phone": "0800000000",
+        "shipping_address": "Jl. Test",
+        "shipping_city": "Jakarta",
+        "shipping_province": "DKI Jakarta",
+        "items": [{"product_id": product_id, "quantity": quantity}],
+        **extra,
+    }
@@ -0,0 +1,96 @@
+"""
+Customer stats write-behind: flush, efek cancel/refund, dan backfill
+(recompute_customers) sama dengan hasil incremental
+"""
+import pytest
+from app.models.customer import Customer as CustomerModel
+from app.models.order import Order as OrderModel
+from app.models.product import Product as ProductModel
+from app.services.customer_stats import customer_stats, recompute_customers
+from tests.conftest import order_payload
+
+ALICE = "customer1@example.com"
+BOB = "customer2@example.com"
+
+@pytest.fixture
+def product_id(db):
+    product = ProductModel(name="Jersey", slug="jersey", sku="JERSEY", price=100000, stock=100, is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+def _create(client, product_id, n, quantity=1):
+    response = client.post("/api/v1/orders/", json=order_payload(product_id, n, quantity=quantity))
+    assert response.status_code == 200
+    return response.json()
+
+def _stats(db):
+    db.expire_all()
+    return {
+        c.email: (c.total_orders, c.total_spent, c.last_order_at)
+        for c in db.query(CustomerModel).order_by(CustomerModel.email)
+    }
+
+def test_flush_writes_buffered_deltas(client, db, product_id):
+    first = _create(client, product_id, 1)
+    second = _create(client, product_id, 1, quantity=2)
+    _create(client, product_id, 2)
+
+    # Belum di-flush: customers belum berubah
+    assert customer_stats.pending() == 2
+    assert _stats(db) == {}
+
+    assert customer_stats.flush() == 2
+    assert customer_stats.pending() == 0
+    stats = _stats(db)
+    assert stats[ALICE][:2] == (2, 0)
+    assert stats[ALICE][2] == max(db.get(OrderModel, order["id"]).created_at for order in (first, second))
+    assert stats[BOB][:2] == (1, 0)
+    assert db.query(CustomerModel).filter_by(email=ALICE).one().name == "Customer 1"
+
+    # Flush tanpa delta tidak menulis apa pun
+    assert customer_stats.flush() == 0
+
+def test_cancel_and_refund_adjust_aggregates(client, db, product_id):
+    first = _create(client, product_id, 1)
+    second = _create(client, product_id, 1, quantity=2)
+    customer_stats.flush()
+
+    assert client.put(f"/api/v1/orders/{first['id']}", json={"payment_status": "paid"}).status_code == 200
+    assert client.put(f"/api/v1/orders/{second['id']}", json={"payment_status": "paid"}).status_code == 200
+    customer_stats.flush()
+    assert _stats(db)[ALICE][:2] == (2, round(first["total"] + second["total"]))
+
+    # Refund mengurangi total_spent, cancel mengurangi total_orders
+    assert client.put(f"/api/v1/orders/{second['id']}", json={"payment_status": "refunded"}).status_code == 200
+    assert client.delete(f"/api/v1/orders/{first['id']}").status_code == 200
+    customer_stats.flush()
+    assert _stats(db)[ALICE][:2] == (1, round(first["total"]))
+
+    response = client.post("/api/v1/orders/bulk-status", json={"ids": [first["id"]], "payment_status": "refunded"})
+    assert response.status_code == 200
+    customer_stats.flush()
+    assert _stats(db)[ALICE][:2] == (1, 0)
+
+    # Cancel dua kali tidak mengurangi lagi
+    assert client.delete(f"/api/v1/orders/{first['id']}").status_code == 200
+    customer_stats.flush()
+    assert _stats(db)[ALICE][:2] == (1, 0)
+
+def test_recompute_matches_incremental(client, db, product_id):
+    orders = [_create(client, product_id, n % 3, quantity=n + 1) for n in range(6)]
+    for order in orders[:4]:
+        client.put(f"/api/v1/orders/{order['id']}", json={"payment_status": "paid"})
+    client.put(f"/api/v1/orders/{orders[1]['id']}", json={"payment_status": "refunded"})
+    client.delete(f"/api/v1/orders/{orders[2]['id']}")
+    client.post("/api/v1/orders/bulk-status", json={"ids": [orders[4]["id"], orders[5]["id"]], "status": "processing"})
+    customer_stats.flush()
+    incremental = _stats(db)
+    assert len(incremental) == 3
+
+    # Backfill dari nol (customer dihapus / stats di-reset) menghasilkan nilai yang sama
+    db.query(CustomerModel).filter_by(email=BOB).delete()
+    db.query(CustomerModel).update({"total_orders": 0, "total_spent": 0, "last_order_at": None})
+    db.commit()
+    assert recompute_customers(db, sorted(incremental)) == 3
+    assert _stats(db) == incremental
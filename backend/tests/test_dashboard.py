@@ -0,0 +1,30 @@
+"""
+Dashboard - bulan berjalan dihitung di SALES_TIMEZONE
+"""
+from datetime import date, datetime, timedelta
+from app.models.order import Order as OrderModel, PaymentStatus
+from app.services.dashboard import compute_dashboard
+from app.services.sales_rollup import sales_day_start, sales_today
+
+def test_sales_day_start_is_jakarta_midnight_in_utc():
+    assert sales_day_start(date(2026, 4, 1)) == datetime(2026, 3, 31, 17, 0)
+
+def _order(n, created_at):
+    return OrderModel(
+        order_number=f"ORD-DASH-{n}", customer_name="A", customer_email="a@example.com",
+        customer_phone="0800000000", shipping_address="Jl. Test", shipping_city="Jakarta",
+        shipping_province="DKI Jakarta", subtotal=1000, total=1000,
+        payment_status=PaymentStatus.PAID, created_at=created_at,
+    )
+
+def test_month_boundary_follows_sales_timezone(db):
+    month_start = sales_day_start(sales_today().replace(day=1))
+    db.add_all([
+        _order(1, month_start + timedelta(minutes=30)),  # 00:30 WIB tanggal 1
+        _order(2, month_start - timedelta(minutes=30)),  # 23:30 WIB bulan lalu
+    ])
+    db.commit()
+    stats = compute_dashboard(db)
+    assert stats["total_orders"] == 2
+    assert stats["orders_this_month"] == 1
+    assert stats["revenue_this_month"] == 1000
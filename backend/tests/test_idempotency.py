@@ -0,0 +1,17 @@
+"""
+Idempotency-Key - purge row kedaluwarsa
+"""
+from datetime import datetime, timedelta
+from app.models.idempotency import IdempotencyKey as IdempotencyKeyModel
+from app.services.idempotency import purge_expired_keys
+
+def test_purge_expired_keys_in_batches(db):
+    now = datetime.utcnow()
+    for n, expires_at in enumerate([now - timedelta(hours=1)] * 5 + [now + timedelta(hours=1)]):
+        db.add(IdempotencyKeyModel(
+            scope="orders.create", key=f"key-{n}", fingerprint="x" * 64,
+            locked_at=now, expires_at=expires_at,
+        ))
+    db.commit()
+    assert purge_expired_keys(batch_size=2) == 5
+    assert [row.key for row in db.query(IdempotencyKeyModel)] == ["key-5"]
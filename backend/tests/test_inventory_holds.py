@@ -0,0 +1,83 @@
+"""
+Hold cart mengurangi stock tersedia, dilepas sweeper setelah kedaluwarsa,
+dan dipakai checkout tanpa reservasi ganda
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.models.inventory import InventoryHold as InventoryHoldModel
+from app.models.product import Product as ProductModel
+from app.services.inventory import release_expired_holds
+from tests.conftest import order_payload
+
+CART = "cart-test-0001"
+
+@pytest.fixture
+def product_id(db):
+    product = ProductModel(name="Jersey", slug="jersey", sku="JERSEY", price=100000, stock=5, is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+def _availability(client, product_id):
+    response = client.get(f"/api/v1/products/{product_id}/availability")
+    assert response.status_code == 200
+    return response.json()
+
+def _hold(client, product_id, quantity):
+    return client.put(f"/api/v1/cart/{CART}/holds", json={"product_id": product_id, "quantity": quantity})
+
+def _counters(db, product_id):
+    db.expire_all()
+    product = db.get(ProductModel, product_id)
+    return product.stock, product.reserved
+
+def test_hold_reduces_available_stock(client, product_id):
+    assert _hold(client, product_id, 3).status_code == 200
+    assert _availability(client, product_id) == {
+        "product_id": product_id, "stock": 5, "reserved": 3, "available": 2, "variations": [],
+    }
+
+    # Sisa stock tidak cukup untuk hold cart lain
+    response = client.put(
+        "/api/v1/cart/cart-test-0002/holds", json={"product_id": product_id, "quantity": 3},
+    )
+    assert response.status_code == 400
+
+    # Mengurangi hold hanya melepas selisihnya
+    assert _hold(client, product_id, 1).status_code == 200
+    assert _availability(client, product_id)["available"] == 4
+
+def test_sweeper_releases_expired_hold(client, db, product_id):
+    assert _hold(client, product_id, 4).status_code == 200
+    assert release_expired_holds(100) == 0
+    assert _availability(client, product_id)["available"] == 1
+
+    db.query(InventoryHoldModel).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert release_expired_holds(100) == 1
+    assert release_expired_holds(100) == 0
+
+    assert _availability(client, product_id)["available"] == 5
+    assert client.get(f"/api/v1/cart/{CART}/holds").json()["holds"] == []
+
+def test_checkout_claims_hold_without_double_reserving(client, db, product_id):
+    assert _hold(client, product_id, 3).status_code == 200
+    # Pembeli lain hanya bisa mengambil unit yang tidak di-hold
+    assert client.post("/api/v1/orders/", json=order_payload(product_id, 1, quantity=3)).status_code == 400
+
+    response = client.post("/api/v1/orders/", json=order_payload(product_id, 2, quantity=3, cart_id=CART))
+    assert response.status_code == 200
+    assert _counters(db, product_id) == (2, 0)
+    assert db.query(InventoryHoldModel).count() == 0
+
+    # Hold yang sudah dipakai tidak dilepas lagi oleh sweeper
+    assert release_expired_holds(100) == 0
+    assert _counters(db, product_id) == (2, 0)
+    assert client.post("/api/v1/orders/", json=order_payload(product_id, 3, quantity=2)).status_code == 200
+    assert _counters(db, product_id) == (0, 0)
+
+def test_checkout_releases_hold_for_items_not_bought(client, db, product_id):
+    assert _hold(client, product_id, 3).status_code == 200
+    response = client.post("/api/v1/orders/", json=order_payload(product_id, 1, quantity=1, cart_id=CART))
+    assert response.status_code == 200
+    assert _counters(db, product_id) == (4, 0)
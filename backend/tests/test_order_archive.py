@@ -0,0 +1,68 @@
+"""
+Order archive - aggregates harian memakai hari SALES_TIMEZONE
+"""
+from datetime import datetime, timedelta
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel, OrderStatus, PaymentStatus
+from app.models.order_archive import OrderArchiveDaily as OrderArchiveDailyModel, OrderArchiveProduct as OrderArchiveProductModel
+from app.services.order_archive import archive_orders, rebuild_archive_daily
+from app.services.sales_rollup import sales_date
+
+def _order(n, created_at, payment_status):
+    return OrderModel(
+        order_number=f"ORD-ARCH-{n}", customer_name="A", customer_email="a@example.com",
+        customer_phone="0800000000", shipping_address="Jl. Test", shipping_city="Jakarta",
+        shipping_province="DKI Jakarta", subtotal=1000, total=1000, status=OrderStatus.DELIVERED,
+        payment_status=payment_status, created_at=created_at,
+    )
+
+def _daily(db):
+    db.expire_all()
+    return sorted((row.date, row.order_count, row.paid_count, row.revenue) for row in db.query(OrderArchiveDailyModel))
+
+def test_archive_daily_uses_sales_days(db):
+    base = (datetime.utcnow() - timedelta(days=400)).replace(hour=0, minute=0, second=0, microsecond=0)
+    # 16:30 dan 17:30 UTC jatuh di dua hari Jakarta yang berbeda
+    before, after = base.replace(hour=16, minute=30), base.replace(hour=17, minute=30)
+    db.add_all([
+        _order(1, before, PaymentStatus.PAID),
+        _order(2, after, PaymentStatus.PAID),
+        _order(3, after, PaymentStatus.PENDING),
+    ])
+    db.commit()
+
+    assert archive_orders(older_than_days=180, batch_size=2) == 3
+    expected = [(base.date(), 1, 1, 1000.0), (base.date() + timedelta(days=1), 2, 1, 1000.0)]
+    assert sales_date(after) == base.date() + timedelta(days=1)
+    assert _daily(db) == expected
+
+    rebuild_archive_daily(db)
+    assert _daily(db) == expected
+
+def _products(db):
+    db.expire_all()
+    return sorted((row.product_id, row.quantity, row.revenue) for row in db.query(OrderArchiveProductModel))
+
+def test_rebuild_recomputes_archive_products(db):
+    created_at = datetime.utcnow() - timedelta(days=400)
+    orders = [_order(n, created_at, PaymentStatus.PAID) for n in range(1, 4)]
+    db.add_all(orders)
+    db.flush()
+    for n, order in enumerate(orders, start=1):
+        db.add_all([
+            OrderItemModel(order_id=order.id, product_id=1, product_name="A", product_price=100, quantity=n, subtotal=100 * n),
+            OrderItemModel(order_id=order.id, product_id=2, product_name="B", product_price=50, quantity=1, subtotal=50),
+        ])
+    db.commit()
+
+    assert archive_orders(older_than_days=180, batch_size=2) == 3
+    expected = [(1, 6, 600.0), (2, 3, 150.0)]
+    assert _products(db) == expected
+
+    # Aggregates rusak / hilang dibangun ulang dari order_items_archive
+    db.query(OrderArchiveProductModel).filter_by(product_id=1).update({"quantity": 99})
+    db.query(OrderArchiveProductModel).filter_by(product_id=2).delete()
+    db.add(OrderArchiveProductModel(product_id=3, quantity=1, revenue=10))
+    db.commit()
+    assert rebuild_archive_daily(db, batch_size=2) == 1
+    assert _products(db) == expected
+    assert _daily(db) == [(sales_date(created_at), 3, 3, 3000.0)]
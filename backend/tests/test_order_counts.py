@@ -0,0 +1,67 @@
+"""
+Total GET /orders/ default COUNT baru; total cache hanya dengan
+approx_total=true dan dikosongkan di setiap write order
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.models.order import Order as OrderModel, OrderStatus
+from app.models.product import Product as ProductModel
+from app.services.order_archive import archive_batch
+from tests.conftest import order_payload
+
+@pytest.fixture
+def product_id(db):
+    product = ProductModel(name="Jersey", slug="jersey", sku="JERSEY", price=100000, stock=100, is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+def _total(client, **params):
+    body = client.get("/api/v1/orders/", params=params).json()
+    return body["total"], body["total_cached"]
+
+def _create(client, product_id, n):
+    response = client.post("/api/v1/orders/", json=order_payload(product_id, n))
+    assert response.status_code == 200
+    return response.json()
+
+def test_default_total_is_exact(client, db, product_id):
+    _create(client, product_id, 1)
+    assert _total(client, approx_total="true") == (1, False)
+    assert _total(client, approx_total="true") == (1, True)
+
+    # Write di luar API: cache tertinggal, default tetap COUNT
+    db.add(OrderModel(
+        order_number="ORD-DIRECT", customer_name="Direct", customer_email="direct@example.com",
+        customer_phone="0800000000", shipping_address="Jl. Test", shipping_city="Jakarta",
+        shipping_province="DKI Jakarta", subtotal=1000, total=1000,
+    ))
+    db.commit()
+    assert _total(client, approx_total="true") == (1, True)
+    assert _total(client) == (2, False)
+    assert _total(client, status="pending") == (2, False)
+
+def test_order_writes_invalidate_cached_total(client, db, product_id):
+    first = _create(client, product_id, 1)
+    second = _create(client, product_id, 2)
+
+    # Setiap write mengosongkan cache: approx_total berikutnya COUNT lagi
+    assert _total(client, approx_total="true") == (2, False)
+    _create(client, product_id, 3)
+    assert _total(client, approx_total="true") == (3, False)
+
+    assert client.put(f"/api/v1/orders/{first['id']}", json={"status": "delivered"}).status_code == 200
+    assert _total(client, approx_total="true", status="delivered") == (1, False)
+    assert _total(client, approx_total="true", status="delivered") == (1, True)
+
+    assert client.delete(f"/api/v1/orders/{second['id']}").status_code == 200
+    assert _total(client, approx_total="true", status="delivered") == (1, False)
+    assert _total(client, approx_total="true") == (3, False)
+    assert _total(client, approx_total="true") == (3, True)
+
+    response = client.post("/api/v1/orders/bulk-status", json={"ids": [second["id"]], "payment_status": "failed"})
+    assert response.status_code == 200
+    assert _total(client, approx_total="true") == (3, False)
+
+    assert archive_batch(db, datetime.utcnow() + timedelta(days=1), 100) == 2
+    assert _total(client, approx_total="true") == (1, False)
@@ -0,0 +1,120 @@
+"""
+Outbox order events: urutan per order lewat FileEventSink, retry dengan
+backoff sampai failed, dan outbox_lag
+"""
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.models.order_event import OrderEvent as OrderEventModel, OrderEventStatus, OrderEventType
+from app.models.product import Product as ProductModel
+from app.services.order_events import (
+    FileEventSink, order_event_dispatcher, outbox_lag, register_handler, retry_delay, unregister_handler,
+)
+from tests.conftest import order_payload
+
+@pytest.fixture
+def product_id(db):
+    product = ProductModel(name="Jersey", slug="jersey", sku="JERSEY", price=100000, stock=100, is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+@pytest.fixture
+def sink(tmp_path):
+    handler = register_handler()(FileEventSink(str(tmp_path / "events.ndjson")))
+    try:
+        yield handler
+    finally:
+        unregister_handler(handler)
+
+def _sent(sink):
+    try:
+        with open(sink.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+def _types(events, order_id):
+    return [event["type"] for event in events if event["order_id"] == order_id]
+
+def _create(client, product_id, n):
+    response = client.post("/api/v1/orders/", json=order_payload(product_id, n))
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def _event(db, order_id, event_type):
+    db.expire_all()
+    return db.query(OrderEventModel).filter_by(order_id=order_id, event_type=event_type).one()
+
+def test_events_are_delivered_in_order_per_order(client, db, product_id, sink):
+    first = _create(client, product_id, 1)
+    second = _create(client, product_id, 2)
+    assert client.put(f"/api/v1/orders/{first}", json={"status": "processing"}).status_code == 200
+    assert client.put(f"/api/v1/orders/{second}", json={"payment_status": "paid"}).status_code == 200
+    assert client.delete(f"/api/v1/orders/{first}").status_code == 200
+    assert outbox_lag(db)["pending"] == 5
+
+    assert order_event_dispatcher.drain() == 5
+    events = _sent(sink)
+    assert [event["id"] for event in events] == sorted(event["id"] for event in events)
+    assert _types(events, first) == [OrderEventType.CREATED, OrderEventType.UPDATED, OrderEventType.CANCELLED]
+    assert _types(events, second) == [OrderEventType.CREATED, OrderEventType.UPDATED]
+    assert events[-1]["payload"]["previous_status"] == "processing"
+
+    lag = outbox_lag(db)
+    assert (lag["pending"], lag["failed"], lag["lag_seconds"]) == (0, 0, 0.0)
+    # Sudah dispatched: drain berikutnya tidak mengirim ulang
+    assert order_event_dispatcher.drain() == 0
+    assert len(_sent(sink)) == 5
+
+def test_failing_handler_retries_with_backoff_then_fails(client, db, product_id, sink):
+    @register_handler(OrderEventType.UPDATED)
+    def broker_down(event):
+        raise RuntimeError("broker down")
+
+    counters = dict(order_event_dispatcher.counters)
+    try:
+        first = _create(client, product_id, 1)
+        assert client.put(f"/api/v1/orders/{first}", json={"status": "processing"}).status_code == 200
+        second = _create(client, product_id, 2)
+
+        order_event_dispatcher.drain()
+        updated = _event(db, first, OrderEventType.UPDATED)
+        assert (updated.status, updated.attempts) == (OrderEventStatus.PENDING, 1)
+        assert "broker down" in updated.last_error
+        # Order lain tidak tertahan
+        assert _types(_sent(sink), second) == [OrderEventType.CREATED]
+
+        # Event berikutnya dari order yang sama menunggu event yang gagal
+        assert client.delete(f"/api/v1/orders/{first}").status_code == 200
+        order_event_dispatcher.drain()
+        assert _types(_sent(sink), first) == [OrderEventType.CREATED]
+        lag = outbox_lag(db)
+        assert (lag["pending"], lag["failed"]) == (2, 0)
+        assert lag["oldest_pending_at"] is not None and lag["lag_seconds"] >= 0
+
+        for attempt in range(1, settings.ORDER_EVENTS_MAX_ATTEMPTS):
+            updated = _event(db, first, OrderEventType.UPDATED)
+            assert (updated.status, updated.attempts) == (OrderEventStatus.PENDING, attempt)
+            delay = (updated.available_at - datetime.utcnow()).total_seconds()
+            assert retry_delay(attempt) - 5 < delay <= retry_delay(attempt)
+            # Backoff berlalu
+            updated.available_at = datetime.utcnow() - timedelta(seconds=1)
+            db.commit()
+            order_event_dispatcher.dispatch_batch()
+
+        updated = _event(db, first, OrderEventType.UPDATED)
+        assert (updated.status, updated.attempts) == (OrderEventStatus.FAILED, settings.ORDER_EVENTS_MAX_ATTEMPTS)
+        # Event yang ditahan tidak ikut menghabiskan attempts
+        assert _event(db, first, OrderEventType.CANCELLED).attempts <= 1
+
+        # Failed tidak lagi menahan event berikutnya
+        order_event_dispatcher.drain()
+        assert _types(_sent(sink), first) == [OrderEventType.CREATED, OrderEventType.CANCELLED]
+        lag = outbox_lag(db)
+        assert (lag["pending"], lag["failed"]) == (0, 1)
+        assert lag["dispatcher"]["failed"] - counters["failed"] == 1
+        assert lag["dispatcher"]["retried"] - counters["retried"] == settings.ORDER_EVENTS_MAX_ATTEMPTS - 1
+    finally:
+        unregister_handler(broker_down)
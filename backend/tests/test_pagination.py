@@ -0,0 +1,40 @@
+"""
+Keyset cursor - cursor hanya berlaku untuk urutan yang membuatnya
+"""
+import base64
+import json
+import pytest
+from app.models.product import Product as ProductModel
+
+@pytest.fixture
+def products(db):
+    for n in range(5):
+        db.add(ProductModel(name=f"Product {n}", slug=f"p-{n}", sku=f"SKU-{n}", price=1000 * (5 - n), stock=1, is_active=True))
+    db.commit()
+
+def _next_cursor(client, sort):
+    body = client.get("/api/v1/products/", params={"sort": sort, "limit": 2}).json()
+    return body["next_cursor"]
+
+def test_cursor_follows_its_sort(client, products):
+    cursor = _next_cursor(client, "price_asc")
+    response = client.get("/api/v1/products/", params={"sort": "price_asc", "limit": 2, "cursor": cursor})
+    assert response.status_code == 200
+    assert [item["price"] for item in response.json()["items"]] == [3000, 4000]
+
+@pytest.mark.parametrize("source, target", [("price_asc", "name"), ("price_asc", "price_desc"), ("name", "newest")])
+def test_cursor_from_other_sort_is_rejected(client, products, source, target):
+    cursor = _next_cursor(client, source)
+    response = client.get("/api/v1/products/", params={"sort": target, "limit": 2, "cursor": cursor})
+    assert response.status_code == 400
+
+def test_product_cursor_is_rejected_by_order_list(client, products):
+    cursor = _next_cursor(client, "newest")
+    assert client.get("/api/v1/orders/", params={"cursor": cursor}).status_code == 400
+
+@pytest.mark.parametrize("values", [[{"a": 1}, 1], [[1], 1], [True, 1], [1]])
+def test_malformed_cursor_values_are_rejected(client, products, values):
+    payload = {"v": values, "d": "next", "s": "Product.price,Product.id:asc"}
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+    response = client.get("/api/v1/products/", params={"sort": "price_asc", "cursor": cursor})
+    assert response.status_code == 400
@@ -0,0 +1,62 @@
+"""
+PATCH /products/bulk - stock tidak boleh turun di bawah reserved
+"""
+from app.models.product import Category as CategoryModel, Product as ProductModel
+from app.schemas.product import PRODUCT_BULK_MAX_ITEMS
+
+def _product(db, n, stock, reserved, category_id=None):
+    product = ProductModel(
+        name=f"Product {n}", slug=f"product-{n}", sku=f"SKU-{n}", price=100000,
+        stock=stock, reserved=reserved, is_active=True, category_id=category_id,
+    )
+    db.add(product)
+    db.commit()
+    return product.id
+
+def _stock(db, product_id):
+    db.expire_all()
+    return db.get(ProductModel, product_id).stock
+
+def test_items_below_reserved_are_rejected(client, db):
+    held = _product(db, 1, stock=10, reserved=4)
+    free = _product(db, 2, stock=10, reserved=0)
+    response = client.patch("/api/v1/products/bulk", json={"items": [
+        {"id": held, "stock": 3, "price": 1},
+        {"sku": "SKU-2", "stock": 3},
+        {"id": held + free + 100, "stock": 1},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == 1
+    assert body["rejected"] == [str(held)]
+    assert body["not_found"] == [str(held + free + 100)]
+    assert _stock(db, held) == 10
+    assert db.get(ProductModel, held).price == 100000
+    assert _stock(db, free) == 3
+
+def test_negative_adjustment_is_clamped_at_reserved(client, db):
+    category = CategoryModel(name="Tops", slug="tops")
+    db.add(category)
+    db.commit()
+    held = _product(db, 1, stock=10, reserved=6, category_id=category.id)
+    free = _product(db, 2, stock=10, reserved=0, category_id=category.id)
+    response = client.patch("/api/v1/products/bulk", json={"adjustment": {
+        "field": "stock", "mode": "absolute", "value": -8, "category_id": category.id,
+    }})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["adjusted"] == 2
+    assert body["clamped"] == [held]
+    assert _stock(db, held) == 6
+    assert _stock(db, free) == 2
+
+def test_invalid_item_values_are_rejected(client, db):
+    product_id = _product(db, 1, stock=10, reserved=0)
+    for values in ({"price": -1}, {"original_price": -5}, {"discount": -1}, {"discount": 101}, {"stock": -1}):
+        response = client.patch("/api/v1/products/bulk", json={"items": [{"id": product_id, **values}]})
+        assert response.status_code == 422, values
+    assert _stock(db, product_id) == 10
+
+def test_item_count_is_limited(client):
+    items = [{"id": n, "stock": 1} for n in range(1, PRODUCT_BULK_MAX_ITEMS + 2)]
+    assert client.patch("/api/v1/products/bulk", json={"items": items}).status_code == 422
@@ -0,0 +1,106 @@
+"""
+Promo di checkout/quote: jumlah discount, min_purchase, promo expired /
+nonaktif ditolak, dan index promo langsung ikut berubah setelah write
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.models.order import Order as OrderModel
+from app.models.product import Product as ProductModel
+from app.models.promotion import Promotion as PromotionModel, PromotionType
+from app.services.promotions import promotion_index
+from tests.conftest import order_payload
+
+PRICE = 100000
+
+@pytest.fixture
+def product_id(db):
+    product = ProductModel(name="Jersey", slug="jersey", sku="JERSEY", price=PRICE, stock=100, is_active=True)
+    db.add(product)
+    db.commit()
+    return product.id
+
+def _promotion(code, **extra):
+    return {"name": code, "code": code, "type": "percentage", "value": 10, "max_uses_per_customer": 0, **extra}
+
+def _create_promotion(client, code, **extra):
+    response = client.post("/api/v1/promotions/", json=_promotion(code, **extra))
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def _quote(client, product_id, code, quantity=2):
+    return client.post("/api/v1/cart/quote", json={
+        "items": [{"product_id": product_id, "quantity": quantity}], "promotion_code": code,
+    })
+
+def _checkout(client, product_id, code, n=1, quantity=2):
+    return client.post("/api/v1/orders/", json=order_payload(product_id, n, quantity=quantity, promotion_code=code))
+
+@pytest.mark.parametrize("extra, discount", [
+    ({"type": "percentage", "value": 15}, 30000),
+    ({"type": "fixed_amount", "value": 50000}, 50000),
+    ({"type": "fixed_amount", "value": 500000}, 2 * PRICE),  # tidak melebihi subtotal
+])
+def test_checkout_applies_discount(client, product_id, extra, discount):
+    _create_promotion(client, "SAVE", **extra)
+
+    quote = _quote(client, product_id, "save").json()
+    assert (quote["subtotal"], quote["discount"], quote["total"]) == (2 * PRICE, discount, 2 * PRICE - discount)
+
+    response = _checkout(client, product_id, "save")
+    assert response.status_code == 200
+    order = response.json()
+    assert (order["promotion_code"], order["discount"], order["total"]) == ("SAVE", discount, 2 * PRICE - discount)
+
+def test_min_purchase_is_enforced(client, db, product_id):
+    _create_promotion(client, "BIGSPEND", min_purchase=3 * PRICE)
+
+    for response in (_quote(client, product_id, "BIGSPEND"), _checkout(client, product_id, "BIGSPEND")):
+        assert response.status_code == 400
+        assert response.json()["detail"] == f"Minimum purchase for this promotion is {3 * PRICE}"
+    assert db.query(OrderModel).count() == 0
+
+    assert _checkout(client, product_id, "BIGSPEND", quantity=3).json()["discount"] == 3 * PRICE * 0.1
+
+def test_expired_and_inactive_promotions_are_rejected(client, db, product_id):
+    now = datetime.utcnow()
+    db.add_all([
+        PromotionModel(name="Old", code="OLD", type=PromotionType.PERCENTAGE, value=10, end_date=now - timedelta(days=1)),
+        PromotionModel(name="Soon", code="SOON", type=PromotionType.PERCENTAGE, value=10, start_date=now + timedelta(days=1)),
+        PromotionModel(name="Off", code="OFF", type=PromotionType.PERCENTAGE, value=10, is_active=False),
+    ])
+    db.commit()
+
+    for code, detail in (
+        ("OLD", "Promotion has expired"),
+        ("SOON", "Promotion has not started yet"),
+        ("OFF", "Promotion is not active"),
+    ):
+        for response in (_quote(client, product_id, code), _checkout(client, product_id, code)):
+            assert (response.status_code, response.json()["detail"]) == (400, detail)
+    assert _checkout(client, product_id, "NOPE").status_code == 404
+    assert db.query(OrderModel).count() == 0
+
+def test_index_follows_promotion_writes(client, product_id):
+    # Index dibangun dulu (code belum ada), lalu promo dibuat lewat API
+    assert _quote(client, product_id, "FLASH").status_code == 404
+    promotion_id = _create_promotion(client, "FLASH")
+    assert _quote(client, product_id, "FLASH").json()["discount"] == 20000
+
+    # Update langsung terlihat, tidak menunggu PROMOTION_INDEX_TTL
+    response = client.put(f"/api/v1/promotions/{promotion_id}", json=_promotion("FLASH", value=25))
+    assert response.status_code == 200
+    assert _quote(client, product_id, "FLASH").json()["discount"] == 50000
+
+    expired = _promotion("FLASH", end_date=(datetime.utcnow() - timedelta(hours=1)).isoformat())
+    assert client.put(f"/api/v1/promotions/{promotion_id}", json=expired).status_code == 200
+    assert _quote(client, product_id, "FLASH").json()["detail"] == "Promotion has expired"
+
+    assert client.put(f"/api/v1/promotions/{promotion_id}", json=_promotion("FLASH")).status_code == 200
+    assert client.delete(f"/api/v1/promotions/{promotion_id}").status_code == 200
+    assert _checkout(client, product_id, "FLASH").json()["detail"] == "Promotion is not active"
+
+    # Tanpa write, lookup berikutnya memakai index yang sama
+    rebuilds = promotion_index.rebuilds
+    for _ in range(3):
+        _quote(client, product_id, "FLASH")
+    assert promotion_index.rebuilds == rebuilds
@@ -0,0 +1,58 @@
+"""
+Redemption promo paralel: tidak pernah melebihi max_uses atau
+max_uses_per_customer, dan SUM(shard.used) == jumlah redemption
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import func
+from app.models.product import Product as ProductModel
+from app.models.promotion import (
+    Promotion as PromotionModel, PromotionRedemption as PromotionRedemptionModel,
+    PromotionType, PromotionUsageShard as PromotionUsageShardModel,
+)
+from app.services.promotions import allocate_usage_shards
+from tests.conftest import order_payload
+
+CHECKOUTS = 40
+
+def _setup(db, max_uses, per_customer, shards):
+    product = ProductModel(name="P", slug="p", sku="P", price=100000, stock=CHECKOUTS, is_active=True)
+    promotion = PromotionModel(
+        name="Promo", code="RACE10", type=PromotionType.PERCENTAGE, value=10,
+        max_uses=max_uses, max_uses_per_customer=per_customer, is_active=True,
+    )
+    db.add_all([product, promotion])
+    db.flush()
+    allocate_usage_shards(db, promotion.id, max_uses, shards)
+    db.commit()
+    return product.id, promotion.id
+
+@pytest.mark.parametrize("max_uses, per_customer, customers, shards", [
+    (8, 2, 6, 4),  # max_uses yang membatasi
+    (100, 2, 5, 4),  # limit per customer yang membatasi
+    (7, 0, CHECKOUTS, 1),  # satu shard, tanpa limit per customer
+])
+def test_parallel_redemptions_respect_limits(client, db, max_uses, per_customer, customers, shards):
+    product_id, promotion_id = _setup(db, max_uses, per_customer, shards)
+
+    def checkout(n):
+        payload = order_payload(product_id, n % customers, promotion_code="RACE10")
+        return client.post("/api/v1/orders/", json=payload).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = Counter(pool.map(checkout, range(CHECKOUTS)))
+
+    limit = min(max_uses, customers * per_customer if per_customer else CHECKOUTS)
+    used = db.query(func.sum(PromotionUsageShardModel.used)).filter(
+        PromotionUsageShardModel.promotion_id == promotion_id
+    ).scalar()
+    per_email = Counter(email for (email,) in db.query(PromotionRedemptionModel.customer_email).filter(
+        PromotionRedemptionModel.promotion_id == promotion_id
+    ))
+
+    assert statuses[200] == limit, statuses
+    assert used == sum(per_email.values()) == statuses[200]
+    assert used <= max_uses
+    if per_customer:
+        assert max(per_email.values()) <= per_customer
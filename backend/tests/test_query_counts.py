@@ -0,0 +1,84 @@
+"""
+Endpoint tidak boleh N+1: jumlah SQL statement per request list harus sama
+berapa pun ukuran halamannya, dan detail punya budget tetap
+"""
+import pytest
+from app.core.database import engine
+from app.models.order import Order as OrderModel, OrderItem as OrderItemModel
+from app.models.product import Category as CategoryModel, Product as ProductModel, ProductImage as ProductImageModel
+from app.utils.query_counter import assert_max_queries, count_queries
+from tests.conftest import clear_caches
+
+ITEMS = 30
+
+@pytest.fixture
+def catalog(db):
+    category = CategoryModel(name="Tops", slug="tops")
+    db.add(category)
+    db.flush()
+    for n in range(ITEMS):
+        product = ProductModel(
+            name=f"Product {n}", slug=f"product-{n}", sku=f"SKU-{n}", price=100000 + n,
+            stock=10, is_active=True, category_id=category.id,
+        )
+        product.images = [
+            ProductImageModel(image_url=f"/uploads/{n}-{i}.jpg", is_primary=i == 0, sort_order=i) for i in range(2)
+        ]
+        db.add(product)
+    db.flush()
+    for n in range(ITEMS):
+        order = OrderModel(
+            order_number=f"ORD-TEST-{n:04d}", customer_name=f"Customer {n}",
+            customer_email=f"customer{n}@example.com", customer_phone="0800000000",
+            shipping_address="Jl. Test", shipping_city="Jakarta", shipping_province="DKI Jakarta",
+            subtotal=200000, total=200000,
+        )
+        order.items = [
+            OrderItemModel(product_id=product_id, product_name="Product", product_price=100000, quantity=1, subtotal=100000)
+            for product_id in (1, 2)
+        ]
+        db.add(order)
+    db.commit()
+
+def _count(client, path: str, params: dict) -> int:
+    clear_caches()
+    with count_queries(engine) as counter:
+        response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    items = body if isinstance(body, list) else body["items"]
+    assert len(items) == params["limit"]
+    return counter.count
+
+@pytest.mark.parametrize("path, params", [
+    ("/api/v1/products/", {"view": "summary"}),
+    ("/api/v1/products/", {"view": "full"}),
+    ("/api/v1/products/", {"view": "full", "with_total": "false"}),
+    ("/api/v1/orders/", {}),
+    ("/api/v1/orders/", {"with_total": "false"}),
+    ("/api/v1/analytics/recent-orders", {}),
+])
+def test_list_query_count_does_not_grow_with_page_size(client, catalog, path, params):
+    small = _count(client, path, {**params, "limit": 2})
+    large = _count(client, path, {**params, "limit": ITEMS})
+    assert small == large
+
+def test_order_cursor_page_query_count(client, catalog):
+    first = client.get("/api/v1/orders/", params={"limit": 2}).json()
+    small = _count(client, "/api/v1/orders/", {"limit": 2, "cursor": first["next_cursor"]})
+    large = _count(client, "/api/v1/orders/", {"limit": ITEMS - 2, "cursor": first["next_cursor"]})
+    assert small == large
+
+# Satu SELECT (dengan JOIN many-to-one) + satu SELECT ... IN untuk collection
+@pytest.mark.parametrize("path", [
+    "/api/v1/products/2",
+    "/api/v1/products/slug/product-1",
+    "/api/v1/orders/2",
+    "/api/v1/orders/number/ORD-TEST-0001",
+])
+def test_detail_query_budget(client, catalog, path):
+    clear_caches()
+    with assert_max_queries(engine, 2):
+        response = client.get(path)
+    assert response.status_code == 200, response.text
+    assert len(response.json().get("images") or response.json().get("items")) == 2
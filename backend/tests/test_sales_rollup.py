@@ -0,0 +1,42 @@
+"""
+sales_daily rollup - hari di SALES_TIMEZONE, incremental == rebuild
+"""
+from datetime import date, datetime, timedelta, timezone
+from app.models.order import Order as OrderModel
+from app.models.product import Product as ProductModel
+from app.models.sales import SalesDaily as SalesDailyModel
+from app.services.sales_rollup import rebuild_sales_daily, sales_date, sales_today
+from tests.conftest import order_payload
+
+def test_sales_date_uses_sales_timezone():
+    # 17:30 UTC = 00:30 WIB hari berikutnya; naive dianggap UTC
+    assert sales_date(datetime(2026, 3, 31, 17, 30)) == date(2026, 4, 1)
+    assert sales_date(datetime(2026, 3, 31, 16, 59)) == date(2026, 3, 31)
+    assert sales_date(datetime(2026, 3, 31, 17, 30, tzinfo=timezone.utc)) == date(2026, 4, 1)
+
+def _rollup(db):
+    db.expire_all()
+    return sorted((row.date, row.order_count, row.revenue, row.items_sold) for row in db.query(SalesDailyModel))
+
+def test_payment_changes_update_rollup(client, db):
+    db.add(ProductModel(name="P", slug="p", sku="P", price=1000, stock=50, is_active=True))
+    db.commit()
+    ids = [client.post("/api/v1/orders/", json=order_payload(1, n, quantity=2)).json()["id"] for n in range(3)]
+    # Order pertama dibuat 18:00 UTC dua hari lalu = hari berikutnya di Jakarta
+    late = datetime.utcnow().replace(hour=18, minute=0, second=0, microsecond=0) - timedelta(days=2)
+    db.query(OrderModel).filter(OrderModel.id == ids[0]).update({OrderModel.created_at: late})
+    db.commit()
+
+    assert client.post("/api/v1/orders/bulk-status", json={"ids": ids, "payment_status": "paid"}).status_code == 200
+    assert client.put(f"/api/v1/orders/{ids[2]}", json={"payment_status": "refunded"}).status_code == 200
+    incremental = [row for row in _rollup(db) if row[1]]
+    total = db.get(OrderModel, ids[1]).total
+    assert incremental == sorted([(sales_date(late), 1, total, 2), (sales_today(), 1, total, 2)])
+
+    rebuild_sales_daily(db)
+    assert _rollup(db) == incremental
+
+    chart = client.get("/api/v1/analytics/sales-chart", params={"days": 7}).json()
+    assert len(chart) == 7 and chart[-1]["date"] == sales_today().isoformat()
+    assert sum(day["orders"] for day in chart) == 2
+    assert {day["date"] for day in chart if day["orders"]} == {sales_date(late).isoformat(), sales_today().isoformat()}
@@ -0,0 +1,48 @@
+"""
+Product search - normalisasi token & full-text search (FTS5)
+"""
+import pytest
+from app.models.product import Product as ProductModel
+from app.services.search import _stem, normalize_tokens, sync_product
+
+@pytest.mark.parametrize("word, stem", [
+    ("hoodies", "hoodie"),
+    ("hoodie", "hoodie"),
+    ("shirts", "shirt"),
+    ("watches", "watch"),
+    ("kaosnya", "kaos"),
+    ("kaos", "kaos"),
+    ("tas", "tas"),
+    ("kipas", "kipas"),
+    ("status", "status"),
+])
+def test_stem(word, stem):
+    assert _stem(word) == stem
+
+@pytest.mark.parametrize("word", ["hoodies", "accessories", "boxes", "kaosnya", "jackets", "videos"])
+def test_stem_is_prefix_of_word(word):
+    # MySQL FULLTEXT menyimpan kata asli; query `stem*` harus tetap cocok
+    assert word.startswith(_stem(word))
+
+def _add_products(db, *names):
+    for n, name in enumerate(names):
+        product = ProductModel(name=name, slug=f"p-{n}", sku=f"SKU-{n}", price=100000, stock=1, is_active=True)
+        db.add(product)
+        sync_product(db, product)
+    db.commit()
+
+def _search(client, term):
+    response = client.get("/api/v1/products/", params={"search": term})
+    assert response.status_code == 200
+    return sorted(item["name"] for item in response.json()["items"])
+
+@pytest.mark.parametrize("term", ["hoodie", "hoodies", "Hoodie", "HOODIES"])
+def test_search_matches_singular_and_plural(client, db, term):
+    _add_products(db, "Kaos Hoodies", "Black Hoodie", "Kaos Polos")
+    assert _search(client, term) == ["Black Hoodie", "Kaos Hoodies"]
+
+def test_search_indonesian_words_are_not_truncated(client, db):
+    _add_products(db, "Kaos Hoodies", "Black Hoodie", "Kaos Polos")
+    assert normalize_tokens("kaos") == ["kaos"]
+    assert _search(client, "kaos") == ["Kaos Hoodies", "Kaos Polos"]
+    assert _search(client, "kaosnya") == ["Kaos Hoodies", "Kaos Polos"]
@@ -0,0 +1,67 @@
+"""
+Checkout paralel ke product dengan stock kecil tidak boleh oversell
+"""
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.core.database import SessionLocal
+from app.models.product import Product as ProductModel, ProductVariation as ProductVariationModel
+from tests.conftest import order_payload
+
+STOCK = 5
+ORDERS = 40
+
+@pytest.fixture
+def low_stock(db):
+    product = ProductModel(
+        name="Limited", slug="limited", sku="LIMITED", price=100000,
+        stock=STOCK, is_active=True, has_variations=True,
+    )
+    db.add(product)
+    db.flush()
+    variation = ProductVariationModel(
+        product_id=product.id, name="XL", type="size", sku="LIMITED-XL", stock=STOCK, is_active=True,
+    )
+    db.add(variation)
+    db.commit()
+    return product.id, variation.id
+
+def _stock(model, row_id):
+    session = SessionLocal()
+    try:
+        return session.query(model.stock).filter(model.id == row_id).scalar()
+    finally:
+        session.close()
+
+@pytest.mark.parametrize("target", ["product", "variation"])
+def test_parallel_orders_never_oversell(client, low_stock, target):
+    product_id, variation_id = low_stock
+    model, row_id = (ProductModel, product_id) if target == "product" else (ProductVariationModel, variation_id)
+
+    # Pantau stock selama checkout berjalan
+    seen = []
+    done = threading.Event()
+    def watch():
+        while not done.is_set():
+            seen.append(_stock(model, row_id))
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+
+    def checkout(n):
+        payload = order_payload(product_id, n)
+        if target == "variation":
+            payload["items"][0]["variation_id"] = variation_id
+        return client.post("/api/v1/orders/", json=payload).status_code
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            statuses = Counter(pool.map(checkout, range(ORDERS)))
+    finally:
+        done.set()
+        watcher.join()
+
+    assert statuses[200] == STOCK, statuses
+    assert set(statuses) <= {200, 400}, statuses
+    assert _stock(model, row_id) == 0
+    assert min(seen) >= 0